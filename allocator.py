@@ -0,0 +1,100 @@
+"""
+Cycle-wide budget allocation across markets.
+
+In portfolio mode every tradeable market of every pair is evaluated at once.
+Each evaluation that passes its own gates (edge, fees, volume) bids for its
+position size with the expected value per dollar at its price, then waits.
+Once every evaluation has bid or dropped out, the budget is handed out
+greedily from the best EV per dollar down, respecting the pair, asset and
+global daily limits (what is left after spend and open reservations) and an
+optional cap on the whole cycle. The evaluations then trade their amounts in
+parallel.
+
+Usage:
+    alloc = Allocation(expected=3, max_total=20.0)
+    # in each evaluation (a coroutine):
+    amount = await alloc.bid(key, ev, size, pair="BTC:5m", limits=(10, 0, 25), used=(2, 2, 7))
+    # or, when it skips before bidding:
+    alloc.withdraw(key)
+"""
+
+import asyncio
+
+
+class Bid:
+    """One market's request for budget."""
+
+    __slots__ = ("key", "pair", "asset", "ev", "size", "min_amount", "limits", "used", "future")
+
+    def __init__(self, key, ev, size, pair, limits, used, min_amount, future=None):
+        self.key = key
+        self.pair = pair
+        self.asset = pair.partition(":")[0]
+        self.ev = ev
+        self.size = size
+        self.min_amount = min_amount
+        self.limits = limits  # (pair, asset, total) daily limits; 0 = off
+        self.used = used  # (pair, asset, total) spent + reserved today
+        self.future = future
+
+
+def allocate(bids, max_total=0):
+    """Split budget across bids, best EV per dollar first. Returns {key: amount}.
+
+    A bid gets its full size or whatever room is left under its limits and
+    max_total (0 = no cycle cap); less than its min_amount means 0.
+    """
+    granted = {}
+    by_pair, by_asset = {}, {}
+    total = 0.0
+    for bid in sorted(bids, key=lambda b: b.ev, reverse=True):
+        amount = bid.size if bid.ev > 0 else 0.0
+        pair_limit, asset_limit, total_limit = bid.limits
+        pair_used, asset_used, total_used = bid.used
+        if pair_limit:
+            amount = min(amount, pair_limit - pair_used - by_pair.get(bid.pair, 0.0))
+        if asset_limit:
+            amount = min(amount, asset_limit - asset_used - by_asset.get(bid.asset, 0.0))
+        if total_limit:
+            amount = min(amount, total_limit - total_used - total)
+        if max_total:
+            amount = min(amount, max_total - total)
+        if amount <= 0 or amount < bid.min_amount:
+            amount = 0.0
+        granted[bid.key] = amount
+        by_pair[bid.pair] = by_pair.get(bid.pair, 0.0) + amount
+        by_asset[bid.asset] = by_asset.get(bid.asset, 0.0) + amount
+        total += amount
+    return granted
+
+
+class Allocation:
+    """Barrier for one cycle: collects `expected` bids/withdrawals, then allocates."""
+
+    def __init__(self, expected, max_total=0):
+        self.expected = expected
+        self.max_total = max_total
+        self.bids = {}
+        self._withdrawn = set()
+        self.granted = None
+
+    async def bid(self, key, ev, size, pair, limits=(0, 0, 0), used=(0.0, 0.0, 0.0), min_amount=0.0):
+        """Wait for the allocation and return the amount granted to this market."""
+        future = asyncio.get_running_loop().create_future()
+        self.bids[key] = Bid(key, ev, size, pair, limits, used, min_amount, future)
+        self._check()
+        return await future
+
+    def withdraw(self, key):
+        """The evaluation for key finished without bidding (no-op after a bid)."""
+        if key not in self.bids and key not in self._withdrawn:
+            self._withdrawn.add(key)
+            self._check()
+
+    def _check(self):
+        if self.granted is not None or len(self.bids) + len(self._withdrawn) < self.expected:
+            return
+        self.granted = allocate(self.bids.values(), self.max_total)
+        for bid in self.bids.values():
+            if not bid.future.done():
+                bid.future.set_result(self.granted[bid.key])
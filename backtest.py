@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Vectorized backtest of the FastLoop decision rules.
+
+Evaluates the same gates as run_fast_market_strategy (fair value from the
+probability or momentum model, min momentum, volume ratio, divergence vs
+entry_threshold, fee-adjusted breakeven, daily budget cap, minimum order size) over historical 1m klines and, optionally, recorded
+market price snapshots. Everything is computed with NumPy array operations
+over all evaluation points at once, so a year of candles for several assets
+runs in seconds.
+
+Usage:
+    python backtest.py --klines BTC=data/BTCUSDT-1m-2025.csv
+    python backtest.py --klines BTC=btc.csv --klines ETH=eth.csv --snapshots snaps.jsonl
+    python backtest.py --klines BTC=btc.csv --set entry_threshold=0.08 --json
+
+Klines: Binance kline CSV (data.binance.vision dumps, with or without header)
+or a JSON array of REST kline rows. Several files per asset may be given
+comma-separated. A record_dir tick store directory works for both klines and
+snapshots.
+
+Snapshots (optional): JSONL or CSV with ts, asset, window, end_time, yes_price
+and fee_rate_bps. Without snapshots every window is evaluated at eval_offsets
+with the YES price assumed at --flat-price (default 0.50).
+
+Momentum, spot price and EWMA volatility use *completed* candles before each
+evaluation, so there is no lookahead. A window resolves Up when the price at
+its end is at or above the price at its start.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:
+    print("Error: numpy not installed. Run: pip install numpy")
+    sys.exit(1)
+
+import fastloop_trades as ft
+from scheduler import WINDOW_SECONDS
+from indicators import EWMA_LAMBDA
+from fair_value import fair_up, FEE_BUFFER
+
+MIN_SHARES = ft.MIN_SHARES_PER_ORDER
+
+# Rule parameters the backtest understands (all CONFIG_SCHEMA keys)
+PARAM_KEYS = (
+    "entry_threshold",
+    "min_momentum_pct",
+    "max_position",
+    "lookback_minutes",
+    "min_time_remaining",
+    "volume_confidence",
+    "daily_budget",
+    "fair_value_model",
+)
+
+
+# =============================================================================
+# Loading
+# =============================================================================
+
+
+def _to_epoch_seconds(value):
+    """Epoch seconds from epoch s/ms/us or an ISO string."""
+    if value is None or value == "":
+        return None
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    if v > 1e14:  # microseconds
+        return v / 1e6
+    if v > 1e11:  # milliseconds
+        return v / 1e3
+    return v
+
+
+def load_klines(paths, symbol=None):
+    """Load 1m klines into {"t": int64 minute starts (s), "open", "close", "volume"}.
+
+    A directory is read as a tick store (record_dir) using symbol.
+    """
+    rows = []
+    for path in paths:
+        if os.path.isdir(path):
+            from tick_store import TickStore
+
+            for cols in TickStore(path).iter_days("candles", symbol):
+                rows.append(
+                    np.column_stack(
+                        [cols["open_time"] / 1e3, cols["open"], cols["close"], cols["volume"]]
+                    )
+                )
+            continue
+        if path.endswith(".json"):
+            with open(path) as f:
+                data = json.load(f)
+            arr = np.array([[r[0], r[1], r[4], r[5]] for r in data], dtype=np.float64)
+        else:
+            with open(path) as f:
+                first = f.readline()
+            skip = 0 if first[:1].isdigit() else 1
+            arr = np.loadtxt(
+                path, delimiter=",", usecols=(0, 1, 4, 5), skiprows=skip, ndmin=2
+            )
+        t = arr[:, 0]
+        t = np.where(t > 1e14, t / 1e6, np.where(t > 1e11, t / 1e3, t))
+        arr[:, 0] = t
+        rows.append(arr)
+    if not rows:
+        raise ValueError("No kline data")
+    data = np.concatenate(rows)
+    data = data[np.argsort(data[:, 0], kind="stable")]
+    t = data[:, 0].astype(np.int64)
+    keep = np.concatenate([[True], np.diff(t) > 0])  # Drop duplicate minutes
+    data, t = data[keep], t[keep]
+    return {
+        "t": t,
+        "open": data[:, 1].copy(),
+        "close": data[:, 2].copy(),
+        "volume": data[:, 3].copy(),
+    }
+
+
+def load_snapshots(path):
+    """Load market price snapshots into {asset: {column: array}}."""
+    if os.path.isdir(path):
+        from tick_store import TickStore
+
+        store = TickStore(path)
+        snapshots = {}
+        for asset in store.keys("snapshots"):
+            cols = store.read("snapshots", asset)
+            snapshots[asset] = {
+                "ts": cols["ts_ms"] / 1e3,
+                "end": cols["end_ms"] / 1e3,
+                "window_secs": np.asarray(cols["window_secs"]),
+                "yes": np.asarray(cols["yes_price"]),
+                "fee_bps": np.asarray(cols["fee_rate_bps"]),
+            }
+        return snapshots
+    records = []
+    if path.endswith(".csv"):
+        with open(path) as f:
+            records = list(csv.DictReader(f))
+    else:
+        with open(path) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    by_asset = {}
+    for r in records:
+        asset = (r.get("asset") or "BTC").upper()
+        yes_price = r.get("yes_price")
+        if yes_price in (None, "") and r.get("outcome_prices"):
+            prices = r["outcome_prices"]
+            prices = json.loads(prices) if isinstance(prices, str) else prices
+            yes_price = prices[0] if prices else 0.5
+        cols = by_asset.setdefault(
+            asset, {"ts": [], "end": [], "window": [], "yes": [], "fee": []}
+        )
+        window = r.get("window") or "5m"
+        cols["ts"].append(_to_epoch_seconds(r.get("ts")))
+        cols["end"].append(_to_epoch_seconds(r.get("end_time")))
+        cols["window"].append(WINDOW_SECONDS.get(window, 300))
+        cols["yes"].append(float(yes_price if yes_price not in (None, "") else 0.5))
+        cols["fee"].append(float(r.get("fee_rate_bps") or 0))
+    return {
+        asset: {
+            "ts": np.array(c["ts"], dtype=np.float64),
+            "end": np.array(c["end"], dtype=np.float64),
+            "window_secs": np.array(c["window"], dtype=np.int64),
+            "yes": np.array(c["yes"], dtype=np.float64),
+            "fee_bps": np.array(c["fee"], dtype=np.float64),
+        }
+        for asset, c in by_asset.items()
+    }
+
+
+def synthesize_snapshots(klines, window="5m", offsets=(5, 60, 120, 180, 235), yes_price=0.5, fee_rate_bps=1000):
+    """Evaluation points at `offsets` within every window covered by the klines."""
+    secs = WINDOW_SECONDS.get(window, 300)
+    t = klines["t"]
+    first = (t[0] // secs + 1) * secs
+    last = (t[-1] // secs) * secs
+    starts = np.arange(first, last, secs, dtype=np.float64)
+    offs = np.array([o for o in offsets if o < secs], dtype=np.float64)
+    ts = (starts[:, None] + offs[None, :]).ravel()
+    end = np.repeat(starts + secs, len(offs))
+    n = len(ts)
+    return {
+        "ts": ts,
+        "end": end,
+        "window_secs": np.full(n, secs, dtype=np.int64),
+        "yes": np.full(n, yes_price, dtype=np.float64),
+        "fee_bps": np.full(n, fee_rate_bps, dtype=np.float64),
+    }
+
+
+# =============================================================================
+# Vectorized evaluation
+# =============================================================================
+
+
+def ewma_volatility_pct(close, lam=EWMA_LAMBDA):
+    """EWMA volatility (%/min) of 1m log returns through each candle, as in RollingIndicators."""
+    out = np.full(len(close), np.nan)
+    if len(close) < 2:
+        return out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.log(close[1:] / close[:-1]) ** 2
+    r2 = np.nan_to_num(r2, nan=0.0, posinf=0.0, neginf=0.0).tolist()
+    var = r2[0]
+    result = [var]
+    for x in r2[1:]:
+        var = lam * var + (1 - lam) * x
+        result.append(var)
+    out[1:] = np.sqrt(result) * 100
+    return out
+
+
+def prepare(klines, snapshots):
+    """Align snapshots to candle indices. Returns a dict of arrays shared by every run."""
+    t = klines["t"]
+    ts = snapshots["ts"]
+    end = snapshots["end"]
+    start = end - snapshots["window_secs"]
+    # Last completed candle at evaluation time: the one that closed before ts
+    last_done = np.searchsorted(t, ts - 60, side="right") - 1
+    start_idx = np.searchsorted(t, start, side="left")
+    end_idx = np.searchsorted(t, end, side="left") - 1  # Last candle inside the window
+    n = len(t)
+    valid = (
+        (last_done >= 0)
+        & (start_idx < n)
+        & (end_idx >= 0)
+        & (end_idx < n)
+        & (end_idx >= start_idx)
+        & (t[np.clip(end_idx, 0, n - 1)] + 60 >= end)  # Window fully covered by data
+    )
+    start_idx = np.clip(start_idx, 0, n - 1)
+    end_idx = np.clip(end_idx, 0, n - 1)
+    up = klines["close"][end_idx] >= klines["open"][start_idx]
+    # The window's open is known once its first candle has opened
+    window_open = np.where(start <= ts, klines["open"][start_idx], np.nan)
+    return {
+        "open": klines["open"],
+        "close": klines["close"],
+        "vol_cumsum": np.concatenate([[0.0], np.cumsum(klines["volume"])]),
+        "vol_pct": ewma_volatility_pct(klines["close"]),
+        "window_open": window_open,
+        "volume": klines["volume"],
+        "last_done": last_done,
+        "ts": ts,
+        "remaining": end - ts,
+        "day": (ts // 86400).astype(np.int64),
+        "window_id": end.astype(np.int64),
+        "yes": snapshots["yes"],
+        "fee": snapshots["fee_bps"] / 10000,
+        "up": up,
+        "valid": valid,
+    }
+
+
+def evaluate(prep, params):
+    """Apply the decision rules to every evaluation point. Returns a result dict."""
+    lookback = int(params["lookback_minutes"])
+    entry = float(params["entry_threshold"])
+    min_mom = float(params["min_momentum_pct"])
+    max_pos = float(params["max_position"])
+    budget = float(params["daily_budget"])
+    vol_conf = bool(params["volume_confidence"])
+    min_time = float(params["min_time_remaining"])
+
+    j = prep["last_done"]
+    first = j - lookback + 1
+    ok = prep["valid"] & (first >= 0) & (prep["remaining"] > min_time)
+    first_c = np.clip(first, 0, None)
+    j_c = np.clip(j, 0, None)
+
+    price_then = prep["open"][first_c]
+    price_now = prep["close"][j_c]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        momentum = (price_now - price_then) / price_then * 100
+        avg_vol = (prep["vol_cumsum"][j_c + 1] - prep["vol_cumsum"][first_c]) / lookback
+        vol_ratio = np.where(avg_vol > 0, prep["volume"][j_c] / avg_vol, 1.0)
+
+    yes = prep["yes"]
+    fee = prep["fee"]
+    probability = params.get("fair_value_model") == "probability"
+    if probability:
+        window_open = np.where(np.isnan(prep["window_open"]), price_now, prep["window_open"])
+        p_up = fair_up(price_now, window_open, prep["vol_pct"][j_c], prep["remaining"])
+        up_signal = p_up >= yes
+        p_win = np.where(up_signal, p_up, 1 - p_up)
+    else:
+        up_signal = momentum > 0
+    buy_price = np.where(up_signal, yes, 1 - yes)
+    if probability:
+        divergence = p_win - buy_price
+    else:
+        divergence = np.where(up_signal, 0.50 + entry - yes, yes - (0.50 - entry))
+
+    if not probability:
+        ok &= np.abs(momentum) >= min_mom
+    if vol_conf:
+        ok &= vol_ratio >= 0.5
+    ok &= divergence > 0
+    if probability:
+        ok &= divergence >= entry
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_profit = (1 - buy_price) * (1 - fee)
+        breakeven = buy_price / (win_profit + buy_price)
+    if probability:
+        min_divergence = breakeven - buy_price + FEE_BUFFER
+    else:
+        min_divergence = breakeven - 0.50 + 0.02
+    ok &= (fee <= 0) | (divergence >= min_divergence)
+    # Orders that can never meet the minimum share count at full size
+    ok &= MIN_SHARES * buy_price <= max_pos
+
+    # Daily budget: the k-th signal of a day spends min(max_pos, what's left)
+    idx = np.nonzero(ok)[0]
+    idx = idx[np.argsort(prep["ts"][idx], kind="stable")]
+    day = prep["day"][idx]
+    size = np.zeros(len(idx))
+    if len(idx):
+        day_start = np.concatenate([[0], np.nonzero(np.diff(day))[0] + 1])
+        k = np.arange(len(idx)) - np.repeat(day_start, np.diff(np.append(day_start, len(idx))))
+        n_full = int(budget // max_pos) if max_pos > 0 else 0
+        size[k < n_full] = max_pos
+        left = budget - n_full * max_pos
+        if left >= 0.50:
+            partial = (k >= n_full) & (MIN_SHARES * buy_price[idx] <= left)
+            p_idx = np.nonzero(partial)[0]
+            if len(p_idx):
+                _, first_per_day = np.unique(day[p_idx], return_index=True)
+                size[p_idx[first_per_day]] = left
+    traded = size > 0
+    idx, size = idx[traded], size[traded]
+
+    p = buy_price[idx]
+    shares = size / p
+    win = np.where(up_signal[idx], prep["up"][idx], ~prep["up"][idx])
+    gross_win = shares * (1 - p)
+    fee_paid = np.where(win, gross_win * fee[idx], 0.0)
+    pnl = np.where(win, gross_win - fee_paid, -size)
+
+    n = len(idx)
+    return {
+        "evaluations": int(prep["valid"].sum()),
+        "signals": int(ok.sum()),
+        "trades": n,
+        "wins": int(win.sum()),
+        "hit_rate": float(win.mean()) if n else 0.0,
+        "volume_usd": float(size.sum()),
+        "pnl": float(pnl.sum()),
+        "fee_drag": float(fee_paid.sum()),
+        "roi": float(pnl.sum() / size.sum()) if n else 0.0,
+        "avg_divergence": float(divergence[idx].mean()) if n else 0.0,
+        "trade_index": idx,
+        "trade_pnl": pnl,
+        "trade_size": size,
+    }
+
+
+def default_params(overrides=None):
+    """Rule parameters from the current config, with overrides applied."""
+    params = {key: ft.cfg[key] for key in PARAM_KEYS}
+    params.update(overrides or {})
+    return params
+
+
+def run(datasets, params):
+    """Evaluate params over {asset: prepared} and combine the per-asset results."""
+    per_asset = {asset: evaluate(prep, params) for asset, prep in datasets.items()}
+    total = {
+        k: sum(r[k] for r in per_asset.values())
+        for k in ("evaluations", "signals", "trades", "wins", "volume_usd", "pnl", "fee_drag")
+    }
+    total["hit_rate"] = total["wins"] / total["trades"] if total["trades"] else 0.0
+    total["roi"] = total["pnl"] / total["volume_usd"] if total["volume_usd"] else 0.0
+    return total, per_asset
+
+
+def parse_set(items):
+    updates = {}
+    for item in items or []:
+        key, _, val = item.partition("=")
+        if key not in PARAM_KEYS:
+            raise SystemExit(f"Unknown backtest parameter: {key}. Valid: {', '.join(PARAM_KEYS)}")
+        type_fn = ft.CONFIG_SCHEMA[key]["type"]
+        updates[key] = val.lower() in ("true", "1", "yes") if type_fn == bool else type_fn(val)
+    return updates
+
+
+def build_datasets(kline_specs, snapshots_path=None, window="5m", flat_price=0.5, fee_rate_bps=1000):
+    """Load everything once: {asset: prepared arrays}."""
+    snapshots = load_snapshots(snapshots_path) if snapshots_path else None
+    datasets = {}
+    for spec in kline_specs:
+        asset, _, paths = spec.partition("=")
+        asset = asset.upper()
+        klines = load_klines(paths.split(","), ft.ASSET_SYMBOLS.get(asset, f"{asset}USDT"))
+        if snapshots is not None:
+            if asset not in snapshots:
+                continue
+            snaps = snapshots[asset]
+        else:
+            snaps = synthesize_snapshots(
+                klines,
+                window,
+                [float(o) for o in str(ft.cfg["eval_offsets"]).split(",") if o.strip()],
+                flat_price,
+                fee_rate_bps,
+            )
+        datasets[asset] = prepare(klines, snaps)
+    return datasets
+
+
+def _print_report(total, per_asset, params, elapsed):
+    print("⚡ FastLoop Backtest")
+    print("=" * 50)
+    print("  Params: " + ", ".join(f"{k}={params[k]}" for k in PARAM_KEYS))
+    print(f"\n  {'Asset':<6}{'Evals':>10}{'Trades':>8}{'Hit':>8}{'Volume':>11}{'PnL':>10}{'Fees':>9}{'ROI':>8}")
+    for asset, r in list(per_asset.items()) + [("ALL", total)]:
+        print(
+            f"  {asset:<6}{r['evaluations']:>10,}{r['trades']:>8,}{r['hit_rate']:>8.1%}"
+            f"{r['volume_usd']:>11,.2f}{r['pnl']:>+10,.2f}{r['fee_drag']:>9,.2f}{r['roi']:>+8.1%}"
+        )
+    print(f"\n  Evaluated in {elapsed * 1e3:.0f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized FastLoop backtest")
+    parser.add_argument("--klines", action="append", required=True, metavar="ASSET=PATH[,PATH]")
+    parser.add_argument("--snapshots", help="Market price snapshots (JSONL or CSV)")
+    parser.add_argument("--window", default=ft.WINDOW, help="Window when synthesizing snapshots")
+    parser.add_argument("--flat-price", type=float, default=0.5, help="YES price when synthesizing")
+    parser.add_argument("--fee-bps", type=float, default=1000, help="Fee when synthesizing")
+    parser.add_argument("--set", action="append", metavar="KEY=VALUE", help="Override a rule parameter")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    load_start = time.perf_counter()
+    datasets = build_datasets(args.klines, args.snapshots, args.window, args.flat_price, args.fee_bps)
+    params = default_params(parse_set(args.set))
+    start = time.perf_counter()
+    total, per_asset = run(datasets, params)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        strip = lambda r: {k: v for k, v in r.items() if not k.startswith("trade_")}
+        print(
+            json.dumps(
+                {
+                    "params": params,
+                    "total": total,
+                    "assets": {a: strip(r) for a, r in per_asset.items()},
+                    "load_secs": round(start - load_start, 3),
+                    "eval_secs": round(elapsed, 4),
+                },
+                indent=2,
+            )
+        )
+    else:
+        _print_report(total, per_asset, params, elapsed)
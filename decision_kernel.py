@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Precompiled trade/skip gates for one selected market.
+
+The decision gates (momentum, volume, divergence, entry threshold,
+fee-adjusted breakeven, budget, minimum order size) depend on a handful of
+numbers that are fixed once a market is selected: its fee rate, the
+strategy thresholds and the budget-capped position size. DecisionKernel
+folds them into slots when it is built, so evaluate() on a new YES price or
+momentum reading is a few float comparisons with no allocation.
+
+In the momentum model the fair price of the side bought is always
+50¢ + entry_threshold. The fee gate (divergence ≥ breakeven − 50¢ + 2¢)
+then reduces to a price ceiling. It is the positive root of a quadratic
+and is solved once at build time. In the probability model the breakeven
+moves with the price, so evaluate() computes it with one division.
+
+evaluate() returns an outcome code: YES or NO to trade that side, or the
+skip reason. OUTCOMES[code] is the name used in the decision log.
+
+Benchmark:
+    python decision_kernel.py --iterations 1000000
+"""
+
+import math
+
+from fair_value import FEE_BUFFER, fair_up_scalar
+
+MIN_SIZE = 0.50  # Smallest order worth sending
+
+YES, NO, WEAK_MOMENTUM, LOW_VOLUME, PRICED_IN, SMALL_EDGE, FEES, BUDGET, BELOW_MIN_SHARES = range(9)
+OUTCOMES = (
+    "yes",
+    "no",
+    "weak_momentum",
+    "low_volume",
+    "priced_in",
+    "small_edge",
+    "fees",
+    "budget_too_small",
+    "below_min_shares",
+)
+
+
+def momentum_fee_ceiling(fair, fee_rate):
+    """Highest buy price q with fair − q ≥ breakeven(q) − 0.50 + FEE_BUFFER.
+
+    breakeven(q) = q / ((1 − q)(1 − fee) + q). Multiplying out gives
+    −fee·q² + (c·fee − keep − 1)·q + c·keep ≥ 0 with c = fair + 0.50 −
+    FEE_BUFFER and keep = 1 − fee; the gate holds up to the positive root.
+    """
+    if fee_rate <= 0:
+        return 1.0
+    keep = 1 - fee_rate
+    c = fair + 0.50 - FEE_BUFFER
+    b = c * fee_rate - keep - 1
+    return (b + math.sqrt(b * b + 4 * fee_rate * c * keep)) / (2 * fee_rate)
+
+
+class DecisionKernel:
+    """Gates for one market, compiled from its fee rate, thresholds and position size.
+
+    size: position size after smart sizing and the daily budget cap.
+    model: "momentum" (fair = 50¢ ± entry_threshold) or "probability" (pass p_up).
+    """
+
+    __slots__ = (
+        "probability",
+        "entry_threshold",
+        "min_momentum_pct",
+        "volume_floor",
+        "fee_rate",
+        "keep",
+        "fair",
+        "fee_ceiling",
+        "shares_ceiling",
+        "size",
+        "budget_ok",
+    )
+
+    def __init__(
+        self,
+        fee_rate_bps,
+        size,
+        entry_threshold,
+        min_momentum_pct=0.0,
+        model="momentum",
+        volume_confidence=True,
+        min_shares=5,
+    ):
+        self.probability = model == "probability"
+        self.entry_threshold = entry_threshold
+        self.min_momentum_pct = min_momentum_pct
+        self.volume_floor = 0.5 if volume_confidence else -math.inf
+        self.fee_rate = fee_rate_bps / 10000
+        self.keep = 1 - self.fee_rate
+        self.fair = 0.50 + entry_threshold
+        self.fee_ceiling = momentum_fee_ceiling(self.fair, self.fee_rate)
+        self.shares_ceiling = size / min_shares  # Highest price that still buys min_shares
+        self.size = size
+        self.budget_ok = size >= MIN_SIZE
+
+    def evaluate(self, yes_price, momentum_pct, volume_ratio, p_up=0.5):
+        """Outcome code for a quote/signal update (see OUTCOMES)."""
+        if self.probability:
+            if p_up >= yes_price:
+                side, q, p_win = YES, yes_price, p_up
+            else:
+                side, q, p_win = NO, 1 - yes_price, 1 - p_up
+            if volume_ratio < self.volume_floor:
+                return LOW_VOLUME
+            divergence = p_win - q
+            if divergence <= 0 or q <= 0:
+                return PRICED_IN
+            if divergence < self.entry_threshold:
+                return SMALL_EDGE
+            if self.fee_rate > 0 and p_win < q / ((1 - q) * self.keep + q) + FEE_BUFFER:
+                return FEES
+        else:
+            if abs(momentum_pct) < self.min_momentum_pct:
+                return WEAK_MOMENTUM
+            if momentum_pct > 0:
+                side, q = YES, yes_price
+            else:
+                side, q = NO, 1 - yes_price
+            if volume_ratio < self.volume_floor:
+                return LOW_VOLUME
+            if q >= self.fair:
+                return PRICED_IN
+            if q > self.fee_ceiling:
+                return FEES
+        if not self.budget_ok:
+            return BUDGET
+        if q > self.shares_ceiling:
+            return BELOW_MIN_SHARES
+        return side
+
+
+class TickSignal:
+    """A pair's last evaluated market, re-checked against each streamed price.
+
+    Momentum is spot against the cycle's lookback price (price_then). In the
+    probability model P(up) is recomputed from spot, the window open and
+    the time left (fair_value.fair_up_scalar). Volume and the YES quote stay as the cycle saw them. The
+    tick only decides when to wake the loop early: the cycle that follows
+    re-checks everything with fresh data.
+    """
+
+    __slots__ = (
+        "pair",
+        "symbol",
+        "kernel",
+        "yes_price",
+        "price_then",
+        "volume_ratio",
+        "window_open",
+        "vol_pct",
+        "end_ts",
+        "deadline",
+        "last",
+    )
+
+    def __init__(
+        self,
+        pair,
+        symbol,
+        kernel,
+        yes_price,
+        price_then,
+        volume_ratio,
+        last,
+        end_ts,
+        min_time_remaining=0,
+        window_open=None,
+        vol_pct=None,
+    ):
+        self.pair = pair
+        self.symbol = symbol
+        self.kernel = kernel
+        self.yes_price = yes_price
+        self.price_then = price_then
+        self.volume_ratio = volume_ratio
+        self.window_open = window_open
+        self.vol_pct = vol_pct
+        self.end_ts = end_ts
+        self.deadline = end_ts - min_time_remaining  # Too late to trade after this
+        self.last = last  # Outcome code of the last evaluation
+
+    def on_price(self, price, now):
+        """True when this tick turns a skip into a trade signal."""
+        if now >= self.deadline:
+            return False
+        momentum_pct = (price - self.price_then) / self.price_then * 100 if self.price_then else 0.0
+        p_up = 0.5
+        if self.kernel.probability:
+            p_up = fair_up_scalar(price, self.window_open or price, self.vol_pct, self.end_ts - now)
+        code = self.kernel.evaluate(self.yes_price, momentum_pct, self.volume_ratio, p_up)
+        fired = code <= NO and self.last > NO
+        self.last = code
+        return fired
+
+
+def benchmark(iterations=1_000_000, model="momentum"):
+    """Average seconds for one evaluate() call over varying prices and signals."""
+    import time
+    import random
+
+    rng = random.Random(7)
+    kernel = DecisionKernel(1000, 5.0, 0.05, 0.5, model)
+    ticks = [
+        (rng.uniform(0.2, 0.8), rng.gauss(0, 0.6), rng.uniform(0.3, 3.0), rng.uniform(0.1, 0.9))
+        for _ in range(1024)
+    ]
+    evaluate = kernel.evaluate
+    rounds = max(1, iterations // len(ticks))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for yes_price, momentum_pct, volume_ratio, p_up in ticks:
+            evaluate(yes_price, momentum_pct, volume_ratio, p_up)
+    return (time.perf_counter() - start) / (rounds * len(ticks))
+
+
+def benchmark_ticks(iterations=250_000):
+    """Average seconds for one TickSignal.on_price() call (probability model)."""
+    import time
+    import random
+
+    rng = random.Random(7)
+    now = time.time()
+    kernel = DecisionKernel(1000, 5.0, 0.05, 0.5, "probability")
+    signal = TickSignal("BTC:5m", "BTCUSDT", kernel, 0.52, 100_000.0, 1.0, FEES, now + 600, 60, 100_000.0, 0.05)
+    prices = [100_000 * (1 + rng.gauss(0, 0.001)) for _ in range(1024)]
+    on_price = signal.on_price
+    rounds = max(1, iterations // len(prices))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for price in prices:
+            on_price(price, now)
+    return (time.perf_counter() - start) / (rounds * len(prices))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the decision kernel")
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    for model in ("momentum", "probability"):
+        per_call = benchmark(args.iterations, model)
+        print(f"⚡ DecisionKernel.evaluate ({model}): {per_call * 1e9:.0f}ns per evaluation")
+    per_tick = benchmark_ticks(args.iterations // 4)
+    print(f"⚡ TickSignal.on_price (probability): {per_tick * 1e9:.0f}ns per tick")
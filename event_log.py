@@ -0,0 +1,195 @@
+"""
+Buffered JSON event log.
+
+Each decision the strategy makes is one JSON object per line with all of
+its inputs (prices, momentum, volume ratio, divergence, breakeven) and its
+outcome. emit() only appends the event to an in-memory buffer; a background
+thread serializes and writes batches when the buffer fills or the flush
+interval passes, and rotates the file by size (events.jsonl →
+events.jsonl.1 → ...). The hot path never waits on disk.
+
+format_decision() turns a decision event into the one-line human summary
+used in --quiet mode.
+"""
+
+import os
+import json
+import time
+import threading
+
+MAX_BYTES = 10 * 1024 * 1024
+BACKUPS = 3
+FLUSH_INTERVAL = 1.0
+FLUSH_EVENTS = 200  # Wake the writer early once this many events are waiting
+MAX_PENDING = 10_000  # Drop the oldest events beyond this (writer stalled)
+
+
+class EventLog:
+    """Append-only JSONL event log written by a background thread."""
+
+    def __init__(
+        self,
+        path,
+        max_bytes=MAX_BYTES,
+        backups=BACKUPS,
+        flush_interval=FLUSH_INTERVAL,
+        flush_events=FLUSH_EVENTS,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.flush_events = flush_events
+
+        self._cond = threading.Condition()
+        self._pending = []
+        self._flush_requested = False
+        self._flushed_seq = 0
+        self._emitted_seq = 0
+        self._closed = False
+        self._file = None
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.flushes = 0
+
+    def emit(self, event):
+        """Queue an event (a JSON-serializable dict). Never blocks on I/O."""
+        with self._cond:
+            if self._closed:
+                return
+            self._pending.append(event)
+            self._emitted_seq += 1
+            if len(self._pending) > MAX_PENDING:
+                del self._pending[0]
+                self.dropped += 1
+            if len(self._pending) >= self.flush_events:
+                self._cond.notify()
+
+    def flush(self, timeout=5.0):
+        """Write everything emitted so far; waits up to timeout seconds."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            target = self._emitted_seq
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._flushed_seq < target and self._thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=5.0):
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "pending": len(self._pending),
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "rotations": self.rotations,
+        }
+
+    # -------------------------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not (
+                    self._closed
+                    or self._flush_requested
+                    or len(self._pending) >= self.flush_events
+                ):
+                    self._cond.wait(self.flush_interval)
+                batch, self._pending = self._pending, []
+                self._flush_requested = False
+                seq = self._emitted_seq
+                closed = self._closed
+            if batch:
+                self._write(batch)
+            with self._cond:
+                self._flushed_seq = seq
+                self._cond.notify_all()
+            if closed:
+                if self._file:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, batch):
+        lines = []
+        for event in batch:
+            try:
+                lines.append(json.dumps(event, default=str))
+            except (TypeError, ValueError):
+                self.dropped += 1
+        if not lines:
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a")
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            self.written += len(lines)
+            self.flushes += 1
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError:
+            self.dropped += len(lines)
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+
+def format_decision(event):
+    """One-line human summary of a decision event."""
+    pair = event.get("pair", "?")
+    outcome = event.get("outcome", "?")
+    parts = []
+    if event.get("momentum_pct") is not None:
+        parts.append(f"momentum {event['momentum_pct']:+.3f}%")
+    if event.get("yes_price") is not None:
+        parts.append(f"YES ${event['yes_price']:.3f}")
+    if event.get("divergence") is not None:
+        parts.append(f"divergence {event['divergence']:.3f}")
+    if event.get("fill_price") is not None:
+        parts.append(f"fill ${event['fill_price']:.3f}")
+    detail = " | ".join(parts)
+    side = (event.get("side") or "").upper()
+    size = event.get("position_size")
+
+    if event.get("error") and outcome in ("error", "import_failed", "failed", "no_signal"):
+        return f"❌ {pair} {outcome.replace('_', ' ')}: {event['error']}" + (
+            f" | {detail}" if detail else ""
+        )
+    if outcome == "skip":
+        return f"⏸️  {pair} skip ({event.get('reason')})" + (f" | {detail}" if detail else "")
+    if outcome == "dry_run":
+        return f"🧪 {pair} [DRY RUN] would buy {side} ${size:.2f} | {detail}"
+    if outcome == "traded":
+        return (
+            f"✅ {pair} bought {event.get('shares', 0):.1f} {side} @ ${event.get('price', 0):.3f}"
+            f" (${size:.2f}) | {detail}"
+        )
+    return f"• {pair} {outcome}" + (f" | {detail}" if detail else "")
@@ -18,15 +18,14 @@ Requires:
 import os
 import sys
 import json
-import math
+import time
 import argparse
-from datetime import datetime, timezone, timedelta
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode, quote
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
 
-# Force line-buffered stdout for non-TTY environments (cron, Docker, OpenClaw)
-sys.stdout.reconfigure(line_buffering=True)
+from metrics import MetricsRegistry
+from event_log import EventLog, format_decision
 
 # Optional: Trade Journal integration
 try:
@@ -53,7 +52,7 @@ CONFIG_SCHEMA = {
         "default": 0.05,
         "env": "SIMMER_SPRINT_ENTRY",
         "type": float,
-        "help": "Min price divergence from 50¢ to trigger trade",
+        "help": "Min edge to trade: win probability minus price paid (probability model), or divergence from 50¢ (momentum model)",
     },
     "min_momentum_pct": {
         "default": 0.5,
@@ -71,7 +70,7 @@ CONFIG_SCHEMA = {
         "default": "binance",
         "env": "SIMMER_SPRINT_SIGNAL",
         "type": str,
-        "help": "Price feed source (binance, coingecko)",
+        "help": "Price feed source (binance, coingecko) or a priority list to fuse, e.g. binance,coingecko",
     },
     "lookback_minutes": {
         "default": 5,
@@ -109,8 +108,209 @@ CONFIG_SCHEMA = {
         "type": float,
         "help": "Max total spend per UTC day",
     },
+    "asset_daily_budget": {
+        "default": 0.0,
+        "env": "SIMMER_SPRINT_ASSET_BUDGET",
+        "type": float,
+        "help": "Max spend per UTC day across all windows of one asset (0 = off)",
+    },
+    "global_daily_budget": {
+        "default": 0.0,
+        "env": "SIMMER_SPRINT_GLOBAL_BUDGET",
+        "type": float,
+        "help": "Max spend per UTC day across every pair and worker sharing daily_spend.json (0 = off)",
+    },
+    "fair_value_model": {
+        "default": "probability",
+        "env": "SIMMER_SPRINT_FAIR_VALUE",
+        "type": str,
+        "help": "Fair YES price: probability (spot vs window open, volatility, time left) or momentum (50¢ ± entry_threshold)",
+    },
+    "price_stream": {
+        "default": True,
+        "env": "SIMMER_SPRINT_STREAM",
+        "type": bool,
+        "help": "Stream Binance klines over WebSocket instead of polling REST",
+    },
+    "signal_fusion": {
+        "default": "volume",
+        "env": "SIMMER_SPRINT_SIGNAL_FUSION",
+        "type": str,
+        "help": "How to combine several signal sources: volume, latency or primary (failover only)",
+    },
+    "signal_poll_interval": {
+        "default": 20.0,
+        "env": "SIMMER_SPRINT_SIGNAL_POLL",
+        "type": float,
+        "help": "Seconds between background polls of price-only sources (coingecko)",
+    },
+    "indicator_horizons": {
+        "default": "1,5,15",
+        "env": "SIMMER_SPRINT_INDICATOR_HORIZONS",
+        "type": str,
+        "help": "Momentum horizons (minutes) reported alongside the signal, comma-separated",
+    },
+    "eval_offsets": {
+        "default": "5,60,120,180,235",
+        "env": "SIMMER_SPRINT_EVAL_OFFSETS",
+        "type": str,
+        "help": "Seconds after each window opens at which to evaluate (comma-separated)",
+    },
+    "trigger_move_pct": {
+        "default": 0.1,
+        "env": "SIMMER_SPRINT_TRIGGER_MOVE",
+        "type": float,
+        "help": "Evaluate immediately when price moves this % since last check (0 = off)",
+    },
+    "call_deadline": {
+        "default": 5.0,
+        "env": "SIMMER_SPRINT_CALL_DEADLINE",
+        "type": float,
+        "help": "Per-call deadline (seconds) for concurrent fetches in a cycle",
+    },
+    "http_pool_size": {
+        "default": 4,
+        "env": "SIMMER_SPRINT_HTTP_POOL",
+        "type": int,
+        "help": "Keep-alive connections kept per API host",
+    },
+    "http_idle_timeout": {
+        "default": 30.0,
+        "env": "SIMMER_SPRINT_HTTP_IDLE",
+        "type": float,
+        "help": "Close pooled connections idle longer than this (seconds)",
+    },
+    "api_rate_limits": {
+        "default": {},
+        "env": "SIMMER_SPRINT_API_LIMITS",
+        "type": dict,
+        "help": 'Per-host pacing overrides as JSON, e.g. {"api.coingecko.com": {"rps": 0.2, "burst": 2}}',
+    },
+    "api_circuit_failures": {
+        "default": 5,
+        "env": "SIMMER_SPRINT_CIRCUIT_FAILURES",
+        "type": int,
+        "help": "Consecutive API failures that open a host's circuit (0 = never)",
+    },
+    "api_circuit_cooldown": {
+        "default": 30.0,
+        "env": "SIMMER_SPRINT_CIRCUIT_COOLDOWN",
+        "type": float,
+        "help": "Seconds an open circuit refuses requests before probing the host again",
+    },
+    "api_fallback_age": {
+        "default": 15.0,
+        "env": "SIMMER_SPRINT_API_FALLBACK_AGE",
+        "type": float,
+        "help": "Serve the last good response up to this old (seconds) when a host is throttled or down (0 = off)",
+    },
+    "pairs": {
+        "default": "",
+        "env": "SIMMER_SPRINT_PAIRS",
+        "type": str,
+        "help": "Asset:window pairs to trade in one process, e.g. BTC:5m,ETH:15m (default: asset/window)",
+    },
+    "pair_overrides": {
+        "default": {},
+        "env": "SIMMER_SPRINT_PAIR_OVERRIDES",
+        "type": dict,
+        "help": 'Per-pair setting overrides as JSON, e.g. {"ETH:15m": {"entry_threshold": 0.08}}',
+    },
+    "import_cache": {
+        "default": True,
+        "env": "SIMMER_SPRINT_IMPORT_CACHE",
+        "type": bool,
+        "help": "Persist slug→market_id import results to import_cache.json",
+    },
+    "prefetch_imports": {
+        "default": False,
+        "env": "SIMMER_SPRINT_PREFETCH_IMPORTS",
+        "type": bool,
+        "help": "Import upcoming windows in the background as soon as they are discovered (uses import quota)",
+    },
+    "prewarm_orders": {
+        "default": True,
+        "env": "SIMMER_SPRINT_PREWARM",
+        "type": bool,
+        "help": "Resolve the selected market and fetch its details before the signal; skip it if resolved or closed",
+    },
+    "order_book": {
+        "default": True,
+        "env": "SIMMER_SPRINT_ORDER_BOOK",
+        "type": bool,
+        "help": "Price trades from live CLOB depth (expected fill for the position size) instead of Gamma outcomePrices",
+    },
+    "max_slippage": {
+        "default": 0.02,
+        "env": "SIMMER_SPRINT_MAX_SLIPPAGE",
+        "type": float,
+        "help": "Skip when the expected average fill is more than this above the best ask",
+    },
+    "tick_signals": {
+        "default": True,
+        "env": "SIMMER_SPRINT_TICK_SIGNALS",
+        "type": bool,
+        "help": "Re-check the last evaluated market's gates on every streamed price and wake the loop once it would trade",
+    },
+    "portfolio_refresh": {
+        "default": 60,
+        "env": "SIMMER_SPRINT_PORTFOLIO_REFRESH",
+        "type": int,
+        "help": "Keep balance and positions in a local cache, updated from our trades and re-synced with Simmer every N seconds (0 = fetch on every use)",
+    },
+    "portfolio_markets": {
+        "default": 0,
+        "env": "SIMMER_SPRINT_PORTFOLIO_MARKETS",
+        "type": int,
+        "help": "Evaluate the N soonest tradeable markets of every pair and split the budget by EV per dollar (0 = only the soonest market per pair)",
+    },
+    "max_cycle_exposure": {
+        "default": 0.0,
+        "env": "SIMMER_SPRINT_MAX_CYCLE_EXPOSURE",
+        "type": float,
+        "help": "In portfolio mode, max total $ put on in one cycle across all markets (0 = off)",
+    },
+    "record_dir": {
+        "default": "",
+        "env": "SIMMER_SPRINT_RECORD_DIR",
+        "type": str,
+        "help": "Record candles, trade ticks and market prices to this directory (needs numpy)",
+    },
+    "event_log": {
+        "default": "events.jsonl",
+        "env": "SIMMER_SPRINT_EVENT_LOG",
+        "type": str,
+        "help": "JSONL file receiving one structured event per decision (empty = off)",
+    },
+    "metrics_port": {
+        "default": 0,
+        "env": "SIMMER_SPRINT_METRICS_PORT",
+        "type": int,
+        "help": "Serve Prometheus metrics on 127.0.0.1:PORT/metrics (0 = off)",
+    },
+    "metrics_log_interval": {
+        "default": 300,
+        "env": "SIMMER_SPRINT_METRICS_LOG",
+        "type": int,
+        "help": "Print a JSON metrics line every N seconds when looping (0 = off)",
+    },
 }
 
+# Settings that may be overridden per (asset, window) pair via pair_overrides
+PAIR_SETTINGS = (
+    "entry_threshold",
+    "min_momentum_pct",
+    "max_position",
+    "signal_source",
+    "lookback_minutes",
+    "min_time_remaining",
+    "volume_confidence",
+    "daily_budget",
+    "asset_daily_budget",
+    "fair_value_model",
+    "max_slippage",
+)
+
 TRADE_SOURCE = "sdk:fastloop"
 SMART_SIZING_PCT = 0.05  # 5% of balance per trade
 MIN_SHARES_PER_ORDER = 5  # Polymarket minimum
@@ -122,13 +322,6 @@ ASSET_SYMBOLS = {
     "SOL": "SOLUSDT",
 }
 
-# Asset → Gamma API search patterns
-ASSET_PATTERNS = {
-    "BTC": ["bitcoin up or down"],
-    "ETH": ["ethereum up or down"],
-    "SOL": ["solana up or down"],
-}
-
 
 def _load_config(schema, skill_file, config_filename="config.json"):
     """Load config with priority: config.json > env vars > defaults."""
@@ -152,6 +345,8 @@ def _load_config(schema, skill_file, config_filename="config.json"):
             try:
                 if type_fn == bool:
                     result[key] = val.lower() in ("true", "1", "yes")
+                elif type_fn == dict:
+                    result[key] = json.loads(val)
                 else:
                     result[key] = type_fn(val)
             except (ValueError, TypeError):
@@ -161,12 +356,32 @@ def _load_config(schema, skill_file, config_filename="config.json"):
     return result
 
 
+def _validate_config(config):
+    """Problems with values the type check can't catch (empty list when valid)."""
+    from signals import FUSION_MODES
+
+    problems = []
+    if config.get("signal_fusion") not in FUSION_MODES:
+        problems.append(
+            f"signal_fusion={config.get('signal_fusion')!r} (expected {', '.join(FUSION_MODES)})"
+        )
+    return problems
+
+
 def _get_config_path(skill_file, config_filename="config.json"):
     from pathlib import Path
 
     return Path(skill_file).parent / config_filename
 
 
+def _config_mtime(skill_file, config_filename="config.json"):
+    """config.json's modification time (ns), or None if it does not exist."""
+    try:
+        return os.stat(_get_config_path(skill_file, config_filename)).st_mtime_ns
+    except OSError:
+        return None
+
+
 def _update_config(updates, skill_file, config_filename="config.json"):
     """Update config.json with new values."""
     from pathlib import Path
@@ -180,23 +395,161 @@ def _update_config(updates, skill_file, config_filename="config.json"):
         except (json.JSONDecodeError, IOError):
             pass
     existing.update(updates)
-    with open(config_path, "w") as f:
+    # Write-then-rename so a running loop never reloads a half-written file
+    tmp_path = config_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
         json.dump(existing, f, indent=2)
+    os.replace(tmp_path, config_path)
     return existing
 
 
+# Settings read once at startup. A hot reload reports changes to these but
+# keeps the running values until the process restarts.
+RESTART_SETTINGS = (
+    "asset",
+    "window",
+    "pairs",
+    "price_stream",
+    "signal_fusion",
+    "signal_poll_interval",
+    "indicator_horizons",
+    "http_pool_size",
+    "http_idle_timeout",
+    "api_rate_limits",
+    "api_circuit_failures",
+    "api_circuit_cooldown",
+    "import_cache",
+    "record_dir",
+    "event_log",
+    "metrics_port",
+    "portfolio_refresh",
+)
+
+
+def _apply_config(config):
+    """Set the module-level settings from a loaded config (at import and on reload)."""
+    global cfg, ENTRY_THRESHOLD, MIN_MOMENTUM_PCT, MAX_POSITION_USD, SIGNAL_SOURCE
+    global LOOKBACK_MINUTES, MIN_TIME_REMAINING, ASSET, WINDOW, VOLUME_CONFIDENCE, DAILY_BUDGET
+    global PRICE_STREAM, SIGNAL_FUSION, SIGNAL_POLL_INTERVAL, INDICATOR_HORIZONS, EVAL_OFFSETS
+    global TRIGGER_MOVE_PCT, CALL_DEADLINE, HTTP_POOL_SIZE, HTTP_IDLE_TIMEOUT, PAIR_OVERRIDES
+    global IMPORT_CACHE, PREFETCH_IMPORTS, PREWARM_ORDERS, ORDER_BOOK, RECORD_DIR, EVENT_LOG
+    global METRICS_PORT, METRICS_LOG_INTERVAL, GLOBAL_DAILY_BUDGET, PORTFOLIO_MARKETS
+    global MAX_CYCLE_EXPOSURE, PORTFOLIO_REFRESH, TICK_SIGNALS, API_RATE_LIMITS
+    global API_CIRCUIT_FAILURES, API_CIRCUIT_COOLDOWN, API_FALLBACK_AGE
+    cfg = config
+    ENTRY_THRESHOLD = cfg["entry_threshold"]
+    MIN_MOMENTUM_PCT = cfg["min_momentum_pct"]
+    MAX_POSITION_USD = cfg["max_position"]
+    SIGNAL_SOURCE = cfg["signal_source"]
+    LOOKBACK_MINUTES = cfg["lookback_minutes"]
+    MIN_TIME_REMAINING = cfg["min_time_remaining"]
+    ASSET = cfg["asset"].upper()
+    WINDOW = cfg["window"]  # "5m" or "15m"
+    VOLUME_CONFIDENCE = cfg["volume_confidence"]
+    DAILY_BUDGET = cfg["daily_budget"]
+    GLOBAL_DAILY_BUDGET = cfg["global_daily_budget"]
+    PRICE_STREAM = cfg["price_stream"]
+    SIGNAL_FUSION = cfg["signal_fusion"]
+    SIGNAL_POLL_INTERVAL = cfg["signal_poll_interval"]
+    INDICATOR_HORIZONS = tuple(
+        int(h) for h in str(cfg["indicator_horizons"]).split(",") if h.strip().isdigit()
+    )
+    EVAL_OFFSETS = cfg["eval_offsets"]
+    TRIGGER_MOVE_PCT = cfg["trigger_move_pct"]
+    CALL_DEADLINE = cfg["call_deadline"]
+    HTTP_POOL_SIZE = cfg["http_pool_size"]
+    HTTP_IDLE_TIMEOUT = cfg["http_idle_timeout"]
+    API_RATE_LIMITS = cfg["api_rate_limits"] or {}
+    API_CIRCUIT_FAILURES = cfg["api_circuit_failures"]
+    API_CIRCUIT_COOLDOWN = cfg["api_circuit_cooldown"]
+    API_FALLBACK_AGE = cfg["api_fallback_age"]
+    PAIR_OVERRIDES = cfg["pair_overrides"] or {}
+    IMPORT_CACHE = cfg["import_cache"]
+    PREFETCH_IMPORTS = cfg["prefetch_imports"]
+    PREWARM_ORDERS = cfg["prewarm_orders"]
+    ORDER_BOOK = cfg["order_book"]
+    PORTFOLIO_MARKETS = cfg["portfolio_markets"]
+    PORTFOLIO_REFRESH = cfg["portfolio_refresh"]
+    TICK_SIGNALS = cfg["tick_signals"]
+    MAX_CYCLE_EXPOSURE = cfg["max_cycle_exposure"]
+    RECORD_DIR = cfg["record_dir"]
+    EVENT_LOG = cfg["event_log"]
+    METRICS_PORT = cfg["metrics_port"]
+    METRICS_LOG_INTERVAL = cfg["metrics_log_interval"]
+
+
 # Load config
-cfg = _load_config(CONFIG_SCHEMA, __file__)
-ENTRY_THRESHOLD = cfg["entry_threshold"]
-MIN_MOMENTUM_PCT = cfg["min_momentum_pct"]
-MAX_POSITION_USD = cfg["max_position"]
-SIGNAL_SOURCE = cfg["signal_source"]
-LOOKBACK_MINUTES = cfg["lookback_minutes"]
-MIN_TIME_REMAINING = cfg["min_time_remaining"]
-ASSET = cfg["asset"].upper()
-WINDOW = cfg["window"]  # "5m" or "15m"
-VOLUME_CONFIDENCE = cfg["volume_confidence"]
-DAILY_BUDGET = cfg["daily_budget"]
+_apply_config(_load_config(CONFIG_SCHEMA, __file__))
+
+# Stage timings, skip reasons, trades and API errors (see metrics.py)
+METRICS = MetricsRegistry("fastloop")
+
+
+def _parse_pairs(value, default_asset, default_window):
+    """Parse 'BTC:5m,ETH:15m' into [(asset, window)]; empty → the single default pair."""
+    pairs = []
+    for item in str(value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        asset, _, window = item.partition(":")
+        pair = (asset.strip().upper(), (window.strip() or default_window))
+        if pair not in pairs:
+            pairs.append(pair)
+    return pairs or [(default_asset, default_window)]
+
+
+PAIRS = _parse_pairs(cfg["pairs"], ASSET, WINDOW)
+
+
+def _pair_config(asset, window):
+    """Effective settings for one pair: global config + pair_overrides.
+
+    Overrides are looked up by "ASSET:WINDOW" first, then by "ASSET".
+    Each pair gets its own daily_budget (isolated spend tracking).
+    """
+    pair = f"{asset}:{window}"
+    merged = {key: cfg[key] for key in PAIR_SETTINGS}
+    for override_key in (asset, pair):
+        overrides = PAIR_OVERRIDES.get(override_key) or {}
+        for key, value in overrides.items():
+            if key in PAIR_SETTINGS:
+                type_fn = CONFIG_SCHEMA[key]["type"]
+                merged[key] = value if type_fn == bool else type_fn(value)
+    merged.update(
+        {
+            "asset": asset,
+            "window": window,
+            "pair": pair,
+            "tag": f" [{pair}]" if len(PAIRS) > 1 else "",
+        }
+    )
+    return merged
+
+
+def reload_config():
+    """Re-read config.json / env vars and apply the changes in place.
+
+    Returns (applied, pending): changed keys now in effect, and changed
+    RESTART_SETTINGS that keep their running value until restart.
+    """
+    config_path = _get_config_path(__file__)
+    if config_path.exists():
+        try:
+            with open(config_path) as f:
+                json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            raise ValueError(f"{config_path.name} is unreadable ({e}) — keeping the running config")
+    fresh = _load_config(CONFIG_SCHEMA, __file__)
+    problems = _validate_config(fresh)
+    if problems:
+        raise ValueError(f"invalid {'; '.join(problems)} — keeping the running config")
+    changed = [key for key in CONFIG_SCHEMA if fresh.get(key) != cfg.get(key)]
+    pending = [key for key in changed if key in RESTART_SETTINGS]
+    for key in pending:
+        fresh[key] = cfg[key]
+    _apply_config(fresh)
+    return [key for key in changed if key not in pending], pending
 
 
 # =============================================================================
@@ -210,26 +563,25 @@ def _get_spend_path(skill_file):
     return Path(skill_file).parent / "daily_spend.json"
 
 
-def _load_daily_spend(skill_file):
-    """Load today's spend. Resets if date != today (UTC)."""
-    spend_path = _get_spend_path(skill_file)
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    if spend_path.exists():
-        try:
-            with open(spend_path) as f:
-                data = json.load(f)
-            if data.get("date") == today:
-                return data
-        except (json.JSONDecodeError, IOError):
-            pass
-    return {"date": today, "spent": 0.0, "trades": 0}
+_spend_log = None
+
 
+def get_spend_log():
+    """Lazy-init today's spend, held in memory for the life of the process.
 
-def _save_daily_spend(skill_file, spend_data):
-    """Save daily spend to file."""
-    spend_path = _get_spend_path(skill_file)
-    with open(spend_path, "w") as f:
-        json.dump(spend_data, f, indent=2)
+    Per-pair spend lives under "pairs"; top-level spent/trades are totals.
+    Trades are reserved, then committed, through daily_spend.json.wal and
+    folded into daily_spend.json periodically and at exit. Workers sharing
+    the directory share the ledger (see spend_log.py).
+    """
+    global _spend_log
+    if _spend_log is None:
+        import atexit
+        from spend_log import SpendLog
+
+        _spend_log = SpendLog(_get_spend_path(__file__), default_pair=f"{ASSET}:{WINDOW}")
+        atexit.register(_spend_log.close)
+    return _spend_log
 
 
 # =============================================================================
@@ -257,8 +609,73 @@ def get_client():
     return _client
 
 
-def _api_request(url, method="GET", data=None, headers=None, timeout=15):
-    """Make an HTTP request to external APIs (Binance, CoinGecko, Gamma). Returns parsed JSON or None on error."""
+_http_pool = None
+
+
+def get_http_pool():
+    """Lazy-init the shared keep-alive HTTP pool."""
+    global _http_pool
+    if _http_pool is None:
+        from http_pool import HTTPPool
+
+        _http_pool = HTTPPool(pool_size=HTTP_POOL_SIZE, idle_timeout=HTTP_IDLE_TIMEOUT)
+    return _http_pool
+
+
+_rate_limiter = None
+
+
+def get_rate_limiter():
+    """Lazy-init the shared per-host rate limiter / circuit breaker."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        from rate_limit import RateLimiter
+
+        _rate_limiter = RateLimiter(API_RATE_LIMITS, API_CIRCUIT_FAILURES, API_CIRCUIT_COOLDOWN)
+    return _rate_limiter
+
+
+def _api_fallback(limiter, url, host, error):
+    """The last good response for url while its host is throttled or failing, else error."""
+    raw = limiter.fallback(url, API_FALLBACK_AGE) if API_FALLBACK_AGE > 0 else None
+    if raw is not None:
+        try:
+            result = json.loads(raw.decode("utf-8"))
+        except ValueError:
+            return error
+        METRICS.inc("api_fallbacks", host=host)
+        return result
+    return error
+
+
+def _api_record(limiter, host, status, headers=None):
+    """Feed a response (status None = connection error) to the host's circuit."""
+    host_limiter = limiter.host(host)
+    was = host_limiter.state
+    host_limiter.record(status, headers)
+    if host_limiter.state != was:
+        METRICS.set("api_circuit_open", int(host_limiter.state != "closed"), host=host)
+        if host_limiter.state == "open":
+            METRICS.inc("api_circuit_opens", host=host)
+
+
+def _api_request(url, method="GET", data=None, headers=None, timeout=15, fallback=True):
+    """Make an HTTP request to external APIs (Binance, CoinGecko, Gamma). Returns parsed JSON or None on error.
+
+    Requests are paced per host (see rate_limit.py). While a host is
+    throttled or its circuit is open, a GET is answered with the last good
+    response if it is at most api_fallback_age old (unless fallback=False).
+    """
+    import http.client
+
+    host = urlsplit(url).hostname
+    limiter = get_rate_limiter()
+    fallback = fallback and method == "GET"
+    refused = limiter.acquire(url, max_wait=min(timeout, CALL_DEADLINE) / 2)
+    if refused:
+        METRICS.inc("api_refused", host=host, reason=refused)
+        error = {"error": f"{host} {refused.replace('_', ' ')}, request not sent", "refused": refused}
+        return _api_fallback(limiter, url, host, error) if fallback else error
     try:
         req_headers = headers or {}
         if "User-Agent" not in req_headers:
@@ -267,91 +684,239 @@ def _api_request(url, method="GET", data=None, headers=None, timeout=15):
         if data:
             body = json.dumps(data).encode("utf-8")
             req_headers["Content-Type"] = "application/json"
-        req = Request(url, data=body, headers=req_headers, method=method)
-        with urlopen(req, timeout=timeout) as resp:
-            return json.loads(resp.read().decode("utf-8"))
-    except HTTPError as e:
-        try:
-            error_body = json.loads(e.read().decode("utf-8"))
-            return {"error": error_body.get("detail", str(e)), "status_code": e.code}
-        except Exception:
-            return {"error": str(e), "status_code": e.code}
-    except URLError as e:
-        return {"error": f"Connection error: {e.reason}"}
+        status, resp_headers, raw = get_http_pool().request(
+            method, url, body=body, headers=req_headers, timeout=timeout
+        )
+    except (OSError, http.client.HTTPException) as e:
+        _api_record(limiter, host, None)
+        METRICS.inc("api_errors", host=host, kind="connection")
+        error = {"error": f"Connection error: {e}"}
+        return _api_fallback(limiter, url, host, error) if fallback else error
+    except Exception as e:
+        _api_record(limiter, host, None)  # Also releases a half-open probe
+        METRICS.inc("api_errors", host=host, kind="other")
+        return {"error": str(e)}
+    _api_record(limiter, host, status, resp_headers)
+    try:
+        if status >= 400:
+            METRICS.inc("api_errors", host=host, kind=f"http_{status}")
+            try:
+                error_body = json.loads(raw.decode("utf-8"))
+                detail = error_body.get("detail") if isinstance(error_body, dict) else None
+                error = {"error": detail or f"HTTP Error {status}", "status_code": status}
+            except Exception:
+                error = {"error": f"HTTP Error {status}", "status_code": status}
+            if fallback and (status >= 500 or status in (418, 429)):
+                return _api_fallback(limiter, url, host, error)
+            return error
+        result = json.loads(raw.decode("utf-8"))
+        if fallback and API_FALLBACK_AGE > 0:
+            limiter.remember(url, raw)
+        return result
     except Exception as e:
+        METRICS.inc("api_errors", host=host, kind="decode")
         return {"error": str(e)}
 
 
+_executor = None  # Shared worker pool for blocking calls made from the async cycle
+
+
+def _run_blocking(fn, *args, **kwargs):
+    """Schedule a blocking call on the shared worker pool. Returns an awaitable.
+
+    A module-level pool (rather than asyncio.to_thread) means asyncio.run()
+    does not wait on straggler threads when a cycle returns early.
+    """
+    import asyncio
+    import functools
+
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="fastloop")
+    return _executor
+
+
+_in_flight = {}  # (fn, args, kwargs) -> concurrent Future of a helper call on the pool
+_in_flight_lock = threading.Lock()
+
+
+def _submit_once(fn, *args, **kwargs):
+    """Submit fn to the worker pool, or return the identical call still running there.
+
+    A helper that outlived its deadline (e.g. discovery) is joined by the next
+    cycle instead of being started a second time next to it.
+    """
+    # Lists (e.g. the pair list) key as tuples so identical calls still match
+    key_args = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+    key = (fn, key_args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:  # Unhashable arguments (market dicts): no sharing
+        return _get_executor().submit(fn, *args, **kwargs)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is not None and not future.done():
+            METRICS.inc("calls_joined", fn=fn.__name__)
+            return future
+        if len(_in_flight) >= 64:
+            for stale in [k for k, f in _in_flight.items() if f.done()]:
+                del _in_flight[stale]
+        future = _in_flight[key] = _get_executor().submit(fn, *args, **kwargs)
+    return future
+
+
+async def _call_with_deadline(fn, *args, deadline=None, default=None, **kwargs):
+    """Run a blocking helper on the worker pool, giving up after deadline seconds.
+
+    On timeout the caller gets `default` immediately; the worker thread is left
+    to finish on its own (bounded by the helper's own socket timeout). Until it
+    does, the same call (same helper and arguments) joins it rather than
+    starting another.
+    """
+    import asyncio
+
+    deadline = CALL_DEADLINE if deadline is None else deadline
+    future = asyncio.wrap_future(_submit_once(fn, *args, **kwargs))
+    try:
+        # shield: a timeout must not cancel a call other cycles may be joining
+        return await asyncio.wait_for(asyncio.shield(future), timeout=deadline)
+    except asyncio.TimeoutError:
+        return default
+
+
 # =============================================================================
 # Sprint Market Discovery
 # =============================================================================
 
 
-def discover_fast_market_markets(asset="BTC", window="5m"):
-    """Find active fast markets on Polymarket via Gamma API."""
-    patterns = ASSET_PATTERNS.get(asset, ASSET_PATTERNS["BTC"])
-    url = (
-        "https://gamma-api.polymarket.com/markets"
-        "?limit=20&closed=false&tag=crypto&order=createdAt&ascending=false"
-    )
+def _fetch_gamma_markets(limit=20, **params):
+    """Open crypto markets from the Gamma API, newest first. Returns list or None."""
+    query = {
+        "limit": limit,
+        "closed": "false",
+        "tag": "crypto",
+        "order": "createdAt",
+        "ascending": "false",
+    }
+    query.update(params)
+    return _gamma_markets(query)
+
+
+def _gamma_markets(params):
+    """GET /markets with arbitrary params (lists become repeated keys)."""
+    url = "https://gamma-api.polymarket.com/markets?" + urlencode(params, doseq=True)
     result = _api_request(url)
     if not result or isinstance(result, dict) and result.get("error"):
-        return []
+        return None
+    return result
+
+
+def _parse_gamma_market(m):
+    """Gamma market record → fast market dict (with asset/window), or None."""
+    from market_parser import parse_market
+
+    slug = m.get("slug", "")
+    if not slug or m.get("closed", False):
+        return None
+    parsed = parse_market(m)  # Memoized per slug
+    if not parsed["asset"] or parsed["window"] not in ("5m", "15m"):
+        return None
+    return {
+        "question": m.get("question", ""),
+        "slug": slug,
+        "asset": parsed["asset"],
+        "window": parsed["window"],
+        "condition_id": m.get("conditionId", ""),
+        # endDate, else the slug's start timestamp, else the question's ET times
+        "end_time": parsed["end_time"],
+        "outcomes": m.get("outcomes", []),
+        "outcome_prices": m.get("outcomePrices", "[]"),
+        "clob_token_ids": m.get("clobTokenIds", "[]"),  # [YES token, NO token]
+        "fee_rate_bps": int(m.get("fee_rate_bps") or m.get("feeRateBps") or 0),
+    }
+
 
+def _market_yes_price(market):
+    """YES price from Gamma's outcomePrices, parsed once per quote (0.5 if missing)."""
+    raw = market.get("outcome_prices", "[]")
+    cached = market.get("_yes_price")
+    if cached is not None and cached[0] is raw:
+        return cached[1]
+    try:
+        prices = json.loads(raw) if isinstance(raw, str) else raw
+        price = float(prices[0]) if prices else 0.5
+    except (json.JSONDecodeError, IndexError, ValueError, TypeError):
+        price = 0.5
+    market["_yes_price"] = (raw, price)  # The index swaps in a new string on each quote
+    return price
+
+
+def _filter_fast_markets(raw_markets, asset, window):
+    """Select the asset/window fast markets from raw Gamma market records."""
     markets = []
-    for m in result:
-        q = (m.get("question") or "").lower()
-        slug = m.get("slug", "")
-        matches_window = f"-{window}-" in slug
-        if any(p in q for p in patterns) and matches_window:
-            condition_id = m.get("conditionId", "")
-            closed = m.get("closed", False)
-            if not closed and slug:
-                # Parse end time from question (e.g., "5:30AM-5:35AM ET")
-                end_time = _parse_fast_market_end_time(m.get("question", ""))
-                markets.append(
-                    {
-                        "question": m.get("question", ""),
-                        "slug": slug,
-                        "condition_id": condition_id,
-                        "end_time": end_time,
-                        "outcomes": m.get("outcomes", []),
-                        "outcome_prices": m.get("outcomePrices", "[]"),
-                        "fee_rate_bps": int(
-                            m.get("fee_rate_bps") or m.get("feeRateBps") or 0
-                        ),
-                    }
-                )
+    for m in raw_markets:
+        market = _parse_gamma_market(m)
+        if market and market["asset"] == asset and market["window"] == window:
+            markets.append(market)
     return markets
 
 
-def _parse_fast_market_end_time(question):
-    """Parse end time from fast market question.
-    e.g., 'Bitcoin Up or Down - February 15, 5:30AM-5:35AM ET' → datetime
-    """
-    import re
+def discover_fast_market_markets(asset="BTC", window="5m"):
+    """Find active fast markets on Polymarket via Gamma API."""
+    result = _fetch_gamma_markets()
+    if not result:
+        return []
+    return _filter_fast_markets(result, asset, window)
 
-    # Match pattern: "Month Day, StartTime-EndTime ET"
-    pattern = r"(\w+ \d+),.*?-\s*(\d{1,2}:\d{2}(?:AM|PM))\s*ET"
-    match = re.search(pattern, question)
-    if not match:
-        return None
-    try:
-        date_str = match.group(1)
-        time_str = match.group(2)
-        year = datetime.now(timezone.utc).year
-        dt_str = f"{date_str} {year} {time_str}"
-        # Parse as ET (UTC-5)
-        dt = datetime.strptime(dt_str, "%B %d %Y %I:%M%p")
-        # Convert ET to UTC (+5 hours)
-        dt = dt.replace(tzinfo=timezone.utc) + timedelta(hours=5)
-        return dt
-    except Exception:
-        return None
+
+_market_index = None
+
+
+def get_market_index():
+    """Lazy-init the shared incremental market index."""
+    global _market_index
+    if _market_index is None:
+        from market_index import MarketIndex
+
+        _market_index = MarketIndex(_gamma_markets, _parse_gamma_market)
+    return _market_index
 
 
-def find_best_fast_market(markets):
-    """Pick the best fast_market to trade: soonest expiring with enough time remaining."""
+def discover_fast_markets_for_pairs(pairs, min_time_remaining=None):
+    """Refresh the market index once for every pair. Returns {"ASSET:WINDOW": markets}.
+
+    Only markets created since the last refresh are downloaded; prices for
+    the next tradeable market of each pair are refreshed in one batched call.
+    """
+    if min_time_remaining is None:
+        min_time_remaining = MIN_TIME_REMAINING
+    with METRICS.stage("discovery"):
+        index = get_market_index()
+        index.refresh()
+        upcoming = []
+        for asset, window in pairs:
+            upcoming += [m["slug"] for m in index.upcoming(asset, window, min_time_remaining)]
+        index.refresh_quotes(upcoming, max_age=1.0)
+        return {f"{asset}:{window}": index.live(asset, window) for asset, window in pairs}
+
+
+def find_best_fast_market(markets, min_time_remaining=None, asset=None, window=None):
+    """Pick the best fast_market to trade: soonest expiring with enough time remaining.
+
+    With asset/window given and the market index running, this is a bisect
+    lookup in the index instead of a scan over `markets`.
+    """
+    if min_time_remaining is None:
+        min_time_remaining = MIN_TIME_REMAINING
+    if asset and window and _market_index is not None:
+        return _market_index.find_best(asset, window, min_time_remaining)
     now = datetime.now(timezone.utc)
     candidates = []
     for m in markets:
@@ -359,7 +924,7 @@ def find_best_fast_market(markets):
         if not end_time:
             continue
         remaining = (end_time - now).total_seconds()
-        if remaining > MIN_TIME_REMAINING:
+        if remaining > min_time_remaining:
             candidates.append((remaining, m))
 
     if not candidates:
@@ -369,91 +934,346 @@ def find_best_fast_market(markets):
     return candidates[0][1]
 
 
+def find_tradeable_fast_markets(markets, min_time_remaining=None, asset=None, window=None, count=2):
+    """The `count` soonest-expiring markets with enough time remaining (portfolio mode)."""
+    if min_time_remaining is None:
+        min_time_remaining = MIN_TIME_REMAINING
+    if asset and window and _market_index is not None:
+        return _market_index.upcoming(asset, window, min_time_remaining, count)
+    now = datetime.now(timezone.utc)
+    candidates = [
+        m
+        for m in markets
+        if m.get("end_time") and (m["end_time"] - now).total_seconds() > min_time_remaining
+    ]
+    candidates.sort(key=lambda m: m["end_time"])
+    return candidates[:count]
+
+
 # =============================================================================
 # CEX Price Signal
 # =============================================================================
 
 
-def get_binance_momentum(symbol="BTCUSDT", lookback_minutes=5):
-    """Get price momentum from Binance public API.
-    Returns: {momentum_pct, direction, price_now, price_then, avg_volume, candles}
-    """
+_price_feed = None
+PRICE_FEED_MAX_AGE = 10  # Seconds without a frame before falling back to REST
+_recorder = None
+_recorder_checked = False
+
+
+def get_recorder():
+    """Lazy-init the tick recorder when record_dir is set. Returns None if off."""
+    global _recorder, _recorder_checked
+    if not _recorder_checked:
+        _recorder_checked = True
+        if RECORD_DIR:
+            try:
+                from tick_store import TickStore, TickRecorder
+            except ImportError:
+                print("⚠️  record_dir is set but numpy is not installed — recording disabled")
+                return None
+            _recorder = TickRecorder(TickStore(RECORD_DIR))
+    return _recorder
+
+
+def _fetch_binance_klines(symbol, limit, start_ms=None):
+    """Fetch raw 1m klines from Binance REST. Returns list of rows or None."""
     url = (
         f"https://data-api.binance.vision/api/v3/klines"
-        f"?symbol={symbol}&interval=1m&limit={lookback_minutes}"
+        f"?symbol={symbol}&interval=1m&limit={limit}"
     )
+    if start_ms is not None:
+        url += f"&startTime={int(start_ms)}"
     result = _api_request(url)
     if not result or isinstance(result, dict):
         return None
+    return result
+
+
+def start_price_feed(symbols=None, window_minutes=None):
+    """Start the shared Binance WebSocket feed (idempotent). Returns the feed."""
+    global _price_feed
+    if _price_feed is None:
+        from price_feed import BinancePriceFeed
+
+        _price_feed = BinancePriceFeed(
+            symbols or list(ASSET_SYMBOLS.values()),
+            window_minutes=window_minutes or max(30, LOOKBACK_MINUTES),
+            seed=_fetch_binance_klines,
+            recorder=get_recorder(),
+            horizons=INDICATOR_HORIZONS,
+        )
+    return _price_feed.start()
+
+
+def stop_price_feed():
+    global _price_feed
+    if _price_feed is not None:
+        _price_feed.stop()
+        _price_feed = None
+
+
+def get_binance_momentum(symbol="BTCUSDT", lookback_minutes=5):
+    """Get price momentum from Binance.
+    Served from the streaming feed when it is running and fresh, else REST.
+    Returns: {momentum_pct, direction, price_now, price_then, avg_volume, candles}
+    """
+    if _price_feed is not None and _price_feed.is_fresh(symbol, PRICE_FEED_MAX_AGE):
+        momentum = _price_feed.momentum(symbol, lookback_minutes)
+        if momentum:
+            return momentum
+
+    candles = _fetch_binance_klines(symbol, lookback_minutes)
+    if not candles:
+        return None
+
+    try:
+        # Kline format: [open_time, open, high, low, close, volume, ...]
+        rows = [[int(c[0]), *(float(v) for v in c[1:6])] for c in candles]
+    except (IndexError, ValueError, TypeError):
+        return None
+    recorder = get_recorder()
+    if recorder:
+        for c in candles[:-1]:  # Last candle is still open
+            recorder.candle(symbol, [int(c[0]), *(float(v) for v in c[1:6])])
+    from price_feed import compute_momentum
+
+    return compute_momentum(rows, horizons=INDICATOR_HORIZONS)
+
+
+_window_opens = {}  # (symbol, start_ms) -> open price; a window's open never changes
+
+
+def get_window_open(asset, start_secs, fetch=True):
+    """Binance price at the start of a market window (open of its first 1m candle).
+
+    Served from the streaming feed when it still holds that candle, else one
+    REST kline (unless fetch=False), cached. None if the window has not
+    started or the lookup fails.
+    """
+    if start_secs > time.time():
+        return None
+    symbol = ASSET_SYMBOLS.get(asset, "BTCUSDT")
+    start_ms = int(start_secs) // 60 * 60_000
+    key = (symbol, start_ms)
+    if key in _window_opens:
+        return _window_opens[key]
+    price = _price_feed.open_at(symbol, start_ms) if _price_feed is not None else None
+    if price is None and fetch:
+        rows = _fetch_binance_klines(symbol, 1, start_ms)
+        try:
+            if rows and int(rows[0][0]) == start_ms:
+                price = float(rows[0][1])
+        except (IndexError, ValueError, TypeError):
+            price = None
+    if price:
+        if len(_window_opens) > 512:
+            _window_opens.clear()
+        _window_opens[key] = price
+    return price
+
+
+def window_starts(markets, window_secs, now=None):
+    """Start times (epoch secs) of the markets whose window has begun, as a tuple."""
+    now = time.time() if now is None else now
+    starts = (m["end_time"].timestamp() - window_secs for m in markets if m.get("end_time"))
+    return tuple(sorted({start for start in starts if start <= now}))
+
+
+def fetch_window_opens(asset, starts):
+    """Resolve and cache the window opens for start times (REST where the stream lacks them).
+
+    Blocking; run it on the worker pool before fair_values_for().
+    """
+    return sum(1 for start in starts if get_window_open(asset, start) is not None)
+
+
+def fair_values_for(asset, markets, spot, vol_pct, window_secs, now=None):
+    """P(up) for every market of one asset in a single vectorized pass.
+
+    Window opens come from memory only (see fetch_window_opens). Markets
+    whose window has not started, or whose open is unknown, price from spot,
+    i.e. ~0.50. Returns a list aligned with markets.
+    """
+    from fair_value import fair_up
+
+    now = time.time() if now is None else now
+    opens, remaining = [], []
+    for m in markets:
+        end = m["end_time"].timestamp() if m.get("end_time") else now
+        start = end - window_secs
+        opens.append((get_window_open(asset, start, fetch=False) if start <= now else None) or spot)
+        remaining.append(end - now)
+    if not markets:
+        return []
+    return list(fair_up(spot, opens, vol_pct if vol_pct is not None else float("nan"), remaining))
+
+
+COINGECKO_ASSETS = {"BTC": "bitcoin", "ETH": "ethereum", "SOL": "solana"}
+
+
+def _fetch_coingecko_prices(assets):
+    """Current USD prices for assets in one CoinGecko request: {asset: price}."""
+    ids = {COINGECKO_ASSETS[a]: a for a in assets if a in COINGECKO_ASSETS}
+    if not ids:
+        return {}
+    url = (
+        "https://api.coingecko.com/api/v3/simple/price"
+        f"?ids={','.join(sorted(ids))}&vs_currencies=usd"
+    )
+    result = _api_request(url)
+    if not isinstance(result, dict) or result.get("error"):
+        return {}
+    return {
+        asset: (result.get(cg_id) or {}).get("usd")
+        for cg_id, asset in ids.items()
+        if (result.get(cg_id) or {}).get("usd")
+    }
+
+
+def _fetch_coingecko_history(asset):
+    """Last hour of ~5-minute CoinGecko prices as [(epoch_secs, price)], to seed history."""
+    cg_id = COINGECKO_ASSETS.get(asset)
+    if not cg_id:
+        return []
+    url = f"https://api.coingecko.com/api/v3/coins/{cg_id}/market_chart?vs_currency=usd&days=1"
+    result = _api_request(url)
+    if not isinstance(result, dict) or not isinstance(result.get("prices"), list):
+        return []
+    cutoff = time.time() - 3600
+    return [(ts / 1000, price) for ts, price in result["prices"] if ts / 1000 >= cutoff]
+
+
+_signal_hub = None
+
+
+def get_signal_hub():
+    """Lazy-init the signal hub with the built-in sources.
+
+    Register more with get_signal_hub().register(source) (see signals.py) and
+    list them in signal_source.
+    """
+    global _signal_hub
+    if _signal_hub is None:
+        from signals import SignalHub, FeedSource, PollingSource
+
+        hub = SignalHub(fusion=SIGNAL_FUSION, deadline=CALL_DEADLINE)
+        hub.register(
+            FeedSource(
+                "binance",
+                lambda: _price_feed,
+                lambda asset: ASSET_SYMBOLS.get(asset, "BTCUSDT"),
+                lambda asset, lookback: get_binance_momentum(
+                    ASSET_SYMBOLS.get(asset, "BTCUSDT"), lookback
+                ),
+                max_age=PRICE_FEED_MAX_AGE,
+            )
+        )
+        hub.register(
+            PollingSource(
+                "coingecko",
+                _fetch_coingecko_prices,
+                sorted({asset for asset, _ in PAIRS}),
+                interval=SIGNAL_POLL_INTERVAL,
+                seed=_fetch_coingecko_history,
+            )
+        )
+        _signal_hub = hub
+    return _signal_hub
+
+
+def stop_signal_hub():
+    global _signal_hub
+    if _signal_hub is not None:
+        _signal_hub.stop()
+        _signal_hub = None
+
+
+def _signal_names(source):
+    return [name.strip().lower() for name in str(source).split(",") if name.strip()]
+
+
+def get_coingecko_momentum(asset="bitcoin", lookback_minutes=5):
+    """Momentum from CoinGecko prices (no candles on the free tier).
+
+    History is seeded from the last hour of CoinGecko prices on first use and
+    kept across calls (polled in the background when looping), so one-shot
+    runs get momentum too.
+    """
+    asset = {v: k for k, v in COINGECKO_ASSETS.items()}.get(asset, asset.upper())
+    return get_signal_hub().momentum(asset, lookback_minutes, ["coingecko"])
+
+
+def get_momentum(asset="BTC", source="binance", lookback=5):
+    """Get price momentum from the configured source(s) via the signal hub."""
+    with METRICS.stage("signal"):
+        momentum = get_signal_hub().momentum(asset, lookback, _signal_names(source))
+    if momentum:
+        for name in momentum.get("stale", ()):
+            METRICS.inc("signal_stale", asset=asset, source=name)
+        if momentum.get("failover"):
+            METRICS.inc("signal_failovers", asset=asset, source=momentum["source"])
+    return momentum
+
 
-    try:
-        # Kline format: [open_time, open, high, low, close, volume, ...]
-        candles = result
-        if len(candles) < 2:
-            return None
+# =============================================================================
+# Order Book
+# =============================================================================
 
-        price_then = float(candles[0][1])  # open of oldest candle
-        price_now = float(candles[-1][4])  # close of newest candle
-        momentum_pct = ((price_now - price_then) / price_then) * 100
-        direction = "up" if momentum_pct > 0 else "down"
+CLOB_BOOK_URL = "https://clob.polymarket.com/book"
 
-        volumes = [float(c[5]) for c in candles]
-        avg_volume = sum(volumes) / len(volumes)
-        latest_volume = volumes[-1]
+_book_feed = None
 
-        # Volume ratio: latest vs average (>1 = above average activity)
-        volume_ratio = latest_volume / avg_volume if avg_volume > 0 else 1.0
 
-        return {
-            "momentum_pct": momentum_pct,
-            "direction": direction,
-            "price_now": price_now,
-            "price_then": price_then,
-            "avg_volume": avg_volume,
-            "latest_volume": latest_volume,
-            "volume_ratio": volume_ratio,
-            "candles": len(candles),
-        }
-    except (IndexError, ValueError, KeyError):
+def _fetch_clob_book(token_id):
+    """REST snapshot of one token's CLOB book ({"bids": [...], "asks": [...]}) or None."""
+    # A stale book would misprice the fill: no cached fallback
+    result = _api_request(f"{CLOB_BOOK_URL}?token_id={token_id}", fallback=False)
+    if not isinstance(result, dict) or result.get("error"):
         return None
+    return result
 
 
-def get_coingecko_momentum(asset="bitcoin", lookback_minutes=5):
-    """Fallback: get price from CoinGecko (less accurate, ~1-2 min lag)."""
-    url = f"https://api.coingecko.com/api/v3/simple/price?ids={asset}&vs_currencies=usd"
-    result = _api_request(url)
-    if not result or isinstance(result, dict) and result.get("error"):
-        return None
-    price_now = result.get(asset, {}).get("usd")
-    if not price_now:
-        return None
-    # CoinGecko doesn't give candle data on free tier, so just return current price
-    # Agent would need to track history across calls for momentum
-    return {
-        "momentum_pct": 0,  # Can't calculate without history
-        "direction": "neutral",
-        "price_now": price_now,
-        "price_then": price_now,
-        "avg_volume": 0,
-        "latest_volume": 0,
-        "volume_ratio": 1.0,
-        "candles": 0,
-    }
+def get_book_feed():
+    """Lazy-init the shared order book feed (REST snapshots until it is started)."""
+    global _book_feed
+    if _book_feed is None:
+        from order_book import BookFeed
 
+        _book_feed = BookFeed(fetch_book=_fetch_clob_book)
+    return _book_feed
 
-COINGECKO_ASSETS = {"BTC": "bitcoin", "ETH": "ethereum", "SOL": "solana"}
 
+def stop_book_feed():
+    global _book_feed
+    if _book_feed is not None:
+        _book_feed.stop()
+        _book_feed = None
 
-def get_momentum(asset="BTC", source="binance", lookback=5):
-    """Get price momentum from configured source."""
-    if source == "binance":
-        symbol = ASSET_SYMBOLS.get(asset, "BTCUSDT")
-        return get_binance_momentum(symbol, lookback)
-    elif source == "coingecko":
-        cg_id = COINGECKO_ASSETS.get(asset, "bitcoin")
-        return get_coingecko_momentum(cg_id, lookback)
-    else:
+
+def _yes_token(market):
+    """CLOB token id of the market's YES outcome, or None."""
+    tokens = market.get("clob_token_ids")
+    if isinstance(tokens, str):
+        try:
+            tokens = json.loads(tokens)
+        except ValueError:
+            return None
+    return str(tokens[0]) if isinstance(tokens, list) and tokens else None
+
+
+def get_order_book(market):
+    """Current YES order book for market (stream if synced, else REST), or None.
+
+    The NO side is the complement (see order_book.OrderBook.complement).
+    """
+    token = _yes_token(market)
+    if not token:
         return None
+    feed = get_book_feed()
+    feed.watch([token])
+    book = feed.get(token)
+    return book if book is not None and (book.bids or book.asks) else None
 
 
 # =============================================================================
@@ -461,13 +1281,44 @@ def get_momentum(asset="BTC", source="binance", lookback=5):
 # =============================================================================
 
 
-def import_fast_market_market(slug):
-    """Import a fast market to Simmer. Returns market_id or None."""
+_import_cache = None
+_imports_in_flight = set()
+_imports_lock = threading.Lock()
+
+
+def get_import_cache():
+    """Lazy-init the slug→market_id import cache (persisted if import_cache is on)."""
+    global _import_cache
+    if _import_cache is None:
+        from import_cache import ImportCache
+
+        path = None
+        if IMPORT_CACHE:
+            from pathlib import Path
+
+            path = str(Path(__file__).parent / "import_cache.json")
+        _import_cache = ImportCache(path)
+    return _import_cache
+
+
+def import_fast_market_market(slug, end_time=None):
+    """Import a fast market to Simmer. Returns (market_id, error).
+
+    Served from the import cache when this slug was imported before;
+    successful imports are cached until the market's end_time.
+    """
+    cache = get_import_cache()
+    market_id = cache.get(slug)
+    if market_id:
+        return market_id, None
+
     url = f"https://polymarket.com/event/{slug}"
+    start = time.perf_counter()
     try:
         result = get_client().import_market(url)
     except Exception as e:
         return None, str(e)
+    elapsed = time.perf_counter() - start
 
     if not result:
         return None, "No response from import endpoint"
@@ -488,11 +1339,35 @@ def import_fast_market_market(slug):
         return None, "Market resolved, no alternatives found"
 
     if status in ("imported", "already_exists"):
+        if market_id:
+            cache.put(slug, market_id, end_time, import_secs=elapsed)
         return market_id, None
 
     return None, f"Unexpected status: {status}"
 
 
+def prefetch_imports(markets):
+    """Import markets in the background so the trade path finds them cached."""
+    cache = get_import_cache()
+    for m in markets:
+        slug = m["slug"]
+        if cache.peek(slug):
+            continue
+        with _imports_lock:
+            if slug in _imports_in_flight:
+                continue
+            _imports_in_flight.add(slug)
+
+        def run(slug=slug, end_time=m.get("end_time")):
+            try:
+                import_fast_market_market(slug, end_time)
+            finally:
+                with _imports_lock:
+                    _imports_in_flight.discard(slug)
+
+        _get_executor().submit(run)
+
+
 def get_market_details(market_id):
     """Fetch market details by ID."""
     try:
@@ -525,6 +1400,44 @@ def get_positions():
         return []
 
 
+_portfolio_cache = None
+
+
+def get_portfolio_cache():
+    """Lazy-init the local balance/positions cache (None when portfolio_refresh is 0).
+
+    Seeded from the SDK on first read, updated from our own fills and
+    re-synced in the background once started (see portfolio_cache.py).
+    """
+    global _portfolio_cache
+    if _portfolio_cache is None and PORTFOLIO_REFRESH > 0:
+        from portfolio_cache import PortfolioCache
+
+        _portfolio_cache = PortfolioCache(
+            get_portfolio, lambda: get_client().get_positions(), PORTFOLIO_REFRESH
+        )
+    return _portfolio_cache
+
+
+def stop_portfolio_cache():
+    if _portfolio_cache is not None:
+        _portfolio_cache.stop()
+
+
+def get_portfolio_snapshot():
+    """Portfolio summary: from the local cache when enabled, else a fresh SDK call."""
+    cache = get_portfolio_cache()
+    return cache.snapshot() if cache is not None else get_portfolio()
+
+
+def get_fast_market_positions():
+    """Open fast-market ("Up or Down") positions as dicts."""
+    cache = get_portfolio_cache()
+    if cache is not None:
+        return cache.positions(fast_only=True)
+    return [p for p in get_positions() if "up or down" in (p.get("question", "") or "").lower()]
+
+
 def execute_trade(market_id, side, amount):
     """Execute a trade on Simmer."""
     try:
@@ -542,14 +1455,44 @@ def execute_trade(market_id, side, amount):
             "error": result.error,
         }
     except Exception as e:
+        METRICS.inc("api_errors", host="simmer", kind="trade")
         return {"error": str(e)}
 
 
-def calculate_position_size(max_size, smart_sizing=False):
+_prewarmer = None
+
+
+def _resolve_market_id_for_prewarm(market):
+    """Market ID for pre-warming: import only if prefetching is allowed, else cache."""
+    if PREFETCH_IMPORTS:
+        market_id, _ = import_fast_market_market(market["slug"], market.get("end_time"))
+        return market_id
+    return get_import_cache().peek(market["slug"])
+
+
+def get_order_prewarmer():
+    """Lazy-init the order pre-warmer (templates submit via execute_trade)."""
+    global _prewarmer
+    if _prewarmer is None:
+        from order_path import OrderPrewarmer
+
+        _prewarmer = OrderPrewarmer(
+            _resolve_market_id_for_prewarm,
+            get_market_details,
+            execute_trade,
+            TRADE_SOURCE,
+            _get_executor(),
+        )
+        METRICS.register("signal_to_submit_seconds", _prewarmer.signal_to_submit)
+    return _prewarmer
+
+
+def calculate_position_size(max_size, smart_sizing=False, portfolio=None):
     """Calculate position size, optionally based on portfolio."""
     if not smart_sizing:
         return max_size
-    portfolio = get_portfolio()
+    if portfolio is None:
+        portfolio = get_portfolio_snapshot()
     if not portfolio or portfolio.get("error"):
         return max_size
     balance = portfolio.get("balance_usdc", 0)
@@ -563,98 +1506,153 @@ def calculate_position_size(max_size, smart_sizing=False):
 # Main Strategy Logic
 # =============================================================================
 
+_scheduler = None  # WindowScheduler when running as a loop
+_tick_signals = {}  # (pair, slug) -> decision_kernel.TickSignal of each evaluated market
+_spend_lock = threading.Lock()  # Pairs run concurrently and share the cycle's spend totals
 
-def run_fast_market_strategy(
-    dry_run=True,
-    positions_only=False,
-    show_config=False,
-    smart_sizing=False,
-    quiet=False,
-):
-    """Run one cycle of the fast_market trading strategy."""
 
-    def log(msg, force=False):
-        """Print unless quiet mode is on. force=True always prints."""
-        if not quiet or force:
-            print(msg)
+_event_log = None
 
-    log("⚡ Simmer FastLoop Trading Skill")
-    log("=" * 50)
 
-    if dry_run:
-        log("\n  [DRY RUN] No trades will be executed. Use --live to enable trading.")
+def get_event_log():
+    """Lazy-init the buffered decision event log (None when event_log is off)."""
+    global _event_log
+    if _event_log is None and EVENT_LOG:
+        import atexit
+        from pathlib import Path
 
-    log(f"\n⚙️  Configuration:")
-    log(f"  Asset:            {ASSET}")
-    log(f"  Window:           {WINDOW}")
-    log(f"  Entry threshold:  {ENTRY_THRESHOLD} (min divergence from 50¢)")
-    log(f"  Min momentum:     {MIN_MOMENTUM_PCT}% (min price move)")
-    log(f"  Max position:     ${MAX_POSITION_USD:.2f}")
-    log(f"  Signal source:    {SIGNAL_SOURCE}")
-    log(f"  Lookback:         {LOOKBACK_MINUTES} minutes")
-    log(f"  Min time left:    {MIN_TIME_REMAINING}s")
-    log(f"  Volume weighting: {'✓' if VOLUME_CONFIDENCE else '✗'}")
-    daily_spend = _load_daily_spend(__file__)
-    log(
-        f"  Daily budget:     ${DAILY_BUDGET:.2f} (${daily_spend['spent']:.2f} spent today, {daily_spend['trades']} trades)"
-    )
+        path = Path(EVENT_LOG)
+        if not path.is_absolute():
+            path = Path(__file__).parent / path
+        _event_log = EventLog(str(path))
+        atexit.register(_event_log.close)
+    return _event_log
 
-    if show_config:
-        config_path = _get_config_path(__file__)
-        log(f"\n  Config file: {config_path}")
-        log(f"\n  To change settings:")
-        log(f"    python fast_trader.py --set entry_threshold=0.08")
-        log(f"    python fast_trader.py --set asset=ETH")
-        log(f"    Or edit config.json directly")
-        return
 
-    # Initialize client early to validate API key
-    get_client()
+def _make_logger(quiet, lines=None):
+    """Return log(msg, force=False). Buffers into `lines` when given.
 
-    # Show positions if requested
-    if positions_only:
-        log("\n📊 Sprint Positions:")
-        positions = get_positions()
-        fast_market_positions = [
-            p
-            for p in positions
-            if "up or down" in (p.get("question", "") or "").lower()
-        ]
-        if not fast_market_positions:
-            log("  No open fast market positions")
+    In quiet mode nothing is printed here: the one-line summary is derived
+    from the decision event instead (see event_log.format_decision).
+    """
+
+    def log(msg, force=False):
+        if quiet:
+            return
+        if lines is None:
+            print(msg)
         else:
-            for pos in fast_market_positions:
-                log(f"  • {pos.get('question', 'Unknown')[:60]}")
-                log(
-                    f"    YES: {pos.get('shares_yes', 0):.1f} | NO: {pos.get('shares_no', 0):.1f} | P&L: ${pos.get('pnl', 0):.2f}"
-                )
+            lines.append(msg)
+
+    return log
+
+
+def _watch_ticks(pcfg, market, kernel, gate, yes_price, momentum, vol_pct):
+    """Re-run this market's compiled gates on every streamed price until it expires."""
+    from decision_kernel import TickSignal
+    from scheduler import WINDOW_SECONDS
+
+    end_ts = market["end_time"].timestamp()
+    start = end_ts - WINDOW_SECONDS.get(pcfg["window"], 300)
+    window_open = _window_opens.get((ASSET_SYMBOLS.get(pcfg["asset"], "BTCUSDT"), int(start) // 60 * 60_000))
+    now = time.time()
+    for key in [k for k, sig in _tick_signals.items() if sig.deadline <= now]:
+        del _tick_signals[key]
+    _tick_signals[(pcfg["pair"], market["slug"])] = TickSignal(
+        pcfg["pair"],
+        ASSET_SYMBOLS.get(pcfg["asset"], "BTCUSDT"),
+        kernel,
+        yes_price,
+        momentum["price_then"],
+        momentum["volume_ratio"],
+        gate,
+        end_ts,
+        pcfg["min_time_remaining"],
+        window_open,
+        vol_pct,
+    )
+
+
+def on_price_tick(symbol, price, event_ms=None):
+    """Price feed callback: wake the loop on a large move or a tick that turns a skip into a signal."""
+    if _scheduler is None:
+        return
+    _scheduler.on_price(symbol, price, event_ms)
+    if not TICK_SIGNALS:
         return
+    now = time.time()
+    for signal in list(_tick_signals.values()):
+        if signal.symbol == symbol and signal.on_price(price, now):
+            _scheduler.trigger(f"{signal.pair} signal on tick")
+
+
+async def _evaluate_pair(
+    pcfg,
+    markets,
+    momentum_task,
+    portfolio,
+    daily_spend,
+    dry_run,
+    smart_sizing,
+    quiet,
+    log,
+    decision,
+    market=None,
+    allocation=None,
+):
+    """Steps 2-5 of the cycle for one (asset, window) pair.
+
+    Fills `decision` (the pair's event-log record) with every input and the
+    outcome as it goes. In portfolio mode `market` is the market to evaluate
+    and the position size comes from `allocation` (see allocator.py) once
+    every market of the cycle has been scored.
+    """
+    asset = pcfg["asset"]
+    window = pcfg["window"]
+    pair = pcfg["pair"]
+    entry_threshold = pcfg["entry_threshold"]
+    min_momentum_pct = pcfg["min_momentum_pct"]
+    min_time_remaining = pcfg["min_time_remaining"]
+    volume_confidence = pcfg["volume_confidence"]
+    signal_source = pcfg["signal_source"]
+    pair_budget = pcfg["daily_budget"]
+    pair_spend = daily_spend["pairs"].setdefault(pair, {"spent": 0.0, "trades": 0})
+
+    decision_started = None
+
+    def summary(msg):
+        if not quiet:
+            log(f"📊 Summary{pcfg['tag']}: {msg}")
 
-    # Show portfolio if smart sizing
-    if smart_sizing:
-        log("\n💰 Portfolio:")
-        portfolio = get_portfolio()
-        if portfolio and not portfolio.get("error"):
-            log(f"  Balance: ${portfolio.get('balance_usdc', 0):.2f}")
+    def end_decision():
+        if decision_started is not None:
+            METRICS.histogram("stage_seconds", stage="decision").record_ns(
+                time.perf_counter_ns() - decision_started
+            )
 
-    # Step 1: Discover fast markets
-    log(f"\n🔍 Discovering {ASSET} fast markets...")
-    markets = discover_fast_market_markets(ASSET, WINDOW)
-    log(f"  Found {len(markets)} active fast markets")
+    def skip(reason, msg=None):
+        end_decision()
+        METRICS.inc("skips", pair=pair, reason=reason)
+        decision.update(outcome="skip", reason=reason)
+        if msg:
+            summary(msg)
 
+    log(f"  Found {len(markets)} active {asset} {window} fast markets")
     if not markets:
         log("  No active fast markets found")
-        if not quiet:
-            print("📊 Summary: No markets available")
+        skip("no_markets", "No markets available")
         return
 
     # Step 2: Find best fast_market to trade
-    best = find_best_fast_market(markets)
+    with METRICS.stage("selection"):
+        best = market or find_best_fast_market(markets, min_time_remaining, asset, window)
     if not best:
-        log(f"  No fast_markets with >{MIN_TIME_REMAINING}s remaining")
-        if not quiet:
-            print("📊 Summary: No tradeable fast_markets (too close to expiry)")
+        log(f"  No fast_markets with >{min_time_remaining}s remaining")
+        skip("too_close_to_expiry", "No tradeable fast_markets (too close to expiry)")
         return
+    if PREWARM_ORDERS:
+        # Resolve the market and prepare order templates while the signal loads
+        get_order_prewarmer().prewarm(best)
 
     end_time = best.get("end_time")
     remaining = (
@@ -664,118 +1662,320 @@ def run_fast_market_strategy(
     log(f"  Expires in: {remaining:.0f}s")
 
     # Parse current market odds
-    try:
-        prices = json.loads(best.get("outcome_prices", "[]"))
-        market_yes_price = float(prices[0]) if prices else 0.5
-    except (json.JSONDecodeError, IndexError, ValueError):
-        market_yes_price = 0.5
-    log(f"  Current YES price: ${market_yes_price:.3f}")
+    market_yes_price = _market_yes_price(best)
+    # The book mid replaces Gamma's (possibly stale) outcomePrices when available
+    yes_book = None
+    if ORDER_BOOK:
+        with METRICS.stage("order_book"):
+            yes_book = await _call_with_deadline(get_order_book, best)
+    book_mid = yes_book.mid() if yes_book is not None else None
+    if book_mid is not None:
+        log(
+            f"  Current YES price: ${book_mid:.3f} (book ${yes_book.best_bid():.3f}/${yes_book.best_ask():.3f},"
+            f" Gamma ${market_yes_price:.3f})"
+        )
+        market_yes_price = book_mid
+    else:
+        log(f"  Current YES price: ${market_yes_price:.3f}")
 
     # Fee info (fast markets charge 10% on winnings)
     fee_rate_bps = best.get("fee_rate_bps", 0)
     fee_rate = fee_rate_bps / 10000  # 1000 bps -> 0.10
+    decision.update(
+        slug=best["slug"],
+        question=best["question"],
+        end_time=end_time.isoformat() if end_time else None,
+        remaining_secs=round(remaining, 1),
+        yes_price=market_yes_price,
+        fee_rate_bps=fee_rate_bps,
+    )
+    if book_mid is not None:
+        decision.update(yes_bid=yes_book.best_bid(), yes_ask=yes_book.best_ask())
     if fee_rate > 0:
         log(f"  Fee rate:         {fee_rate:.0%} (Polymarket fast market fee)")
+    recorder = get_recorder()
+    if recorder and end_time:
+        from scheduler import WINDOW_SECONDS
+
+        recorder.snapshot(
+            asset,
+            time.time() * 1000,
+            end_time.timestamp() * 1000,
+            WINDOW_SECONDS.get(window, 300),
+            market_yes_price,
+            fee_rate_bps,
+        )
 
     # Step 3: Get CEX price momentum
-    log(f"\n📈 Fetching {ASSET} price signal ({SIGNAL_SOURCE})...")
-    momentum = get_momentum(ASSET, SIGNAL_SOURCE, LOOKBACK_MINUTES)
+    log(f"\n📈 Fetching {asset} price signal ({signal_source})...")
+    momentum = await momentum_task
 
     if not momentum:
         log("  ❌ Failed to fetch price data", force=True)
+        skip("no_signal")
+        decision.update(outcome="no_signal", error="Failed to fetch price data")
         return
+    decision_started = time.perf_counter_ns()
+    decision.update(
+        signal_source=signal_source,
+        price_now=momentum["price_now"],
+        price_then=momentum["price_then"],
+        momentum_pct=round(momentum["momentum_pct"], 4),
+        volume_ratio=round(momentum["volume_ratio"], 3),
+    )
+    if momentum.get("indicators"):
+        decision["indicators"] = momentum["indicators"]
+    if momentum.get("sources"):
+        decision["signal_sources"] = momentum["sources"]
+    elif momentum.get("failover"):
+        decision["signal_failover"] = momentum["source"]
 
     log(f"  Price: ${momentum['price_now']:,.2f} (was ${momentum['price_then']:,.2f})")
     log(f"  Momentum: {momentum['momentum_pct']:+.3f}%")
     log(f"  Direction: {momentum['direction']}")
-    if VOLUME_CONFIDENCE:
+    ind = momentum.get("indicators")
+    if ind:
+        parts = [f"{h} {pct:+.3f}%" for h, pct in ind["momentum"].items()]
+        if ind["volatility_pct"] is not None:
+            parts.append(f"σ {ind['volatility_pct']:.3f}%/min")
+        if ind["vwap_deviation_pct"] is not None:
+            parts.append(f"VWAP {ind['vwap_deviation_pct']:+.3f}%")
+        if ind["volume_zscore"] is not None:
+            parts.append(f"vol z {ind['volume_zscore']:+.2f}")
+        log(f"  Indicators: {' | '.join(parts)}")
+    if momentum.get("sources"):
+        parts = [
+            f"{name} {src['momentum_pct']:+.3f}% (w {src['weight']:.2f})"
+            for name, src in momentum["sources"].items()
+        ]
+        log(f"  Sources: {' | '.join(parts)}")
+    elif momentum.get("failover"):
+        log(f"  ⚠️  Failed over to {momentum['source']} ({', '.join(momentum.get('stale', []))} stale)")
+    if volume_confidence:
         log(f"  Volume ratio: {momentum['volume_ratio']:.2f}x avg")
 
     # Step 4: Decision logic
     log(f"\n🧠 Analyzing...")
+    from decision_kernel import (
+        DecisionKernel,
+        WEAK_MOMENTUM,
+        LOW_VOLUME,
+        PRICED_IN,
+        SMALL_EDGE,
+        FEES,
+    )
 
     momentum_pct = abs(momentum["momentum_pct"])
     direction = momentum["direction"]
 
-    # Check minimum momentum
-    if momentum_pct < MIN_MOMENTUM_PCT:
-        log(f"  ⏸️  Momentum {momentum_pct:.3f}% < minimum {MIN_MOMENTUM_PCT}% — skip")
-        if not quiet:
-            print(f"📊 Summary: No trade (momentum too weak: {momentum_pct:.3f}%)")
+    fair = None
+    p_up = 0.5
+    vol_pct = (momentum.get("indicators") or {}).get("volatility_pct")
+    if pcfg["fair_value_model"] == "probability":
+        # P(up) from spot vs the window's opening price, volatility and time left
+        from scheduler import WINDOW_SECONDS
+
+        window_secs = WINDOW_SECONDS.get(window, 300)
+        priced = [m for m in markets if m.get("end_time")]
+        starts = window_starts(priced + [best], window_secs)
+        if starts:  # Opens the stream doesn't hold need REST: off the loop, with a deadline
+            await _call_with_deadline(fetch_window_opens, asset, starts, default=0)
+        with METRICS.stage("fair_value"):
+            p_ups = fair_values_for(asset, priced, momentum["price_now"], vol_pct, window_secs)
+        p_up = next((p for m, p in zip(priced, p_ups) if m["slug"] == best["slug"]), None)
+        if p_up is None:  # Best market came from the index, not this cycle's list
+            p_up = fair_values_for(asset, [best], momentum["price_now"], vol_pct, window_secs)[0]
+        p_up = float(p_up)
+
+    # Every gate for this market compiled once; the checks below are comparisons
+    position_size = calculate_position_size(pcfg["max_position"], smart_sizing, portfolio)
+    # The ledger takes a file lock shared with other workers: keep it off the loop
+    budget_room, _ = await _run_blocking(
+        get_spend_log().headroom, pair, pair_budget, pcfg["asset_daily_budget"], GLOBAL_DAILY_BUDGET
+    )
+    kernel = DecisionKernel(
+        fee_rate_bps,
+        min(position_size, budget_room),
+        entry_threshold,
+        min_momentum_pct,
+        pcfg["fair_value_model"],
+        volume_confidence,
+        MIN_SHARES_PER_ORDER,
+    )
+    gate = kernel.evaluate(market_yes_price, momentum["momentum_pct"], momentum["volume_ratio"], p_up)
+    if TICK_SIGNALS and end_time:
+        _watch_ticks(pcfg, best, kernel, gate, market_yes_price, momentum, vol_pct)
+
+    # Check minimum momentum (the probability model prices the move itself)
+    if gate == WEAK_MOMENTUM:
+        log(f"  ⏸️  Momentum {momentum_pct:.3f}% < minimum {min_momentum_pct}% — skip")
+        skip("weak_momentum", f"No trade (momentum too weak: {momentum_pct:.3f}%)")
         return
 
-    # Calculate expected fair price based on momentum direction
-    # Simple model: strong momentum → higher probability of continuation
-    if direction == "up":
+    if pcfg["fair_value_model"] == "probability":
+        from fair_value import edge
+
+        fair = edge(p_up, market_yes_price, fee_rate)
+        side = fair["side"]
+        divergence = fair["divergence"]
+        trade_rationale = (
+            f"P(up) {p_up:.3f} vs YES ${market_yes_price:.3f} ({remaining:.0f}s left"
+            + (f", σ {vol_pct:.3f}%/min)" if vol_pct is not None else ")")
+        )
+        decision.update(p_up=round(p_up, 4), ev=round(fair["ev"], 4))
+        log(f"  Fair value:       P(up) {p_up:.3f} → {side.upper()} wins {fair['p_win']:.1%}, EV {fair['ev']:+.3f}/$")
+    elif direction == "up":
+        # Momentum heuristic: strong momentum → fair YES at 50¢ + entry_threshold
         side = "yes"
-        divergence = 0.50 + ENTRY_THRESHOLD - market_yes_price
-        trade_rationale = f"{ASSET} up {momentum['momentum_pct']:+.3f}% but YES only ${market_yes_price:.3f}"
+        divergence = 0.50 + entry_threshold - market_yes_price
+        trade_rationale = f"{asset} up {momentum['momentum_pct']:+.3f}% but YES only ${market_yes_price:.3f}"
     else:
         side = "no"
-        divergence = market_yes_price - (0.50 - ENTRY_THRESHOLD)
-        trade_rationale = f"{ASSET} down {momentum['momentum_pct']:+.3f}% but YES still ${market_yes_price:.3f}"
+        divergence = market_yes_price - (0.50 - entry_threshold)
+        trade_rationale = f"{asset} down {momentum['momentum_pct']:+.3f}% but YES still ${market_yes_price:.3f}"
+    decision.update(side=side, divergence=round(divergence, 4))
 
     # Volume confidence adjustment
     vol_note = ""
-    if VOLUME_CONFIDENCE and momentum["volume_ratio"] < 0.5:
+    if gate == LOW_VOLUME:
         log(
             f"  ⏸️  Low volume ({momentum['volume_ratio']:.2f}x avg) — weak signal, skip"
         )
-        if not quiet:
-            print(f"📊 Summary: No trade (low volume)")
+        skip("low_volume", "No trade (low volume)")
         return
-    elif VOLUME_CONFIDENCE and momentum["volume_ratio"] > 2.0:
+    elif volume_confidence and momentum["volume_ratio"] > 2.0:
         vol_note = f" 📊 (high volume: {momentum['volume_ratio']:.1f}x avg)"
 
     # Check divergence threshold
-    if divergence <= 0:
+    if gate == PRICED_IN:
         log(f"  ⏸️  Market already priced in: divergence {divergence:.3f} ≤ 0 — skip")
-        if not quiet:
-            print(f"📊 Summary: No trade (market already priced in)")
+        skip("priced_in", "No trade (market already priced in)")
+        return
+    if gate == SMALL_EDGE:
+        log(f"  ⏸️  Edge {divergence:.3f} < entry threshold {entry_threshold} — skip")
+        skip("small_edge", f"No trade (edge {divergence:.3f} below entry threshold)")
         return
 
     # Fee-aware EV check: require enough divergence to cover fees
     if fee_rate > 0:
-        buy_price = market_yes_price if side == "yes" else (1 - market_yes_price)
-        win_profit = (1 - buy_price) * (1 - fee_rate)
-        breakeven = buy_price / (win_profit + buy_price)
-        fee_penalty = breakeven - 0.50  # how much fees shift breakeven above 50%
-        min_divergence = fee_penalty + 0.02  # plus buffer
+        if fair is not None:
+            # Win probability must clear the fee-adjusted breakeven plus buffer
+            breakeven = fair["breakeven"]
+            min_divergence = fair["min_divergence"]
+        else:
+            buy_price = market_yes_price if side == "yes" else (1 - market_yes_price)
+            win_profit = (1 - buy_price) * (1 - fee_rate)
+            breakeven = buy_price / (win_profit + buy_price)
+            fee_penalty = breakeven - 0.50  # how much fees shift breakeven above 50%
+            min_divergence = fee_penalty + 0.02  # plus buffer
+        decision.update(breakeven=round(breakeven, 4), min_divergence=round(min_divergence, 4))
         log(
             f"  Breakeven:        {breakeven:.1%} win rate (fee-adjusted, min divergence {min_divergence:.3f})"
         )
-        if divergence < min_divergence:
+        if gate == FEES:
             log(
                 f"  ⏸️  Divergence {divergence:.3f} < fee-adjusted minimum {min_divergence:.3f} — skip"
             )
-            if not quiet:
-                print(f"📊 Summary: No trade (fees eat the edge)")
+            skip("fees", "No trade (fees eat the edge)")
             return
 
     # We have a signal!
-    position_size = calculate_position_size(MAX_POSITION_USD, smart_sizing)
     price = market_yes_price if side == "yes" else (1 - market_yes_price)
 
-    # Daily budget check
-    remaining_budget = DAILY_BUDGET - daily_spend["spent"]
+    # Portfolio mode: wait for every market to be scored, then take our share by EV per dollar
+    if allocation is not None:
+        from fair_value import price_edge
+
+        ev = price_edge(fair["p_win"] if fair is not None else 0.50 + entry_threshold, price, fee_rate)["ev"]
+        limits = (pair_budget, pcfg["asset_daily_budget"], GLOBAL_DAILY_BUDGET)
+        waiting = time.perf_counter_ns()
+        usage = await _run_blocking(get_spend_log().usage, pair)
+        granted = await allocation.bid(
+            (pair, best["slug"]),
+            ev,
+            position_size,
+            pair,
+            limits,
+            usage,
+            min_amount=max(0.50, MIN_SHARES_PER_ORDER * price),
+        )
+        decision_started += time.perf_counter_ns() - waiting  # Time spent waiting isn't decision time
+        ranked = sorted(allocation.bids.values(), key=lambda b: b.ev, reverse=True)
+        rank = next(i for i, b in enumerate(ranked, 1) if b.key == (pair, best["slug"]))
+        decision.update(ev_per_dollar=round(ev, 4), allocated=round(granted, 2), ev_rank=rank)
+        log(
+            f"  Allocation:       ${granted:.2f} of ${position_size:.2f}"
+            f" (EV {ev:+.3f}/$, #{rank} of {len(ranked)} signals)"
+        )
+        if granted <= 0:
+            log("  ⏸️  Budget went to better-EV markets — skip")
+            skip("not_allocated", "No trade (budget allocated to better markets)")
+            return
+        position_size = granted
+    signal_at = time.perf_counter()
+
+    # Daily budget check: this pair, its asset and everything sharing the ledger
+    remaining_budget, binding = await _run_blocking(
+        get_spend_log().headroom, pair, pair_budget, pcfg["asset_daily_budget"], GLOBAL_DAILY_BUDGET
+    )
+    limit_note = {"pair": "", "asset": f" ({asset} limit)", "total": " (global limit)"}.get(binding, "")
     if remaining_budget <= 0:
         log(
-            f"  ⏸️  Daily budget exhausted (${daily_spend['spent']:.2f}/${DAILY_BUDGET:.2f} spent) — skip"
+            f"  ⏸️  Daily budget exhausted{limit_note} (${pair_spend['spent']:.2f}/${pair_budget:.2f} spent) — skip"
         )
-        if not quiet:
-            print(f"📊 Summary: No trade (daily budget exhausted)")
+        skip("budget_exhausted", "No trade (daily budget exhausted)")
         return
     if position_size > remaining_budget:
         position_size = remaining_budget
         log(
-            f"  Budget cap: trade capped at ${position_size:.2f} (${daily_spend['spent']:.2f}/${DAILY_BUDGET:.2f} spent)"
+            f"  Budget cap: trade capped at ${position_size:.2f}{limit_note} (${pair_spend['spent']:.2f}/${pair_budget:.2f} spent)"
         )
     if position_size < 0.50:
         log(f"  ⏸️  Remaining budget ${position_size:.2f} < $0.50 — skip")
-        if not quiet:
-            print(f"📊 Summary: No trade (remaining budget too small)")
+        skip("budget_too_small", "No trade (remaining budget too small)")
         return
 
+    # Executable price: walk the book for position_size and re-check the edge at the fill
+    if yes_book is not None:
+        from fair_value import price_edge
+
+        book = yes_book if side == "yes" else yes_book.complement()
+        fill = book.buy_quote(position_size)
+        if fill is None or not fill["filled"]:
+            fillable = fill["cost"] if fill else 0.0
+            log(f"  ⏸️  Book too thin: ${fillable:.2f} of ${position_size:.2f} fillable — skip")
+            skip("thin_book", "No trade (order book too thin)")
+            return
+        price = fill["avg_price"]
+        decision.update(
+            fill_price=round(price, 4),
+            best_ask=fill["best_ask"],
+            slippage=round(fill["slippage"], 4),
+            book_levels=fill["levels"],
+        )
+        log(
+            f"  Expected fill:    ${price:.3f} over {fill['levels']} level(s)"
+            f" (best ask ${fill['best_ask']:.3f}, slippage {fill['slippage']:.3f})"
+        )
+        if fill["slippage"] > pcfg["max_slippage"]:
+            log(f"  ⏸️  Slippage {fill['slippage']:.3f} > max {pcfg['max_slippage']} — skip")
+            skip("slippage", "No trade (slippage too high)")
+            return
+        # Same gates as above, with the fill price in place of the quoted price
+        at_fill = price_edge(fair["p_win"] if fair is not None else 0.50 + entry_threshold, price, fee_rate)
+        if fair is not None:
+            required = max(at_fill["min_divergence"], entry_threshold)
+        else:
+            required = at_fill["breakeven"] - 0.50 + 0.02 if fee_rate > 0 else 0.0
+        if at_fill["divergence"] <= 0 or at_fill["divergence"] < required:
+            log(
+                f"  ⏸️  Edge gone at fill: divergence {at_fill['divergence']:.3f} < required {required:.3f} — skip"
+            )
+            skip("fill_edge", "No trade (edge disappears on fill)")
+            return
+        divergence = at_fill["divergence"]
+        decision.update(fill_divergence=round(divergence, 4))
+
     # Check minimum order size
     if price > 0:
         min_cost = MIN_SHARES_PER_ORDER * price
@@ -783,20 +1983,52 @@ def run_fast_market_strategy(
             log(
                 f"  ⚠️  Position ${position_size:.2f} too small for {MIN_SHARES_PER_ORDER} shares at ${price:.2f}"
             )
+            skip("below_min_shares")
             return
+    end_decision()
+    METRICS.inc("signals", pair=pair, side=side)
+    decision.update(position_size=round(position_size, 2), price=round(price, 4))
 
     log(f"  ✅ Signal: {side.upper()} — {trade_rationale}{vol_note}", force=True)
     log(f"  Divergence: {divergence:.3f}", force=True)
 
     # Step 5: Import & Trade
-    log(f"\n🔗 Importing to Simmer...", force=True)
-    market_id, import_error = import_fast_market_market(best["slug"])
+    with METRICS.stage("import"):
+        prepared = get_order_prewarmer().get(best["slug"]) if PREWARM_ORDERS else None
+        closed = get_order_prewarmer().closed_reason(best["slug"]) if PREWARM_ORDERS and not prepared else None
+        if closed:
+            log(f"  ⏸️  Market no longer open ({closed}) — skip", force=True)
+            METRICS.inc("skips", pair=pair, reason="market_closed")
+            decision.update(outcome="skip", reason="market_closed", error=closed)
+            summary(f"No trade (market {closed})")
+            return
+        if prepared:
+            market_id = prepared.market_id
+            log(f"\n🔗 Market pre-warmed: {market_id[:16]}...", force=True)
+        else:
+            log(f"\n🔗 Importing to Simmer...", force=True)
+            cached = get_import_cache().peek(best["slug"]) is not None
+            market_id, import_error = await _call_with_deadline(
+                import_fast_market_market,
+                best["slug"],
+                best.get("end_time"),
+                deadline=15,
+                default=(None, "Import timed out"),
+            )
 
-    if not market_id:
-        log(f"  ❌ Import failed: {import_error}", force=True)
-        return
+            if not market_id:
+                log(f"  ❌ Import failed: {import_error}", force=True)
+                METRICS.inc("trades", pair=pair, side=side, result="import_failed")
+                decision.update(outcome="import_failed", error=import_error)
+                return
 
-    log(f"  ✅ Market ID: {market_id[:16]}...", force=True)
+            if cached:
+                saved_ms = get_import_cache().avg_import_secs() * 1e3
+                log(f"  ✅ Market ID: {market_id[:16]}... (cached, ~{saved_ms:.0f}ms saved)", force=True)
+            else:
+                log(f"  ✅ Market ID: {market_id[:16]}...", force=True)
+            if PREWARM_ORDERS:
+                prepared = get_order_prewarmer().adopt(best["slug"], market_id)
 
     if dry_run:
         est_shares = position_size / price if price > 0 else 0
@@ -804,22 +2036,76 @@ def run_fast_market_strategy(
             f"  [DRY RUN] Would buy {side.upper()} ${position_size:.2f} (~{est_shares:.1f} shares)",
             force=True,
         )
+        METRICS.inc("trades", pair=pair, side=side, result="dry_run")
+        decision.update(outcome="dry_run", market_id=market_id)
     else:
+        # Hold the budget before the order goes out so parallel pairs and workers can't overspend
+        reservation, held = await _run_blocking(
+            get_spend_log().reserve,
+            pair,
+            position_size,
+            pair_budget,
+            pcfg["asset_daily_budget"],
+            GLOBAL_DAILY_BUDGET,
+            min_amount=max(0.50, MIN_SHARES_PER_ORDER * price),
+        )
+        if reservation is None:
+            log(f"  ⏸️  Budget taken by another trade (${held:.2f} left) — skip", force=True)
+            METRICS.inc("skips", pair=pair, reason="budget_exhausted")
+            decision.update(outcome="skip", reason="budget_exhausted")
+            summary("No trade (daily budget exhausted)")
+            return
+        if held < position_size:
+            log(f"  Budget cap: trade capped at ${held:.2f} (reserved)", force=True)
+            position_size = held
+            decision.update(position_size=round(position_size, 2))
+
         log(f"  Executing {side.upper()} trade for ${position_size:.2f}...", force=True)
-        result = execute_trade(market_id, side, position_size)
+        result = None
+        try:
+            with METRICS.stage("trade"):
+                if prepared:
+                    result = await _run_blocking(
+                        get_order_prewarmer().submit,
+                        prepared.templates[side],
+                        position_size,
+                        signal_at,
+                    )
+                else:
+                    result = await _run_blocking(execute_trade, market_id, side, position_size)
+        finally:
+            if not (result and result.get("success")):
+                await _run_blocking(get_spend_log().release, reservation)
+        if prepared:
+            submit_ms = get_order_prewarmer().last_signal_to_submit * 1e3
+            log(f"  ⏱️  Signal→submit: {submit_ms:.2f}ms", force=True)
+        success = bool(result and result.get("success"))
+        METRICS.inc("trades", pair=pair, side=side, result="success" if success else "failed")
+        decision.update(outcome="traded" if success else "failed", market_id=market_id)
+        if prepared:
+            decision["signal_to_submit_ms"] = round(
+                get_order_prewarmer().last_signal_to_submit * 1e3, 3
+            )
 
         if result and result.get("success"):
             shares = result.get("shares_bought") or result.get("shares") or 0
             trade_id = result.get("trade_id")
+            decision.update(shares=shares, trade_id=trade_id)
             log(
                 f"  ✅ Bought {shares:.1f} {side.upper()} shares @ ${price:.3f}",
                 force=True,
             )
 
-            # Update daily spend
-            daily_spend["spent"] += position_size
-            daily_spend["trades"] += 1
-            _save_daily_spend(__file__, daily_spend)
+            # Settle the reservation (logged to disk before it counts)
+            with METRICS.stage("budget_save"):
+                await _run_blocking(get_spend_log().commit, reservation, pair, position_size)
+            with _spend_lock:
+                pair_spend["spent"] += position_size
+                pair_spend["trades"] += 1
+                daily_spend["spent"] += position_size
+                daily_spend["trades"] += 1
+            if _portfolio_cache is not None:
+                _portfolio_cache.apply_trade(market_id, side, position_size, shares, best["question"])
 
             # Log to trade journal
             if trade_id and JOURNAL_AVAILABLE:
@@ -829,27 +2115,280 @@ def run_fast_market_strategy(
                     source=TRADE_SOURCE,
                     thesis=trade_rationale,
                     confidence=round(confidence, 2),
-                    asset=ASSET,
+                    asset=asset,
                     momentum_pct=round(momentum["momentum_pct"], 3),
                     volume_ratio=round(momentum["volume_ratio"], 2),
-                    signal_source=SIGNAL_SOURCE,
+                    signal_source=signal_source,
                 )
         else:
             error = result.get("error", "Unknown error") if result else "No response"
             log(f"  ❌ Trade failed: {error}", force=True)
+            decision["error"] = error
 
     # Summary
     total_trades = 0 if dry_run else (1 if result and result.get("success") else 0)
     show_summary = not quiet or total_trades > 0
     if show_summary:
-        print(f"\n📊 Summary:")
-        print(f"  Sprint: {best['question'][:50]}")
-        print(
-            f"  Signal: {direction} {momentum_pct:.3f}% | YES ${market_yes_price:.3f}"
+        log(f"\n📊 Summary{pcfg['tag']}:", force=True)
+        log(f"  Sprint: {best['question'][:50]}", force=True)
+        log(
+            f"  Signal: {direction} {momentum_pct:.3f}% | YES ${market_yes_price:.3f}",
+            force=True,
+        )
+        log(
+            f"  Action: {'DRY RUN' if dry_run else ('TRADED' if total_trades else 'FAILED')}",
+            force=True,
+        )
+
+
+async def run_fast_market_strategy_async(
+    dry_run=True,
+    positions_only=False,
+    show_config=False,
+    smart_sizing=False,
+    quiet=False,
+):
+    """Run one cycle of the fast_market trading strategy for every configured pair.
+
+    Discovery (one Gamma pass shared by all pairs), the price signal (one per
+    asset/source/lookback) and the portfolio fetch are independent, so they
+    start together and each gets CALL_DEADLINE seconds; the cycle waits for
+    the slowest of them rather than their sum. Pairs are then evaluated
+    concurrently. Anything still running when the cycle returns early is
+    cancelled.
+    """
+    import asyncio
+
+    log = _make_logger(quiet)
+    pair_cfgs = [_pair_config(asset, window) for asset, window in PAIRS]
+    multi = len(pair_cfgs) > 1
+
+    log("⚡ Simmer FastLoop Trading Skill")
+    log("=" * 50)
+
+    if dry_run:
+        log("\n  [DRY RUN] No trades will be executed. Use --live to enable trading.")
+
+    log(f"\n⚙️  Configuration:")
+    if multi:
+        log(f"  Pairs:            {', '.join(p['pair'] for p in pair_cfgs)}")
+    else:
+        log(f"  Asset:            {ASSET}")
+        log(f"  Window:           {WINDOW}")
+    if cfg["fair_value_model"] == "probability":
+        log(f"  Entry threshold:  {ENTRY_THRESHOLD} (min edge: P(win) − price paid)")
+    else:
+        log(f"  Entry threshold:  {ENTRY_THRESHOLD} (min divergence from 50¢)")
+    log(f"  Min momentum:     {MIN_MOMENTUM_PCT}% (min price move)")
+    log(f"  Max position:     ${MAX_POSITION_USD:.2f}")
+    log(f"  Signal source:    {SIGNAL_SOURCE}")
+    if len(_signal_names(SIGNAL_SOURCE)) > 1:
+        log(f"  Signal fusion:    {SIGNAL_FUSION}")
+    log(f"  Lookback:         {LOOKBACK_MINUTES} minutes")
+    log(f"  Min time left:    {MIN_TIME_REMAINING}s")
+    log(f"  Volume weighting: {'✓' if VOLUME_CONFIDENCE else '✗'}")
+    if _price_feed is not None:
+        feed_state = "connected" if _price_feed.connected else "reconnecting"
+        log(f"  Price stream:     ✓ ({feed_state})")
+    if ORDER_BOOK:
+        book_state = "REST"
+        if _book_feed is not None and _book_feed.running:
+            book_state = "streaming" if _book_feed.connected else "REST until the stream connects"
+        log(f"  Order book:       ✓ ({book_state})")
+    if PORTFOLIO_MARKETS > 0:
+        cap = f", max ${MAX_CYCLE_EXPOSURE:.2f}/cycle" if MAX_CYCLE_EXPOSURE else ""
+        log(f"  Portfolio:        ✓ ({PORTFOLIO_MARKETS} market(s) per pair, EV-ranked{cap})")
+    daily_spend = await _run_blocking(get_spend_log().state)
+    for pcfg in pair_cfgs:
+        pair_spend = daily_spend["pairs"].get(pcfg["pair"], {"spent": 0.0, "trades": 0})
+        label = f"Budget {pcfg['pair']}:" if multi else "Daily budget:"
+        log(
+            f"  {label:<18}${pcfg['daily_budget']:.2f} (${pair_spend['spent']:.2f} spent today, {pair_spend['trades']} trades)"
         )
-        print(
-            f"  Action: {'DRY RUN' if dry_run else ('TRADED' if total_trades else 'FAILED')}"
+    if multi and PAIR_OVERRIDES:
+        log(f"  Overrides:        {json.dumps(PAIR_OVERRIDES)}")
+
+    if show_config:
+        config_path = _get_config_path(__file__)
+        log(f"\n  Config file: {config_path}")
+        log(f"\n  To change settings:")
+        log(f"    python fast_trader.py --set entry_threshold=0.08")
+        log(f"    python fast_trader.py --set asset=ETH")
+        log(f"    python fast_trader.py --set pairs=BTC:5m,ETH:15m")
+        log(f"    Or edit config.json directly")
+        return
+
+    # Initialize client early to validate API key
+    get_client()
+
+    tasks = []
+    try:
+        # Show positions if requested
+        if positions_only:
+            log("\n📊 Sprint Positions:")
+            fast_market_positions = await _call_with_deadline(get_fast_market_positions, default=[])
+            if not fast_market_positions:
+                log("  No open fast market positions")
+            else:
+                for pos in fast_market_positions:
+                    log(f"  • {pos.get('question', 'Unknown')[:60]}")
+                    log(
+                        f"    YES: {pos.get('shares_yes', 0):.1f} | NO: {pos.get('shares_no', 0):.1f} | P&L: ${pos.get('pnl', 0):.2f}"
+                    )
+            return
+
+        # Fan out the independent fetches: discovery, price signals, portfolio
+        discovery_task = asyncio.create_task(
+            _call_with_deadline(
+                discover_fast_markets_for_pairs,
+                tuple(PAIRS),
+                min(p["min_time_remaining"] for p in pair_cfgs),
+                default={},
+            )
         )
+        tasks.append(discovery_task)
+        momentum_tasks = {}
+        for pcfg in pair_cfgs:
+            key = (pcfg["asset"], pcfg["signal_source"], pcfg["lookback_minutes"])
+            if key not in momentum_tasks:
+                momentum_tasks[key] = asyncio.create_task(
+                    _call_with_deadline(get_momentum, *key)
+                )
+                tasks.append(momentum_tasks[key])
+        portfolio = None
+        if smart_sizing:
+            portfolio_task = asyncio.create_task(
+                _call_with_deadline(
+                    get_portfolio_snapshot, default={"error": "Deadline exceeded"}
+                )
+            )
+            tasks.append(portfolio_task)
+
+        # Show portfolio if smart sizing
+        if smart_sizing:
+            log("\n💰 Portfolio:")
+            portfolio = await portfolio_task
+            if portfolio and not portfolio.get("error"):
+                log(f"  Balance: ${portfolio.get('balance_usdc', 0):.2f}")
+
+        # Step 1: Discover fast markets (one Gamma pass for every pair)
+        assets = sorted({p["asset"] for p in pair_cfgs})
+        log(f"\n🔍 Discovering {', '.join(assets)} fast markets...")
+        markets_by_pair = await discovery_task
+        if _scheduler is not None:
+            _scheduler.update_markets(
+                [m for markets in markets_by_pair.values() for m in markets]
+            )
+        if _prewarmer is not None:
+            _prewarmer.evict(m["slug"] for ms in markets_by_pair.values() for m in ms)
+        if PREFETCH_IMPORTS and _market_index is not None:
+            prefetch_imports(
+                [
+                    m
+                    for p in pair_cfgs
+                    for m in _market_index.upcoming(
+                        p["asset"], p["window"], p["min_time_remaining"]
+                    )
+                ]
+            )
+
+        # Portfolio mode scores every tradeable market; otherwise each pair takes its soonest
+        allocation = None
+        jobs = [(pcfg, None) for pcfg in pair_cfgs]
+        if PORTFOLIO_MARKETS > 0:
+            from allocator import Allocation
+
+            jobs = []
+            for pcfg in pair_cfgs:
+                tradeable = find_tradeable_fast_markets(
+                    markets_by_pair.get(pcfg["pair"], []),
+                    pcfg["min_time_remaining"],
+                    pcfg["asset"],
+                    pcfg["window"],
+                    PORTFOLIO_MARKETS,
+                )
+                jobs.extend((pcfg, m) for m in tradeable or [None])
+            allocation = Allocation(sum(m is not None for _, m in jobs), MAX_CYCLE_EXPOSURE)
+        multi = len(jobs) > 1
+
+        async def evaluate(pcfg, market):
+            lines = [] if multi else None
+            pair_log = _make_logger(quiet, lines)
+            if multi:
+                header = f"{pcfg['asset']} {pcfg['window']}"
+                if market is not None and PORTFOLIO_MARKETS > 1:
+                    header += f" · {market['slug']}"
+                pair_log(f"\n━━ {header} ━━")
+            key = (pcfg["asset"], pcfg["signal_source"], pcfg["lookback_minutes"])
+            decision = {
+                "event": "decision",
+                "ts": round(time.time(), 3),
+                "pair": pcfg["pair"],
+                "dry_run": dry_run,
+                "entry_threshold": pcfg["entry_threshold"],
+                "min_momentum_pct": pcfg["min_momentum_pct"],
+            }
+            try:
+                await _evaluate_pair(
+                    pcfg,
+                    markets_by_pair.get(pcfg["pair"], []),
+                    momentum_tasks[key],
+                    portfolio,
+                    daily_spend,
+                    dry_run,
+                    smart_sizing,
+                    quiet,
+                    pair_log,
+                    decision,
+                    market,
+                    allocation if market is not None else None,
+                )
+            except Exception as e:
+                pair_log(f"  ❌ Error evaluating {pcfg['pair']}: {e}", force=True)
+                decision.update(outcome="error", error=str(e))
+            finally:
+                if allocation is not None and market is not None:
+                    allocation.withdraw((pcfg["pair"], market["slug"]))
+                decision.setdefault("outcome", "none")
+                events = get_event_log()
+                if events is not None:
+                    events.emit(decision)
+                if quiet and (decision["outcome"] != "skip" or decision.get("error")):
+                    # --quiet output is derived from the decision record
+                    print(format_decision(decision))
+                # Flush each pair's block in one piece so output stays readable
+                if lines:
+                    print("\n".join(lines))
+
+        await asyncio.gather(*(evaluate(pcfg, market) for pcfg, market in jobs))
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def run_fast_market_strategy(
+    dry_run=True,
+    positions_only=False,
+    show_config=False,
+    smart_sizing=False,
+    quiet=False,
+):
+    """Run one cycle of the fast_market trading strategy (sync wrapper)."""
+    import asyncio
+
+    cycle = run_fast_market_strategy_async(
+        dry_run=dry_run,
+        positions_only=positions_only,
+        show_config=show_config,
+        smart_sizing=smart_sizing,
+        quiet=quiet,
+    )
+    if positions_only or show_config:
+        return asyncio.run(cycle)
+    METRICS.inc("cycles")
+    with METRICS.stage("cycle"):
+        return asyncio.run(cycle)
 
 
 # =============================================================================
@@ -887,8 +2426,18 @@ if __name__ == "__main__":
         action="store_true",
         help="Only output on trades/errors (ideal for high-frequency runs)",
     )
+    parser.add_argument(
+        "--record",
+        metavar="FILE",
+        help="Record every API request/response to FILE for replay.py (polls REST instead of streaming)",
+    )
     args = parser.parse_args()
 
+    # Line-buffer stdout for non-TTY environments (cron, Docker, OpenClaw).
+    # --quiet output is flushed once per cycle instead of once per line.
+    if not args.quiet:
+        sys.stdout.reconfigure(line_buffering=True)
+
     if args.set:
         updates = {}
         for item in args.set:
@@ -901,6 +2450,8 @@ if __name__ == "__main__":
                 try:
                     if type_fn == bool:
                         updates[key] = val.lower() in ("true", "1", "yes")
+                    elif type_fn == dict:
+                        updates[key] = json.loads(val)
                     else:
                         updates[key] = type_fn(val)
                 except ValueError:
@@ -910,15 +2461,132 @@ if __name__ == "__main__":
                 print(f"Unknown config key: {key}")
                 print(f"Valid keys: {', '.join(CONFIG_SCHEMA.keys())}")
                 sys.exit(1)
+        problems = _validate_config(dict(cfg, **updates))
+        if problems:
+            print(f"Invalid value: {'; '.join(problems)}")
+            sys.exit(1)
         result = _update_config(updates, __file__)
         print(f"✅ Config updated: {json.dumps(updates)}")
         sys.exit(0)
 
+    problems = _validate_config(cfg)
+    if problems and not args.config:
+        print(f"Error: invalid config: {'; '.join(problems)}")
+        print("Fix it with --set KEY=VALUE or in config.json")
+        sys.exit(1)
+
     dry_run = not args.live
 
-    import time
+    if args.record:
+        from replay import start_recording
+
+        start_recording(args.record)
+        PRICE_STREAM = False  # Stream frames are not request/response pairs
+
+    from scheduler import WindowScheduler, parse_offsets
+
+    _scheduler = WindowScheduler(
+        window=sorted({window for _, window in PAIRS}),
+        offsets=EVAL_OFFSETS,
+        min_time_remaining=MIN_TIME_REMAINING,
+        trigger_move_pct=TRIGGER_MOVE_PCT,
+    )
+
+    METRICS.register("scheduler_wake_jitter_seconds", _scheduler.jitter)
+
+    # SIGTERM/SIGINT: finish the cycle in progress, then shut down (a second one exits now).
+    # SIGHUP: reload config.json (edits to the file are also picked up automatically).
+    import signal
+
+    shutdown = threading.Event()
+    reload_requested = threading.Event()
+
+    def _on_stop(signum, frame):
+        if shutdown.is_set():
+            raise KeyboardInterrupt
+        shutdown.set()
+        _scheduler.stop()
+        print(f"\n🛑 {signal.Signals(signum).name} — finishing the current cycle, then shutting down")
+
+    signal.signal(signal.SIGTERM, _on_stop)
+    signal.signal(signal.SIGINT, _on_stop)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload_requested.set())
+    config_mtime = _config_mtime(__file__)
+    overhead_ns = METRICS.measure_overhead()
+    if METRICS_PORT and not (args.positions or args.config):
+        from metrics import MetricsServer
+
+        try:
+            MetricsServer(METRICS, METRICS_PORT).start()
+            if not args.quiet:
+                print(
+                    f"📈 Metrics on http://127.0.0.1:{METRICS_PORT}/metrics"
+                    f" (instrumentation ~{overhead_ns:.0f}ns per stage)"
+                )
+        except OSError as e:
+            print(f"⚠️  Metrics endpoint not started: {e}")
+    metrics_logged_at = time.monotonic()
+
+    pair_cfgs = [_pair_config(asset, window) for asset, window in PAIRS]
+    streamed = [p for p in pair_cfgs if "binance" in _signal_names(p["signal_source"])]
+    if PRICE_STREAM and streamed and not (args.positions or args.config):
+        feed = start_price_feed(
+            window_minutes=max(30, max(p["lookback_minutes"] for p in streamed))
+        )
+        symbols = {ASSET_SYMBOLS.get(p["asset"], "BTCUSDT") for p in streamed}
+        feed.on_update = lambda sym, price, ts: (
+            on_price_tick(sym, price, ts) if sym in symbols else None
+        )
+        if not feed.wait_ready(timeout=10) and not args.quiet:
+            print("⚠️  Price stream not ready yet — falling back to REST until it is")
+
+    polled = {
+        name
+        for p in pair_cfgs
+        for name in _signal_names(p["signal_source"])
+        if name != "binance"
+    }
+    if polled and not (args.record or args.positions or args.config):
+        # Price-only sources keep their own history in the background
+        get_signal_hub().start(polled)
+
+    if ORDER_BOOK and not (args.record or args.positions or args.config):
+        # Books of the selected markets stream in the background once watched
+        get_book_feed().start()
+
+    if args.smart_sizing and get_portfolio_cache() is not None and not (args.record or args.config):
+        # Balance comes from our own fills between background re-syncs with Simmer
+        get_portfolio_cache().start()
+
+    cycles = 0
+    while not shutdown.is_set():
+        mtime = _config_mtime(__file__)
+        if reload_requested.is_set() or mtime != config_mtime:
+            reload_requested.clear()
+            config_mtime = mtime
+            try:
+                applied, pending = reload_config()
+            except ValueError as e:
+                applied, pending = [], []
+                print(f"⚠️  Config not reloaded: {e}")
+            if applied:
+                print(f"🔄 Config reloaded: {', '.join(applied)}")
+                _scheduler.offsets = parse_offsets(EVAL_OFFSETS)
+                _scheduler.min_time_remaining = MIN_TIME_REMAINING
+                _scheduler.trigger_move_pct = TRIGGER_MOVE_PCT
+                pair_cfgs = [_pair_config(asset, window) for asset, window in PAIRS]
+                polled = {
+                    name
+                    for p in pair_cfgs
+                    for name in _signal_names(p["signal_source"])
+                    if name != "binance"
+                }
+                if polled and not (args.record or args.positions or args.config):
+                    get_signal_hub().start(polled)
+            if pending:
+                print(f"⚠️  Changed settings take effect after a restart: {', '.join(pending)}")
 
-    while True:
         try:
             run_fast_market_strategy(
                 dry_run=dry_run,
@@ -929,10 +2597,78 @@ if __name__ == "__main__":
             )
         except Exception as e:
             print(f"Error in strategy loop: {e}")
+        _scheduler.mark_evaluated()
+        cycles += 1
+        if _recorder is not None:
+            _recorder.flush()
+        if METRICS_LOG_INTERVAL and time.monotonic() - metrics_logged_at >= METRICS_LOG_INTERVAL:
+            metrics_logged_at = time.monotonic()
+            metrics_event = {"event": "metrics", "ts": round(time.time(), 3), **METRICS.snapshot()}
+            print(json.dumps(metrics_event))
+            if get_event_log() is not None:
+                get_event_log().emit(metrics_event)
+        if args.quiet:
+            sys.stdout.flush()
 
         # If user just asked for positions or config, exit immediately
         if args.positions or args.config:
             break
 
-        print("\n⏳ Sleeping for 60 seconds before next check...")
-        time.sleep(60)
+        if not args.quiet:
+            wait_secs = max(0.0, _scheduler.next_wake() - time.time())
+            print(f"\n⏳ Next scheduled check in {wait_secs:.1f}s (or sooner on a price move)")
+            if cycles % 20 == 0 and _scheduler.jitter.count:
+                j = _scheduler.jitter_summary()
+                print(
+                    f"  Wake jitter: p50 {j['p50']:.2f}ms | p99 {j['p99']:.2f}ms | max {j['max']:.2f}ms"
+                    f" ({_scheduler.wakes['schedule']} scheduled, {_scheduler.wakes['trigger']} triggered)"
+                )
+            if cycles % 20 == 0 and _import_cache is not None:
+                st = _import_cache.stats()
+                if st["hits"] + st["misses"]:
+                    print(
+                        f"  Import cache: {st['hit_rate']:.0%} hit rate ({st['hits']}/{st['hits'] + st['misses']}),"
+                        f" ~{st['saved_ms_per_hit']:.0f}ms saved per cached trade"
+                    )
+            if cycles % 20 == 0 and _prewarmer is not None and _prewarmer.signal_to_submit.count:
+                h = _prewarmer.stats()["signal_to_submit_ms"]
+                print(
+                    f"  Signal→submit: p50 {h['p50']:.2f}ms | p99 {h['p99']:.2f}ms | max {h['max']:.2f}ms ({h['count']} trades)"
+                )
+            if cycles % 20 == 0 and _rate_limiter is not None:
+                for host, st in _rate_limiter.stats().items():
+                    if st["state"] != "closed" or st["refused"] or st["waited"]:
+                        refused = ", ".join(f"{k} {v}" for k, v in sorted(st["refused"].items())) or "none"
+                        print(
+                            f"  API {host}: circuit {st['state']}, paced {st['waited']} ({st['wait_secs']:.1f}s),"
+                            f" refused {refused}, weight {st['used_weight']}/{st['weight_limit'] or '-'}"
+                        )
+            if cycles % 20 == 0 and _http_pool is not None:
+                for host, st in _http_pool.stats().items():
+                    if host.startswith("_"):
+                        continue
+                    print(
+                        f"  HTTP {host}: {st['opened']} opened / {st['reused']} reused,"
+                        f" handshake p50 {st['handshake_ms']['p50']:.1f}ms"
+                    )
+        if shutdown.is_set():
+            break
+        reason, _ = _scheduler.wait()
+        if reason == "stop":
+            break
+        if reason != "schedule" and not args.quiet:
+            print(f"\n⚡ Triggered: {reason}")
+
+    # Graceful shutdown: stop the background feeds, persist spend, flush logs
+    stop_book_feed()
+    stop_signal_hub()
+    stop_price_feed()
+    stop_portfolio_cache()
+    if _recorder is not None:
+        _recorder.flush()
+    if _spend_log is not None:
+        _spend_log.close()
+    if _event_log is not None:
+        _event_log.close()
+    if shutdown.is_set():
+        print(f"👋 Stopped after {cycles} cycles")
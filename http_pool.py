@@ -0,0 +1,327 @@
+"""
+Pooled keep-alive HTTP client for the external APIs (Gamma, Binance, CoinGecko).
+
+Connections are kept per (scheme, host, port) and reused across calls, so a
+cycle pays the TCP+TLS handshake once per host instead of once per request.
+Includes idle eviction, a small DNS cache and gzip response decoding. GET
+and HEAD follow redirects, as the urllib calls this replaces did.
+
+Per-host counters (connections opened vs reused, handshake time) are kept so
+the saving is visible; see HTTPPool.stats().
+
+Note: http.client does not pipeline requests, so each pooled connection
+carries one request at a time; concurrency comes from holding several
+connections per host (pool_size).
+
+When HTTP_PROXY / HTTPS_PROXY apply to a host (and NO_PROXY doesn't exempt
+it), its requests go through urllib, which honours them, instead of the pool.
+"""
+
+import ssl
+import time
+import gzip
+import zlib
+import socket
+import threading
+import http.client
+import urllib.error
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+
+from metrics import LatencyHistogram
+
+DNS_TTL = 300  # Seconds to trust a resolved address
+
+_IDEMPOTENT = ("GET", "HEAD")  # Safe to resend when a reused socket turns out dead
+_REDIRECTS = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+_RETRYABLE = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class DNSCache:
+    """Thread-safe getaddrinfo cache with a fixed TTL."""
+
+    def __init__(self, ttl=DNS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host, port):
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addrs = [info[4][:2] for info in infos]
+        with self._lock:
+            self._entries[key] = (addrs, now + self.ttl)
+            self.misses += 1
+        return addrs
+
+
+def _open_socket(host, port, timeout, dns):
+    last_error = None
+    for addr in dns.resolve(host, port):
+        try:
+            return socket.create_connection(addr, timeout=timeout)
+        except OSError as e:
+            last_error = e
+    raise last_error or OSError(f"Could not resolve {host}")
+
+
+class _PooledHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, host, port, timeout, dns):
+        super().__init__(host, port, timeout=timeout)
+        self._dns = dns
+
+    def connect(self):
+        self.sock = _open_socket(self.host, self.port, self.timeout, self._dns)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+class _PooledHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, host, port, timeout, dns, context):
+        super().__init__(host, port, timeout=timeout, context=context)
+        self._dns = dns
+        self._ssl_context = context
+
+    def connect(self):
+        sock = _open_socket(self.host, self.port, self.timeout, self._dns)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = self._ssl_context.wrap_socket(sock, server_hostname=self.host)
+
+
+class HostPool:
+    """Idle connections and counters for one (scheme, host, port)."""
+
+    def __init__(self, scheme, host, port, maxsize, idle_timeout, dns, context):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._dns = dns
+        self._context = context
+        self._lock = threading.Lock()
+        self._idle = []  # [(conn, last_used_monotonic)]
+
+        self.opened = 0
+        self.reused = 0
+        self.requests = 0
+        self.evicted = 0
+        self.errors = 0
+        self.handshake = LatencyHistogram(f"http_handshake_{host}")
+
+    def acquire(self, timeout):
+        """Return (conn, reused). Evicts idle connections past idle_timeout."""
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, last_used = self._idle.pop()
+                if now - last_used > self.idle_timeout:
+                    conn.close()
+                    self.evicted += 1
+                    continue
+                self.reused += 1
+                conn.timeout = timeout
+                if conn.sock:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        if self.scheme == "https":
+            conn = _PooledHTTPSConnection(self.host, self.port, timeout, self._dns, self._context)
+        else:
+            conn = _PooledHTTPConnection(self.host, self.port, timeout, self._dns)
+        start = time.perf_counter()
+        conn.connect()
+        self.handshake.record(time.perf_counter() - start)
+        with self._lock:
+            self.opened += 1
+        return conn, False
+
+    def count(self, counter):
+        """Increment a request counter ("requests" or "errors") from any thread."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def evict_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            keep = []
+            for conn, last_used in self._idle:
+                if now - last_used > self.idle_timeout:
+                    conn.close()
+                    self.evicted += 1
+                else:
+                    keep.append((conn, last_used))
+            self._idle = keep
+
+    def close(self):
+        with self._lock:
+            for conn, _ in self._idle:
+                conn.close()
+            self._idle = []
+
+    def stats(self):
+        return {
+            "opened": self.opened,
+            "reused": self.reused,
+            "requests": self.requests,
+            "idle": len(self._idle),
+            "evicted": self.evicted,
+            "errors": self.errors,
+            "handshake_ms": self.handshake.summary(scale=1e3),
+        }
+
+
+def _decode_body(data, encoding):
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
+
+
+class HTTPPool:
+    """Keep-alive connection pools keyed by host."""
+
+    def __init__(self, pool_size=4, idle_timeout=30.0, dns_ttl=DNS_TTL):
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.dns = DNSCache(dns_ttl)
+        self._context = ssl.create_default_context()
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._proxies = urllib.request.getproxies()
+        self.proxied = 0
+
+    def _pool_for(self, scheme, host, port):
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = HostPool(
+                        scheme,
+                        host,
+                        port,
+                        self.pool_size,
+                        self.idle_timeout,
+                        self.dns,
+                        self._context,
+                    )
+                    self._pools[key] = pool
+        return pool
+
+    def request(self, method, url, body=None, headers=None, timeout=15):
+        """Perform a request. Returns (status, headers, body_bytes).
+
+        Raises OSError / http.client.HTTPException on connection failure.
+        The body is already gzip/deflate-decoded. GET/HEAD follow up to
+        MAX_REDIRECTS redirects; the final response is returned.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            status, resp_headers, data = self._request(method, url, body, headers, timeout)
+            location = resp_headers.get("location")
+            if status not in _REDIRECTS or method not in _IDEMPOTENT or not location:
+                break
+            url = urljoin(url, location)
+        return status, resp_headers, data
+
+    def _request(self, method, url, body, headers, timeout):
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        if scheme in self._proxies and not urllib.request.proxy_bypass(parts.hostname):
+            return self._proxied_request(method, url, body, headers, timeout)
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        req_headers = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        req_headers.update(headers or {})
+
+        pool = self._pool_for(scheme, parts.hostname, port)
+        pool.count("requests")
+        for attempt in range(2):
+            try:
+                conn, reused = pool.acquire(timeout)
+            except OSError:
+                pool.count("errors")
+                raise
+            try:
+                conn.request(method, path, body=body, headers=req_headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except _RETRYABLE:
+                conn.close()
+                # A reused keep-alive socket may have been closed by the server;
+                # only resend when a duplicate can't do harm
+                if reused and attempt == 0 and method in _IDEMPOTENT:
+                    continue
+                pool.count("errors")
+                raise
+            except Exception:
+                conn.close()
+                pool.count("errors")
+                raise
+            resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+            if resp.will_close:
+                conn.close()
+            else:
+                pool.release(conn)
+            return resp.status, resp_headers, _decode_body(data, resp_headers.get("content-encoding"))
+
+    def _proxied_request(self, method, url, body, headers, timeout):
+        """request() through urllib, which applies the proxy environment variables."""
+        req_headers = {"Accept-Encoding": "gzip, deflate"}
+        req_headers.update(headers or {})
+        req = urllib.request.Request(url, data=body, headers=req_headers, method=method)
+        with self._lock:
+            self.proxied += 1
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                status, raw_headers, data = resp.status, resp.getheaders(), resp.read()
+        except urllib.error.HTTPError as e:
+            status, raw_headers, data = e.code, e.headers.items(), e.read()
+        resp_headers = {k.lower(): v for k, v in raw_headers}
+        return status, resp_headers, _decode_body(data, resp_headers.get("content-encoding"))
+
+    def evict_idle(self):
+        for pool in list(self._pools.values()):
+            pool.evict_idle()
+
+    def close(self):
+        for pool in list(self._pools.values()):
+            pool.close()
+
+    def stats(self):
+        """Per-host counters: {host: {opened, reused, requests, handshake_ms, ...}}."""
+        out = {}
+        for (scheme, host, port), pool in list(self._pools.items()):
+            out[host if port in (80, 443) else f"{host}:{port}"] = pool.stats()
+        out["_dns"] = {"hits": self.dns.hits, "misses": self.dns.misses}
+        if self.proxied:
+            out["_proxy"] = {"requests": self.proxied}
+        return out
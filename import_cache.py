@@ -0,0 +1,125 @@
+"""
+Cache of Simmer import results (Polymarket slug → Simmer market_id).
+
+A fast market only needs importing once; after that the trade path can go
+straight to the order. Entries live until the market's end time (plus a
+grace period) and can be persisted to a JSON file so restarts keep them.
+
+Hit rate and the import latency saved are tracked: every miss records how
+long the real import took, and each hit is credited with the running mean.
+"""
+
+import os
+import json
+import time
+import threading
+
+EXPIRY_GRACE = 300  # Keep entries this long past the market's end time
+DEFAULT_TTL = 3600  # When the end time is unknown
+
+
+class ImportCache:
+    """Thread-safe slug → market_id cache with optional JSON persistence."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries = {}  # slug -> {"market_id", "expires_at"}
+        self.hits = 0
+        self.misses = 0
+        self.import_secs_total = 0.0
+        self.imports_timed = 0
+        if path:
+            self.load()
+
+    def get(self, slug):
+        """Cached market_id for slug, or None (counts as a hit/miss)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry and entry["expires_at"] > now:
+                self.hits += 1
+                return entry["market_id"]
+            if entry:
+                del self._entries[slug]
+            self.misses += 1
+            return None
+
+    def peek(self, slug):
+        """Like get() but without touching the counters."""
+        entry = self._entries.get(slug)
+        if entry and entry["expires_at"] > time.time():
+            return entry["market_id"]
+        return None
+
+    def put(self, slug, market_id, end_time=None, import_secs=None):
+        if end_time is not None:
+            expires_at = end_time.timestamp() + EXPIRY_GRACE
+        else:
+            expires_at = time.time() + DEFAULT_TTL
+        with self._lock:
+            self._entries[slug] = {"market_id": market_id, "expires_at": expires_at}
+            if import_secs is not None:
+                self.import_secs_total += import_secs
+                self.imports_timed += 1
+        if self.path:
+            self.save()
+
+    def evict_expired(self):
+        now = time.time()
+        with self._lock:
+            self._entries = {
+                s: e for s, e in self._entries.items() if e["expires_at"] > now
+            }
+
+    def avg_import_secs(self):
+        return self.import_secs_total / self.imports_timed if self.imports_timed else 0.0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        avg = self.avg_import_secs()
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "avg_import_ms": round(avg * 1e3, 1),
+            "saved_ms_per_hit": round(avg * 1e3, 1),
+            "saved_ms_total": round(avg * self.hits * 1e3, 1),
+        }
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        now = time.time()
+        with self._lock:
+            for slug, entry in (data.get("entries") or {}).items():
+                if entry.get("market_id") and entry.get("expires_at", 0) > now:
+                    self._entries[slug] = entry
+            self.import_secs_total = data.get("import_secs_total", 0.0)
+            self.imports_timed = data.get("imports_timed", 0)
+
+    def save(self):
+        self.evict_expired()
+        with self._lock:
+            data = {
+                "entries": dict(self._entries),
+                "import_secs_total": self.import_secs_total,
+                "imports_timed": self.imports_timed,
+            }
+        tmp = f"{self.path}.tmp"
+        with self._save_lock:
+            try:
+                with open(tmp, "w") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
@@ -0,0 +1,250 @@
+"""
+Incremental rolling indicators over 1m candles.
+
+RollingIndicators keeps the last `window` closed candles in ring buffers with
+cumulative sums (volume, volume², typical price × volume) plus the candle
+still forming, so every update and every query is O(1):
+
+  - momentum over any lookback (same numbers as price_feed.compute_momentum)
+  - EWMA volatility of 1m log returns (RiskMetrics-style, lambda 0.94)
+  - VWAP over the window and the current price's deviation from it
+  - volume z-score of the last closed candle against the window
+
+Usage:
+    ind = RollingIndicators(window=30)
+    ind.update(open_time, open, high, low, close, volume)  # kline (forming or closed)
+    ind.tick(trade_ms, price)                              # trade inside the forming candle
+    ind.momentum(5)
+    ind.snapshot(horizons=(1, 5, 15))
+"""
+
+import math
+
+EWMA_LAMBDA = 0.94
+REBASE_EVERY = 4096  # Closed candles between rebasing the cumulative sums
+
+
+class RollingIndicators:
+    """O(1) rolling statistics over a window of closed 1m candles + the forming one."""
+
+    __slots__ = (
+        "window",
+        "ewma_lambda",
+        "_size",
+        "_open",
+        "_volume",
+        "_cum_v",
+        "_cum_v2",
+        "_cum_pv",
+        "_closed",
+        "_forming",
+        "_prev_close",
+        "_ewma_var",
+    )
+
+    def __init__(self, window=30, ewma_lambda=EWMA_LAMBDA):
+        self.window = window
+        self.ewma_lambda = ewma_lambda
+        self._size = window + 1  # One extra slot for the cumulative-sum base
+        self._open = [0.0] * self._size
+        self._volume = [0.0] * self._size
+        self._cum_v = [0.0] * self._size
+        self._cum_v2 = [0.0] * self._size
+        self._cum_pv = [0.0] * self._size
+        self._closed = 0  # Closed candles seen (ring position = _closed % _size)
+        self._forming = None  # [open_time, open, high, low, close, volume]
+        self._prev_close = None
+        self._ewma_var = None
+
+    @classmethod
+    def from_candles(cls, candles, window=None, ewma_lambda=EWMA_LAMBDA):
+        """Build from [open_time, open, high, low, close, volume] rows; the last is forming."""
+        ind = cls(window or max(1, len(candles)), ewma_lambda)
+        for c in candles:
+            ind.update(*c[:6])
+        return ind
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def update(self, open_time, open_, high, low, close, volume):
+        """Apply a kline. A newer open_time closes the forming candle."""
+        forming = self._forming
+        if forming is not None:
+            if open_time < forming[0]:
+                return False  # Stale frame for an older candle
+            if open_time > forming[0]:
+                self._close_candle(forming)
+        self._forming = [open_time, open_, high, low, close, volume]
+        return True
+
+    def tick(self, trade_ms, price):
+        """Apply a trade price to the forming candle (volume comes from klines)."""
+        forming = self._forming
+        if forming is None or not forming[0] <= trade_ms < forming[0] + 60_000:
+            return False
+        forming[4] = price
+        if price > forming[2]:
+            forming[2] = price
+        if price < forming[3]:
+            forming[3] = price
+        return True
+
+    def _close_candle(self, candle):
+        _, open_, high, low, close, volume = candle
+        size = self._size
+        prev = (self._closed - 1) % size
+        i = self._closed % size
+        base = self._closed > 0  # First candle starts the sums at zero
+        typical = (high + low + close) / 3 if high and low else close
+        self._open[i] = open_
+        self._volume[i] = volume
+        self._cum_v[i] = (self._cum_v[prev] if base else 0.0) + volume
+        self._cum_v2[i] = (self._cum_v2[prev] if base else 0.0) + volume * volume
+        self._cum_pv[i] = (self._cum_pv[prev] if base else 0.0) + typical * volume
+        self._closed += 1
+
+        if self._prev_close:
+            r = math.log(close / self._prev_close) if close > 0 else 0.0
+            if self._ewma_var is None:
+                self._ewma_var = r * r
+            else:
+                lam = self.ewma_lambda
+                self._ewma_var = lam * self._ewma_var + (1 - lam) * r * r
+        self._prev_close = close
+
+        if self._closed % REBASE_EVERY == 0:
+            self._rebase()
+
+    def _rebase(self):
+        """Shift the cumulative sums down so they do not grow without bound.
+
+        Only differences between ring entries are ever read, and once the ring
+        has filled every query stays inside it, so subtracting a constant is exact.
+        """
+        if self._closed <= self._size:
+            return
+        latest = (self._closed - 1) % self._size
+        for cum in (self._cum_v, self._cum_v2, self._cum_pv):
+            base = cum[latest]
+            for j in range(self._size):
+                cum[j] -= base
+
+    # -------------------------------------------------------------------------
+    # Queries (O(1))
+    # -------------------------------------------------------------------------
+
+    def _sum(self, cum, n):
+        """Sum over the last n closed candles (n <= window) from a cumulative ring."""
+        if n <= 0:
+            return 0.0
+        last = self._closed - 1
+        start = last - n
+        return cum[last % self._size] - (cum[start % self._size] if start >= 0 else 0.0)
+
+    def __len__(self):
+        return min(self._closed, self.window) + (1 if self._forming is not None else 0)
+
+    @property
+    def price(self):
+        return self._forming[4] if self._forming is not None else None
+
+    def open_at(self, open_time):
+        """Open price of the candle that opened at open_time (ms), if still in the window."""
+        forming = self._forming
+        if forming is None:
+            return None
+        k, rem = divmod(forming[0] - open_time, 60_000)
+        if rem:
+            return None
+        if k == 0:
+            return forming[1]
+        if 0 < k <= min(self._closed, self.window):
+            return self._open[(self._closed - k) % self._size]
+        return None
+
+    def momentum(self, lookback_minutes, price_now=None):
+        """Momentum dict over the last lookback_minutes candles (forming included)."""
+        forming = self._forming
+        if forming is None:
+            return None
+        closed = min(lookback_minutes - 1, self._closed, self.window)
+        if closed < 1:
+            return None
+        price_then = self._open[(self._closed - closed) % self._size]
+        if price_now is None:
+            price_now = forming[4]
+        if not price_then:
+            return None
+        momentum_pct = (price_now - price_then) / price_then * 100
+        latest_volume = forming[5]
+        avg_volume = (self._sum(self._cum_v, closed) + latest_volume) / (closed + 1)
+        return {
+            "momentum_pct": momentum_pct,
+            "direction": "up" if momentum_pct > 0 else "down",
+            "price_now": price_now,
+            "price_then": price_then,
+            "avg_volume": avg_volume,
+            "latest_volume": latest_volume,
+            "volume_ratio": latest_volume / avg_volume if avg_volume > 0 else 1.0,
+            "candles": closed + 1,
+        }
+
+    def momentum_pct(self, minutes, price_now=None):
+        """Just the % move over the last `minutes` candles (1 = the forming candle)."""
+        forming = self._forming
+        if forming is None:
+            return None
+        closed = min(minutes - 1, self._closed, self.window)
+        price_then = self._open[(self._closed - closed) % self._size] if closed > 0 else forming[1]
+        if not price_then:
+            return None
+        return ((forming[4] if price_now is None else price_now) - price_then) / price_then * 100
+
+    def volatility_pct(self):
+        """EWMA standard deviation of 1m log returns, in percent (None until 2 closes)."""
+        return math.sqrt(self._ewma_var) * 100 if self._ewma_var is not None else None
+
+    def vwap(self):
+        """Volume-weighted typical price over the window plus the forming candle."""
+        n = min(self._closed, self.window)
+        volume = self._sum(self._cum_v, n)
+        pv = self._sum(self._cum_pv, n)
+        forming = self._forming
+        if forming is not None and forming[5] > 0:
+            high, low, close = forming[2], forming[3], forming[4]
+            volume += forming[5]
+            pv += ((high + low + close) / 3 if high and low else close) * forming[5]
+        return pv / volume if volume > 0 else None
+
+    def volume_zscore(self):
+        """Z-score of the last closed candle's volume against the closed window."""
+        n = min(self._closed, self.window)
+        if n < 2:
+            return None
+        mean = self._sum(self._cum_v, n) / n
+        var = max(0.0, self._sum(self._cum_v2, n) / n - mean * mean)
+        if var <= 0:
+            return 0.0
+        latest = self._volume[(self._closed - 1) % self._size]
+        return (latest - mean) / math.sqrt(var)
+
+    def snapshot(self, horizons=(1, 5, 15)):
+        """All indicators at once (the values attached to momentum signals)."""
+        price = self.price
+        vwap = self.vwap()
+        momentum = {}
+        for h in horizons:
+            pct = self.momentum_pct(h)
+            if pct is not None:
+                momentum[f"{h}m"] = round(pct, 4)
+        volatility = self.volatility_pct()
+        zscore = self.volume_zscore()
+        return {
+            "momentum": momentum,
+            "volatility_pct": round(volatility, 5) if volatility is not None else None,
+            "vwap": round(vwap, 6) if vwap else None,
+            "vwap_deviation_pct": round((price - vwap) / vwap * 100, 4) if vwap and price else None,
+            "volume_zscore": round(zscore, 3) if zscore is not None else None,
+        }
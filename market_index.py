@@ -0,0 +1,237 @@
+"""
+Incremental fast market discovery with an in-memory index.
+
+Gamma lists markets newest-created first, and fast markets are created ahead
+of time, so the window we want to trade can sit several pages deep. The
+index pages through Gamma only as far as it needs to: it remembers every
+condition ID it has seen and the newest createdAt (the cursor), and stops
+paging once it reaches markets it already knows.
+
+Live fast markets are kept per (asset, window) sorted by end time, so the
+soonest market with enough time left is a bisect away. Expired markets are
+evicted, keeping memory flat over days of uptime. Prices for the markets we
+are about to evaluate are refreshed with one batched request.
+"""
+
+import time
+import bisect
+import threading
+from datetime import datetime
+
+PAGE_SIZE = 50
+MAX_PAGES = 20  # Hard cap per refresh (first run included)
+EXPIRY_GRACE = 60  # Keep markets this many seconds past end_time
+SEEN_TTL = 86400  # Forget non-fast-market IDs (no end date) after a day
+_MAX_SLUG = "\uffff"  # Sorts after any slug, for bisecting on end time alone
+
+
+def _parse_iso(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+class MarketIndex:
+    """Incrementally refreshed index of live fast markets.
+
+    fetch: callable(params dict) -> list of raw Gamma market records, or None.
+    parse: callable(raw record) -> market dict with asset, window, slug,
+           condition_id and end_time (datetime), or None if not a fast market.
+    """
+
+    def __init__(self, fetch, parse, page_size=PAGE_SIZE, max_pages=MAX_PAGES):
+        self.fetch = fetch
+        self.parse = parse
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+        self._lock = threading.Lock()  # Guards _markets/_by_key for readers
+        self._refresh_lock = threading.Lock()  # One refresh (or eviction) at a time
+        self._seen = {}  # condition_id -> forget-after epoch seconds
+        self._markets = {}  # slug -> market dict
+        self._by_key = {}  # (asset, window) -> sorted [(end_ts, slug)]
+        self.cursor = None  # Newest createdAt seen (datetime)
+
+        self.pages_fetched = 0
+        self.records_seen = 0
+        self.refreshes = 0
+        self.skipped_refreshes = 0
+
+    # -------------------------------------------------------------------------
+    # Refresh
+    # -------------------------------------------------------------------------
+
+    def refresh(self):
+        """Fetch markets created since the cursor. Returns count of new fast markets.
+
+        A call that overlaps a refresh still running (e.g. one a timed-out
+        cycle left behind) returns 0 at once instead of racing it.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            self.skipped_refreshes += 1
+            return 0
+        try:
+            return self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self):
+        now = time.time()
+        added = 0
+        newest = self.cursor
+        for page in range(self.max_pages):
+            records = self.fetch(
+                {
+                    "limit": self.page_size,
+                    "offset": page * self.page_size,
+                    "closed": "false",
+                    "tag": "crypto",
+                    "order": "createdAt",
+                    "ascending": "false",
+                }
+            )
+            if not records:
+                break
+            self.pages_fetched += 1
+            reached_known = False
+            all_expired = True
+            for record in records:
+                self.records_seen += 1
+                created = _parse_iso(record.get("createdAt"))
+                if created and (newest is None or created > newest):
+                    newest = created
+                if self.cursor and created and created <= self.cursor:
+                    reached_known = True
+                end = _parse_iso(record.get("endDate"))
+                if end is None or end.timestamp() > now:
+                    all_expired = False
+                condition_id = record.get("conditionId") or record.get("id")
+                if condition_id in self._seen:
+                    reached_known = True
+                    self._update_quote(record)
+                    continue
+                forget_at = end.timestamp() + EXPIRY_GRACE if end else now + SEEN_TTL
+                self._seen[condition_id] = forget_at
+                if self._insert(record, now):
+                    added += 1
+            if reached_known or all_expired or len(records) < self.page_size:
+                break
+        self.cursor = newest
+        self.refreshes += 1
+        self._evict(now)
+        return added
+
+    def _insert(self, record, now):
+        market = self.parse(record)
+        if not market or not market.get("end_time"):
+            return False
+        end_ts = market["end_time"].timestamp()
+        if end_ts <= now:
+            return False
+        market["quoted_at"] = now
+        key = (market["asset"], market["window"])
+        with self._lock:
+            if market["slug"] in self._markets:
+                return False
+            self._markets[market["slug"]] = market
+            bisect.insort(self._by_key.setdefault(key, []), (end_ts, market["slug"]))
+        return True
+
+    def _update_quote(self, record):
+        market = self._markets.get(record.get("slug", ""))
+        if market is None:
+            return False
+        if record.get("outcomePrices") is not None:
+            market["outcome_prices"] = record.get("outcomePrices")
+        if record.get("closed"):
+            market["closed"] = True
+        market["quoted_at"] = time.time()
+        return True
+
+    def refresh_quotes(self, slugs, max_age=0):
+        """Re-fetch prices for the given slugs in one request (skips fresh ones)."""
+        now = time.time()
+        stale = [
+            s
+            for s in slugs
+            if s in self._markets and now - self._markets[s].get("quoted_at", 0) > max_age
+        ]
+        if not stale:
+            return 0
+        records = self.fetch({"slug": stale, "limit": len(stale)})
+        updated = 0
+        for record in records or []:
+            if self._update_quote(record):
+                updated += 1
+        return updated
+
+    def evict_expired(self, now=None):
+        """Drop markets (and remembered IDs) whose window is over."""
+        now = time.time() if now is None else now
+        with self._refresh_lock:
+            return self._evict(now)
+
+    def _evict(self, now):
+        cutoff = now - EXPIRY_GRACE
+        evicted = 0
+        with self._lock:
+            for key, entries in self._by_key.items():
+                idx = bisect.bisect_left(entries, (cutoff, ""))
+                for _, slug in entries[:idx]:
+                    self._markets.pop(slug, None)
+                evicted += idx
+                del entries[:idx]
+            self._seen = {k: t for k, t in self._seen.items() if t > now}
+        return evicted
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def live(self, asset, window, now=None):
+        """Open markets for a pair, sorted by end time."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = list(self._by_key.get((asset, window), ()))
+        idx = bisect.bisect_right(entries, (now, _MAX_SLUG))
+        return [
+            self._markets[slug]
+            for _, slug in entries[idx:]
+            if slug in self._markets and not self._markets[slug].get("closed")
+        ]
+
+    def find_best(self, asset, window, min_time_remaining, now=None):
+        """Soonest-expiring open market with more than min_time_remaining left."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = self._by_key.get((asset, window))
+            if not entries:
+                return None
+            idx = bisect.bisect_right(entries, (now + min_time_remaining, _MAX_SLUG))
+            for _, slug in entries[idx:]:
+                market = self._markets.get(slug)
+                if market and not market.get("closed"):
+                    return market
+        return None
+
+    def upcoming(self, asset, window, min_time_remaining, count=2, now=None):
+        """The next `count` tradeable markets for a pair."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = list(self._by_key.get((asset, window), ()))
+        idx = bisect.bisect_right(entries, (now + min_time_remaining, _MAX_SLUG))
+        return [self._markets[s] for _, s in entries[idx : idx + count] if s in self._markets]
+
+    def stats(self):
+        return {
+            "markets": len(self._markets),
+            "seen_ids": len(self._seen),
+            "pages_fetched": self.pages_fetched,
+            "records_seen": self.records_seen,
+            "refreshes": self.refreshes,
+            "skipped_refreshes": self.skipped_refreshes,
+            "cursor": self.cursor.isoformat() if self.cursor else None,
+        }
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Fast-market question/slug parsing.
+
+Turns a Gamma market record into its asset, window and window start/end
+times (UTC). Sources are tried in order of reliability:
+
+1. the record's `endDate` (ISO 8601, UTC);
+2. a slug ending in the window's start as a unix timestamp
+   (btc-updown-15m-1760000400);
+3. the question text: "Bitcoin Up or Down - February 15, 5:30AM-5:35AM ET".
+
+Question times are US Eastern wall-clock times. They are converted with
+America/New_York (zoneinfo), so DST is handled. Without tz data, the US
+rule is used: second Sunday of March to first Sunday of November. The
+question has no year, so the year that puts the date nearest now is
+used. A window asked about on Dec 31 for "January 1" is next year's.
+
+Results are memoized per slug. The patterns are compiled once at import.
+
+Usage:
+    parse_market(record)   # {"asset", "window", "start_time", "end_time"}, None where unknown
+    parse_question_times("Bitcoin Up or Down - February 15, 5:30AM-5:35AM ET")
+
+Benchmark:
+    python market_parser.py --records 5000
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+
+try:
+    from zoneinfo import ZoneInfo
+
+    EASTERN = ZoneInfo("America/New_York")
+except Exception:  # No zoneinfo/tzdata: fall back to the US DST rule below
+    EASTERN = None
+
+ASSET_PATTERNS = {
+    "BTC": ("bitcoin up or down",),
+    "ETH": ("ethereum up or down",),
+    "SOL": ("solana up or down",),
+}
+SLUG_ASSETS = {"btc": "BTC", "eth": "ETH", "sol": "SOL"}
+WINDOW_SECONDS = {"5m": 300, "15m": 900, "1h": 3600, "4h": 14400}
+MAX_CACHE = 16384  # Parsed slugs kept; the oldest is dropped beyond this
+
+# "February 15, 5:30AM-5:35AM ET" (start time optional, minutes optional: "5PM").
+# Groups: month, day, start hour/minute/A|P, end hour/minute/A|P.
+_CLOCK = r"(\d{1,2})(?::(\d{2}))?\s*([AP])M"
+_QUESTION_RE = re.compile(r"\b([A-Za-z]{3,9})\s+(\d{1,2}),\s*(?:" + _CLOCK + r"\s*-\s*)?" + _CLOCK + r"\s*ET")
+# "btc-updown-15m-1760000400"; the timestamp is optional
+_SLUG_RE = re.compile(r"^(?P<asset>[a-z]+)-updown-(?P<window>\d+[mh])(?:-(?P<ts>\d{9,11}))?(?:-|$)")
+
+_MONTHS = {
+    name: i
+    for i, names in enumerate(
+        (
+            ("january", "jan"),
+            ("february", "feb"),
+            ("march", "mar"),
+            ("april", "apr"),
+            ("may",),
+            ("june", "jun"),
+            ("july", "jul"),
+            ("august", "aug"),
+            ("september", "sep", "sept"),
+            ("october", "oct"),
+            ("november", "nov"),
+            ("december", "dec"),
+        ),
+        1,
+    )
+    for name in names
+}
+
+_cache = {}
+
+
+def _nth_sunday(year, month, n):
+    first = datetime(year, month, 1)
+    return first + timedelta(days=(6 - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def eastern_to_utc(naive):
+    """US Eastern wall-clock datetime (naive) → aware UTC datetime."""
+    if EASTERN is not None:
+        return naive.replace(tzinfo=EASTERN).astimezone(timezone.utc)
+    dst_start = _nth_sunday(naive.year, 3, 2).replace(hour=2)
+    dst_end = _nth_sunday(naive.year, 11, 1).replace(hour=2)
+    offset = 4 if dst_start <= naive < dst_end else 5
+    return (naive + timedelta(hours=offset)).replace(tzinfo=timezone.utc)
+
+
+def _eastern(year, month, day, hour, minute):
+    """eastern_to_utc() without the intermediate naive datetime (hot path)."""
+    if EASTERN is not None:
+        return datetime(year, month, day, hour, minute, tzinfo=EASTERN).astimezone(timezone.utc)
+    return eastern_to_utc(datetime(year, month, day, hour, minute))
+
+
+def _clock(hour, minute, half):
+    """('5', '30', 'P') → (17, 30)."""
+    hour = int(hour) % 12 + (12 if half == "P" else 0)
+    return hour, int(minute or 0)
+
+
+def parse_question_times(question, now=None):
+    """(start, end) UTC datetimes from a fast-market question, or None.
+
+    The date is the window's start date; an end at or before the start is
+    on the next day (11:55PM-12:00AM). start is None when the question only
+    gives the end time.
+    """
+    m = _QUESTION_RE.search(question or "")
+    if not m:
+        return None
+    month_name, day, start_hour, start_minute, start_half, *end = m.groups()
+    month = _MONTHS.get(month_name.lower())
+    if not month:
+        return None
+    day = int(day)
+    end_clock = _clock(*end)
+    start_clock = _clock(start_hour, start_minute, start_half) if start_hour else None
+    now = now or datetime.now(timezone.utc)
+    # The question has no year: take the one that puts the date nearest now
+    year = now.year
+    if month - now.month > 6:
+        year -= 1
+    elif now.month - month > 6:
+        year += 1
+    try:
+        end = _eastern(year, month, day, *end_clock)
+    except ValueError:  # Feb 29 outside a leap year, or not a date at all
+        return None
+    start = None
+    if start_clock:
+        start = _eastern(year, month, day, *start_clock)
+        if end <= start:
+            end += timedelta(days=1)  # Midnight is never a DST switch in the US
+    return start, end
+
+
+def _parse_iso(value):
+    if "T" not in str(value):  # A bare date says nothing about the window
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _parse(record, now):
+    question = record.get("question") or ""
+    slug = record.get("slug") or ""
+    q = question.lower()
+    asset = next((a for a, patterns in ASSET_PATTERNS.items() if any(p in q for p in patterns)), None)
+    slug_match = _SLUG_RE.match(slug)
+    window = slug_match.group("window") if slug_match else None
+    if asset is None and slug_match and "up or down" in q:
+        asset = SLUG_ASSETS.get(slug_match.group("asset"))
+
+    start = end = None
+    if record.get("endDate"):
+        end = _parse_iso(record["endDate"])
+    if end is None and slug_match and slug_match.group("ts") and window in WINDOW_SECONDS:
+        start = datetime.fromtimestamp(int(slug_match.group("ts")), timezone.utc)
+        end = start + timedelta(seconds=WINDOW_SECONDS[window])
+    if end is None:
+        times = parse_question_times(question, now)
+        if times:
+            start, end = times
+    if window is None and start is not None and end is not None:
+        minutes = int((end - start).total_seconds() // 60)
+        window = f"{minutes // 60}h" if minutes >= 60 and minutes % 60 == 0 else f"{minutes}m"
+    if start is None and end is not None and window in WINDOW_SECONDS:
+        start = end - timedelta(seconds=WINDOW_SECONDS[window])
+    return {"asset": asset, "window": window, "start_time": start, "end_time": end}
+
+
+def parse_market(record, now=None):
+    """Asset, window and window start/end (UTC) of a Gamma market record.
+
+    Keys are None where nothing matched. Memoized per slug (records without a
+    slug are parsed every time).
+    """
+    slug = record.get("slug")
+    if slug:
+        parsed = _cache.get(slug)
+        if parsed is not None:
+            return parsed
+    parsed = _parse(record, now)
+    if slug:
+        if len(_cache) >= MAX_CACHE:
+            del _cache[next(iter(_cache))]
+        _cache[slug] = parsed
+    return parsed
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def benchmark(records=5000):
+    """(seconds per uncached parse, seconds per memoized lookup) over `records` markets."""
+    import time
+    import random
+
+    rng = random.Random(7)
+    base = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    names = (("BTC", "Bitcoin"), ("ETH", "Ethereum"), ("SOL", "Solana"))
+    sample = []
+    for i in range(records):
+        asset, name = rng.choice(names)
+        window = rng.choice(("5m", "15m"))
+        start = base + timedelta(minutes=5 * i)
+        end = start + timedelta(seconds=WINDOW_SECONDS[window])
+        start_et, end_et = (
+            (t.astimezone(EASTERN) if EASTERN else t - timedelta(hours=5)) for t in (start, end)
+        )
+        fmt = lambda t: t.strftime("%I:%M%p").lstrip("0")
+        sample.append(
+            {
+                "slug": f"{asset.lower()}-updown-{window}-q{i}",  # No timestamp: exercise the question path
+                "question": f"{name} Up or Down - {end_et.strftime('%B')} {end_et.day}, {fmt(start_et)}-{fmt(end_et)} ET",
+            }
+        )
+    clear_cache()
+    now = datetime(2026, 3, 15, tzinfo=timezone.utc)
+    started = time.perf_counter()
+    for record in sample:
+        parse_market(record, now)
+    cold = (time.perf_counter() - started) / records
+    started = time.perf_counter()
+    for record in sample:
+        parse_market(record, now)
+    warm = (time.perf_counter() - started) / records
+    return cold, warm
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark fast-market parsing")
+    parser.add_argument("--records", type=int, default=5000)
+    args = parser.parse_args()
+
+    cold, warm = benchmark(args.records)
+    tz = "zoneinfo" if EASTERN is not None else "US DST rule"
+    print(
+        f"⚡ parse_market over {args.records} records: {cold * 1e6:.1f}µs per new slug,"
+        f" {warm * 1e9:.0f}ns memoized ({tz})"
+    )
@@ -0,0 +1,310 @@
+"""
+Lightweight latency metrics for the FastLoop hot path.
+
+LatencyHistogram is HDR-style: log-linear buckets (16 sub-buckets per power
+of two, ~6% relative precision) over integer nanoseconds, so recording is a
+couple of integer ops and a dict increment regardless of the value range.
+
+MetricsRegistry collects named counters and histograms for the cycle stages
+and renders them as Prometheus text; MetricsServer serves that locally.
+"""
+
+import json
+import time
+import threading
+
+_SUB_BITS = 4
+_SUB_BUCKETS = 1 << _SUB_BITS  # 16
+
+
+def _bucket_index(value_ns):
+    if value_ns < 2 * _SUB_BUCKETS:
+        return value_ns if value_ns > 0 else 0
+    shift = value_ns.bit_length() - (_SUB_BITS + 1)
+    return shift * _SUB_BUCKETS + (value_ns >> shift)
+
+
+def _bucket_upper(index):
+    """Highest value (ns) that lands in bucket index."""
+    if index < 2 * _SUB_BUCKETS:
+        return index
+    shift = index // _SUB_BUCKETS - 1
+    mantissa = index - shift * _SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Thread-safe latency histogram. Record seconds or nanoseconds."""
+
+    def __init__(self, name=""):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+            self.count = 0
+            self.total_ns = 0
+            self.min_ns = None
+            self.max_ns = 0
+
+    def record_ns(self, value_ns):
+        value_ns = int(value_ns)
+        if value_ns < 0:
+            value_ns = 0
+        idx = _bucket_index(value_ns)
+        with self._lock:
+            self._counts[idx] = self._counts.get(idx, 0) + 1
+            self.count += 1
+            self.total_ns += value_ns
+            if self.min_ns is None or value_ns < self.min_ns:
+                self.min_ns = value_ns
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+
+    def record(self, seconds):
+        self.record_ns(seconds * 1e9)
+
+    def percentile_ns(self, pct):
+        with self._lock:
+            if not self.count:
+                return 0
+            target = max(1, int(round(self.count * pct / 100.0)))
+            seen = 0
+            for idx in sorted(self._counts):
+                seen += self._counts[idx]
+                if seen >= target:
+                    return min(_bucket_upper(idx), self.max_ns)
+            return self.max_ns
+
+    def percentile(self, pct):
+        """Percentile in seconds."""
+        return self.percentile_ns(pct) / 1e9
+
+    def mean(self):
+        return self.total_ns / self.count / 1e9 if self.count else 0.0
+
+    def buckets(self):
+        """Cumulative (upper_bound_seconds, count) pairs, for exposition."""
+        with self._lock:
+            items = sorted(self._counts.items())
+        cumulative = 0
+        out = []
+        for idx, n in items:
+            cumulative += n
+            out.append((_bucket_upper(idx) / 1e9, cumulative))
+        return out
+
+    def summary(self, scale=1e3):
+        """Dict of count/mean/p50/p90/p99/max, scaled (default: milliseconds)."""
+        return {
+            "count": self.count,
+            "mean": round(self.mean() * scale, 3),
+            "p50": round(self.percentile(50) * scale, 3),
+            "p90": round(self.percentile(90) * scale, 3),
+            "p99": round(self.percentile(99) * scale, 3),
+            "max": round(self.max_ns / 1e9 * scale, 3),
+        }
+
+
+# =============================================================================
+# Registry and exposition
+# =============================================================================
+
+
+class _Stage:
+    """Context manager that records its duration into a histogram."""
+
+    __slots__ = ("hist", "start")
+
+    def __init__(self, hist):
+        self.hist = hist
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.record_ns(time.perf_counter_ns() - self.start)
+        return False
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(key, extra=None):
+    items = list(key) + (list(extra.items()) if extra else [])
+    if not items:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in items
+    )
+    return "{" + body + "}"
+
+
+class MetricsRegistry:
+    """Named counters and latency histograms with Prometheus text exposition.
+
+    Stage timings go to the "stage_seconds" histogram labelled by stage:
+
+        with registry.stage("discovery"):
+            ...
+        registry.inc("skips", reason="low_volume")
+    """
+
+    def __init__(self, prefix="fastloop"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms = {}  # (name, label key) -> LatencyHistogram
+        self._counters = {}  # (name, label key) -> number
+        self._gauges = {}  # (name, label key) -> number
+        self.started_at = time.time()
+
+    def histogram(self, name, **labels):
+        key = (name, _label_key(labels))
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(key, LatencyHistogram(name))
+        return hist
+
+    def register(self, name, hist, **labels):
+        """Expose an existing histogram (e.g. scheduler jitter) under name."""
+        with self._lock:
+            self._histograms[(name, _label_key(labels))] = hist
+        return hist
+
+    def stage(self, name):
+        """Time a block as one stage of the cycle."""
+        key = ("stage_seconds", (("stage", name),))
+        hist = self._histograms.get(key)
+        if hist is None:
+            hist = self.histogram("stage_seconds", stage=name)
+        return _Stage(hist)
+
+    def observe(self, name, seconds, **labels):
+        self.histogram(name, **labels).record(seconds)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def counter(self, name, **labels):
+        return self._counters.get((name, _label_key(labels)), 0)
+
+    def measure_overhead(self, iterations=100_000):
+        """Average cost (ns) of one stage() block, measured on a scratch histogram."""
+        hist = LatencyHistogram("overhead")
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            with _Stage(hist):
+                pass
+        per_call = (time.perf_counter_ns() - start) / iterations
+        self.set("instrumentation_overhead_ns", round(per_call, 1))
+        return per_call
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def snapshot(self):
+        """Plain dict of every metric (histograms in milliseconds)."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = dict(self._histograms)
+        out = {"uptime_secs": round(time.time() - self.started_at, 1)}
+        for kind, items in (("counters", counters), ("gauges", gauges)):
+            section = out.setdefault(kind, {})
+            for (name, key), value in sorted(items.items()):
+                label = ",".join(f"{k}={v}" for k, v in key)
+                section[f"{name}{{{label}}}" if label else name] = value
+        section = out.setdefault("latency_ms", {})
+        for (name, key), hist in sorted(histograms.items()):
+            if hist.count:
+                label = ",".join(f"{v}" for _, v in key)
+                section[f"{name}:{label}" if label else name] = hist.summary(scale=1e3)
+        return out
+
+    def render(self):
+        """Prometheus text format (histograms exposed as summaries)."""
+        p = self.prefix
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(self._histograms.items())
+        lines = []
+        typed = set()
+        for (name, key), value in counters:
+            metric = f"{p}_{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(key)} {value}")
+        for (name, key), value in gauges:
+            metric = f"{p}_{name}"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric}{_format_labels(key)} {value}")
+        for (name, key), hist in histograms:
+            metric = f"{p}_{name}"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            for q in (0.5, 0.9, 0.99):
+                value = hist.percentile(q * 100)
+                lines.append(f"{metric}{_format_labels(key, {'quantile': q})} {value:.9f}")
+            lines.append(f"{metric}_sum{_format_labels(key)} {hist.total_ns / 1e9:.9f}")
+            lines.append(f"{metric}_count{_format_labels(key)} {hist.count}")
+        lines.append(f"{p}_uptime_seconds {time.time() - self.started_at:.1f}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serve a registry on http://host:port/metrics (and /metrics.json)."""
+
+    def __init__(self, registry, port, host="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps(registry.snapshot()).encode()
+                    ctype = "application/json"
+                elif self.path.startswith("/metrics"):
+                    body = registry.render().encode()
+                    ctype = "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="metrics-server", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,385 @@
+"""
+Polymarket CLOB order books.
+
+OrderBook holds bid/ask depth for one outcome token and prices a market buy
+of a dollar amount by walking the asks: average fill price, worst level
+touched, slippage against the best ask and whether the book is deep enough.
+
+BookFeed keeps a WebSocket subscription to the CLOB market channel for the
+tokens being watched ("book" snapshots plus "price_change" deltas) and uses
+REST /book snapshots when a token is not synced on the stream yet. It
+reconnects with exponential backoff like price_feed.BinancePriceFeed.
+
+Usage:
+    books = BookFeed(fetch_book=rest_snapshot).start()
+    books.watch([yes_token])
+    yes = books.get(yes_token)
+    yes.buy_quote(5.0)               # buy YES with $5
+    yes.complement().buy_quote(5.0)  # buy NO with $5
+
+    # Against a local stand-in (see ws_client.ReplayServer)
+    books = BookFeed(url="ws://127.0.0.1:8766").start()
+"""
+
+import json
+import time
+import random
+import threading
+
+from ws_client import connect, WebSocketClosed
+
+CLOB_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+STABLE_CONNECTION_SECS = 60  # Reset backoff after staying up this long
+PING_INTERVAL = 10  # The CLOB channel expects a text "PING" keepalive
+RECV_TIMEOUT = 30
+MAX_TOKENS = 64  # Oldest watched tokens are dropped beyond this
+
+
+def _levels(rows):
+    """[{"price": "0.51", "size": "120"}] (or [[price, size]]) -> {price: size}."""
+    levels = {}
+    for row in rows or ():
+        try:
+            if isinstance(row, dict):
+                price, size = float(row["price"]), float(row["size"])
+            else:
+                price, size = float(row[0]), float(row[1])
+        except (KeyError, IndexError, ValueError, TypeError):
+            continue
+        if size > 0:
+            levels[price] = size
+    return levels
+
+
+class OrderBook:
+    """Bid/ask depth for one outcome token."""
+
+    def __init__(self, token_id):
+        self.token_id = token_id
+        self.bids = {}  # price -> size
+        self.asks = {}
+        self.updated_at = None  # time.monotonic() of the last change
+        self._asks_sorted = None
+
+    def apply_snapshot(self, bids, asks):
+        self.bids = _levels(bids)
+        self.asks = _levels(asks)
+        self._asks_sorted = None
+        self.updated_at = time.monotonic()
+
+    def apply_change(self, side, price, size):
+        """side is BUY (bids) or SELL (asks); size 0 removes the level."""
+        levels = self.bids if str(side).upper() in ("BUY", "BID") else self.asks
+        price, size = float(price), float(size)
+        if size > 0:
+            levels[price] = size
+        else:
+            levels.pop(price, None)
+        if levels is self.asks:
+            self._asks_sorted = None
+        self.updated_at = time.monotonic()
+
+    def copy(self):
+        book = OrderBook(self.token_id)
+        book.bids = dict(self.bids)
+        book.asks = dict(self.asks)
+        book.updated_at = self.updated_at
+        return book
+
+    def complement(self, token_id=None):
+        """The other outcome's book: its asks are our bids at 1 - price, and vice versa.
+
+        Binary CLOB markets match YES and NO orders against each other, so one
+        token's book fully describes both sides.
+        """
+        book = OrderBook(token_id)
+        book.bids = {round(1 - p, 6): s for p, s in self.asks.items()}
+        book.asks = {round(1 - p, 6): s for p, s in self.bids.items()}
+        book.updated_at = self.updated_at
+        return book
+
+    def best_bid(self):
+        return max(self.bids) if self.bids else None
+
+    def best_ask(self):
+        return min(self.asks) if self.asks else None
+
+    def mid(self):
+        bid, ask = self.best_bid(), self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def buy_quote(self, amount, limit_price=None):
+        """Walk the asks to spend `amount` dollars. Returns a quote dict or None.
+
+        Keys: avg_price, shares, cost, best_ask, worst_price, slippage (avg
+        minus best ask), levels, filled (False if depth ran out first).
+        """
+        if self._asks_sorted is None:
+            self._asks_sorted = sorted(self.asks.items())
+        asks = self._asks_sorted
+        if not asks or amount <= 0:
+            return None
+        remaining = amount
+        shares = 0.0
+        worst = asks[0][0]
+        levels = 0
+        for price, size in asks:
+            if limit_price is not None and price > limit_price:
+                break
+            take = min(size, remaining / price)
+            shares += take
+            remaining -= take * price
+            worst = price
+            levels += 1
+            if remaining <= 1e-9:
+                break
+        cost = amount - max(remaining, 0.0)
+        if shares <= 0:
+            return None
+        avg_price = cost / shares
+        return {
+            "avg_price": avg_price,
+            "shares": shares,
+            "cost": cost,
+            "best_ask": asks[0][0],
+            "worst_price": worst,
+            "slippage": avg_price - asks[0][0],
+            "levels": levels,
+            "filled": remaining <= 1e-9,
+        }
+
+    def depth(self, within=0.05):
+        """Dollar value of asks priced within `within` of the best ask."""
+        best = self.best_ask()
+        if best is None:
+            return 0.0
+        return sum(p * s for p, s in self.asks.items() if p <= best + within)
+
+
+class BookFeed:
+    """Background CLOB market-channel stream keeping an OrderBook per watched token.
+
+    fetch_book: optional callable(token_id) -> {"bids": [...], "asks": [...]}
+          (the REST /book response), used for tokens not yet synced on the stream.
+    on_update: optional callable(token_id) fired after each book change.
+    """
+
+    def __init__(self, url=CLOB_WS_URL, fetch_book=None, on_update=None):
+        self.url = url
+        self.fetch_book = fetch_book
+        self.on_update = on_update
+
+        self._lock = threading.Lock()
+        self._books = {}  # token_id -> OrderBook
+        self._watched = []  # token ids, oldest first
+        self._synced = set()  # tokens with a snapshot on the current connection
+        self._last_frame = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._ws = None
+
+        self.connected = False
+        self.reconnects = 0
+        self.frames = 0
+        self.snapshots = 0
+        self.callback_errors = 0
+        self.last_error = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="clob-book-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        ws = self._ws
+        if ws:
+            ws.close()
+        if self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def watch(self, token_ids):
+        """Subscribe to token_ids (no-op for tokens already watched)."""
+        new = []
+        with self._lock:
+            for token in token_ids:
+                if token and token not in self._books:
+                    self._books[token] = OrderBook(token)
+                    self._watched.append(token)
+                    new.append(token)
+            while len(self._watched) > MAX_TOKENS:
+                old = self._watched.pop(0)
+                self._books.pop(old, None)
+                self._synced.discard(old)
+        ws = self._ws
+        if new and ws is not None and self.connected:
+            try:
+                ws.send(json.dumps({"assets_ids": new, "operation": "subscribe"}))
+            except WebSocketClosed:
+                pass
+        return new
+
+    def _run(self):
+        delay = RECONNECT_MIN_DELAY
+        while not self._stop.is_set():
+            connected_at = None
+            with self._lock:
+                tokens = list(self._watched)
+            if not tokens:
+                self._stop.wait(0.25)
+                continue
+            try:
+                self._ws = connect(self.url, timeout=10)
+                self._ws.settimeout(RECV_TIMEOUT)
+                self._ws.send(json.dumps({"assets_ids": tokens, "type": "market"}))
+                self.connected = True
+                connected_at = time.monotonic()
+                self._last_frame = connected_at
+                threading.Thread(target=self._keepalive, args=(self._ws,), daemon=True).start()
+                while not self._stop.is_set():
+                    self._handle_message(self._ws.recv())
+            except (WebSocketClosed, OSError) as e:
+                self.last_error = str(e)
+            except Exception as e:  # A bad frame must not end the stream for good
+                self.last_error = f"{type(e).__name__}: {e}"
+            finally:
+                self.connected = False
+                with self._lock:
+                    self._synced.clear()
+                if self._ws:
+                    self._ws.close()
+                    self._ws = None
+            if self._stop.is_set():
+                break
+            if connected_at and time.monotonic() - connected_at > STABLE_CONNECTION_SECS:
+                delay = RECONNECT_MIN_DELAY
+            self.reconnects += 1
+            self._stop.wait(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    def _keepalive(self, ws):
+        while not self._stop.wait(PING_INTERVAL) and not ws.closed:
+            try:
+                ws.send("PING")
+            except WebSocketClosed:
+                return
+
+    # -------------------------------------------------------------------------
+    # Frame handling
+    # -------------------------------------------------------------------------
+
+    def _handle_message(self, raw):
+        self.frames += 1
+        self._last_frame = time.monotonic()
+        try:
+            msg = json.loads(raw)
+        except (TypeError, ValueError):
+            return  # "PONG"
+        for event in msg if isinstance(msg, list) else [msg]:
+            if isinstance(event, dict):
+                self._apply_event(event)
+
+    def _apply_event(self, event):
+        kind = event.get("event_type")
+        changed = []
+        with self._lock:
+            if kind == "book":
+                book = self._books.get(event.get("asset_id"))
+                if book is not None:
+                    book.apply_snapshot(
+                        event.get("bids", event.get("buys")), event.get("asks", event.get("sells"))
+                    )
+                    self._synced.add(book.token_id)
+                    changed.append(book.token_id)
+            elif kind == "price_change":
+                # Newer messages carry per-asset "price_changes"; older ones one asset + "changes"
+                changes = event.get("price_changes")
+                if changes is None:
+                    changes = [dict(c, asset_id=event.get("asset_id")) for c in event.get("changes") or ()]
+                for change in changes:
+                    book = self._books.get(change.get("asset_id"))
+                    if book is None or book.token_id not in self._synced:
+                        continue
+                    try:
+                        book.apply_change(change["side"], change["price"], change["size"])
+                    except (KeyError, ValueError, TypeError):
+                        continue
+                    changed.append(book.token_id)
+        if self.on_update:
+            for token in changed:
+                try:
+                    self.on_update(token)
+                except Exception as e:  # Counted, not raised into the stream
+                    self.callback_errors += 1
+                    self.last_error = f"{type(e).__name__}: {e}"
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def is_synced(self, token_id, max_age=RECV_TIMEOUT):
+        """True if the stream holds a live book for token_id."""
+        return (
+            self.connected
+            and token_id in self._synced
+            and self._last_frame is not None
+            and time.monotonic() - self._last_frame <= max_age
+        )
+
+    def snapshot(self, token_id):
+        """Load token_id's book from REST. Returns a copy of the OrderBook or None."""
+        if not self.fetch_book:
+            return None
+        try:
+            data = self.fetch_book(token_id)
+        except Exception as e:
+            self.last_error = str(e)
+            return None
+        if not isinstance(data, dict) or ("bids" not in data and "asks" not in data):
+            return None
+        self.snapshots += 1
+        with self._lock:
+            book = self._books.get(token_id)
+            if book is None:
+                book = self._books[token_id] = OrderBook(token_id)
+                self._watched.append(token_id)
+            if token_id not in self._synced:
+                book.apply_snapshot(data.get("bids"), data.get("asks"))
+            return book.copy()
+
+    def get(self, token_id):
+        """A copy of token_id's current book: from the stream if synced, else REST."""
+        if self.is_synced(token_id):
+            with self._lock:
+                book = self._books.get(token_id)
+                if book is not None:
+                    return book.copy()
+        return self.snapshot(token_id)
+
+    def status(self):
+        return {
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "frames": self.frames,
+            "watched": len(self._watched),
+            "synced": len(self._synced),
+            "snapshots": self.snapshots,
+            "callback_errors": self.callback_errors,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,200 @@
+"""
+Pre-warmed order path.
+
+Once a candidate market is selected, everything that does not depend on the
+signal is done ahead of time: the Simmer market_id is resolved and the
+market details are fetched. A market the details show as no longer open
+(resolved, not active, or its order book closed) is recorded as closed and
+gets no templates, so the trade path skips it instead of submitting an order
+that would be rejected. Otherwise a YES and a NO order template are bound
+to the market_id. When the signal fires the trade path only fills in the
+amount and submits.
+
+Signal-to-submit latency (local overhead between the decision and the SDK
+trade call) is recorded in a histogram.
+
+Order signing happens inside the SDK's trade() call using WALLET_PRIVATE_KEY;
+the templates stop at that boundary.
+"""
+
+import time
+import threading
+
+from metrics import LatencyHistogram
+
+
+def closed_reason(details):
+    """Why market details show the market can't take orders, or None if it can.
+
+    details: Simmer market details (dict or SDK Market); None means unknown
+    and counts as open.
+    """
+    if not details:
+        return None
+    field = details.get if isinstance(details, dict) else lambda k: getattr(details, k, None)
+    if field("outcome") is not None:
+        return "resolved"
+    status = field("status")
+    if status and status != "active":
+        return f"status {status}"
+    if field("is_orderbook_open") is False:
+        return "order book closed"
+    return None
+
+
+class OrderTemplate:
+    """A ready-to-submit order missing only the amount."""
+
+    __slots__ = ("market_id", "side", "source", "_submit")
+
+    def __init__(self, market_id, side, source, submit):
+        self.market_id = market_id
+        self.side = side
+        self.source = source
+        self._submit = submit
+
+    def submit(self, amount):
+        return self._submit(self.market_id, self.side, amount)
+
+
+class PreparedMarket:
+    """Pre-warm state for one market slug."""
+
+    __slots__ = ("slug", "market_id", "details", "templates", "prepared_at", "closed", "error")
+
+    def __init__(self, slug):
+        self.slug = slug
+        self.market_id = None
+        self.details = None
+        self.templates = {}
+        self.prepared_at = None
+        self.closed = None  # closed_reason() of the details, if not open
+        self.error = None
+
+    @property
+    def ready(self):
+        return bool(self.templates)
+
+
+class OrderPrewarmer:
+    """Prepares order templates for selected markets in the background.
+
+    resolve_market_id: callable(market) -> market_id or None.
+    fetch_details: callable(market_id) -> details dict or None.
+    submit_order: callable(market_id, side, amount) -> trade result dict.
+    submit_pool: executor used for background preparation.
+    """
+
+    def __init__(self, resolve_market_id, fetch_details, submit_order, source, submit_pool):
+        self.resolve_market_id = resolve_market_id
+        self.fetch_details = fetch_details
+        self.submit_order = submit_order
+        self.source = source
+        self.pool = submit_pool
+        self._lock = threading.Lock()
+        self._prepared = {}  # slug -> PreparedMarket
+        self._pending = {}  # slug -> Future
+
+        self.signal_to_submit = LatencyHistogram("signal_to_submit")
+        self.submit_to_ack = LatencyHistogram("submit_to_ack")
+        self.last_signal_to_submit = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.closed = 0
+
+    def prewarm(self, market):
+        """Start preparing templates for market (no-op if already done or in flight)."""
+        slug = market["slug"]
+        with self._lock:
+            prepared = self._prepared.get(slug)
+            if (prepared and prepared.ready) or slug in self._pending:
+                return
+            self._pending[slug] = self.pool.submit(self._prepare, market)
+
+    def _prepare(self, market):
+        slug = market["slug"]
+        prepared = PreparedMarket(slug)
+        try:
+            market_id = self.resolve_market_id(market)
+            if market_id:
+                prepared.market_id = market_id
+                prepared.details = self.fetch_details(market_id)
+                prepared.closed = closed_reason(prepared.details)
+                if not prepared.closed:
+                    prepared.templates = {
+                        side: OrderTemplate(market_id, side, self.source, self.submit_order)
+                        for side in ("yes", "no")
+                    }
+                prepared.prepared_at = time.time()
+        except Exception as e:
+            prepared.error = str(e)
+        with self._lock:
+            self._prepared[slug] = prepared
+            self._pending.pop(slug, None)
+        return prepared
+
+    def get(self, slug, wait=0.0):
+        """Prepared market for slug, waiting up to `wait` seconds for an in-flight prep."""
+        with self._lock:
+            prepared = self._prepared.get(slug)
+            pending = self._pending.get(slug)
+        if prepared is None and pending is not None and wait > 0:
+            try:
+                prepared = pending.result(timeout=wait)
+            except Exception:
+                prepared = None
+        if prepared and prepared.ready:
+            self.hits += 1
+            return prepared
+        self.misses += 1
+        return None
+
+    def closed_reason(self, slug):
+        """Why the last prep found slug's market closed, or None."""
+        prepared = self._prepared.get(slug)
+        if prepared is None or not prepared.closed:
+            return None
+        self.closed += 1
+        return prepared.closed
+
+    def adopt(self, slug, market_id):
+        """Register a market_id resolved on the trade path so later signals reuse it."""
+        prepared = PreparedMarket(slug)
+        prepared.market_id = market_id
+        prepared.templates = {
+            side: OrderTemplate(market_id, side, self.source, self.submit_order)
+            for side in ("yes", "no")
+        }
+        prepared.prepared_at = time.time()
+        with self._lock:
+            self._prepared[slug] = prepared
+        return prepared
+
+    def submit(self, template, amount, signal_at):
+        """Submit a template, recording signal→submit and submit→ack latency.
+
+        signal_at: time.perf_counter() value taken when the signal fired.
+        """
+        submit_at = time.perf_counter()
+        self.last_signal_to_submit = submit_at - signal_at
+        self.signal_to_submit.record(self.last_signal_to_submit)
+        result = template.submit(amount)
+        self.submit_to_ack.record(time.perf_counter() - submit_at)
+        return result
+
+    def evict(self, live_slugs):
+        """Forget prepared markets that are no longer live."""
+        live = set(live_slugs)
+        with self._lock:
+            for slug in [s for s in self._prepared if s not in live]:
+                del self._prepared[slug]
+
+    def stats(self):
+        return {
+            "prepared": len(self._prepared),
+            "hits": self.hits,
+            "misses": self.misses,
+            "closed": self.closed,
+            "signal_to_submit_ms": self.signal_to_submit.summary(scale=1e3),
+            "submit_to_ack_ms": self.submit_to_ack.summary(scale=1e3),
+        }
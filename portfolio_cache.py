@@ -0,0 +1,225 @@
+"""
+Local copy of the Simmer balance and positions.
+
+The cache is seeded from the SDK on first use. After that, every trade we
+make is applied locally: the balance goes down by the cost, and the
+market's shares and exposure go up. A background thread reconciles with the
+SDK every `refresh` seconds, so fills we didn't make (resolutions, manual
+trades) show up within one interval. Reads are dict lookups, so sizing a
+trade never waits on the network.
+
+Usage:
+    cache = PortfolioCache(client.get_portfolio, client.get_positions, refresh=60).start()
+    cache.balance()                # USDC, O(1)
+    cache.exposure(market_id)      # $ in one market, O(1)
+    cache.apply_trade(market_id, "yes", 5.0, 11.9, question)
+    cache.positions(fast_only=True)
+"""
+
+import time
+import threading
+from dataclasses import asdict, is_dataclass
+
+REFRESH_SECS = 60
+
+
+def _is_fast(question):
+    return "up or down" in (question or "").lower()
+
+
+def _position_dict(p):
+    """Shallow dict of an SDK Position (asdict deep-copies every field)."""
+    if isinstance(p, dict):
+        return dict(p)
+    if hasattr(p, "__dict__"):
+        return dict(vars(p))
+    return asdict(p) if is_dataclass(p) else {}
+
+
+class PortfolioCache:
+    """Balance, positions and per-market exposure, kept current from our own trades.
+
+    fetch_portfolio: callable() -> {"balance_usdc": ...} (get_portfolio)
+    fetch_positions: callable() -> [Position or dict] (get_positions)
+    refresh: seconds between background reconciles with the SDK.
+    """
+
+    def __init__(self, fetch_portfolio, fetch_positions, refresh=REFRESH_SECS):
+        self.fetch_portfolio = fetch_portfolio
+        self.fetch_positions = fetch_positions
+        self.refresh = refresh
+
+        self._lock = threading.Lock()
+        self._portfolio = None  # Last SDK summary, balance kept current locally
+        self._positions = None  # market_id -> position dict
+        self._fast = set()  # market_ids of fast-market positions
+        self._exposure = {}  # market_id -> $
+        self._total_exposure = 0.0
+        self._trade_seq = 0  # Bumped per local trade; a reconcile racing a trade is dropped
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.reconciles = 0
+        self.stale_reconciles = 0
+        self.balance_drift = 0.0  # SDK minus local balance at the last reconcile
+        self.last_reconcile = None
+        self.last_error = None
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+
+    def _load_portfolio(self):
+        data = self.fetch_portfolio()
+        if not isinstance(data, dict) or data.get("error"):
+            self.last_error = (data or {}).get("error") if isinstance(data, dict) else "No response"
+            return None
+        return dict(data)
+
+    def _load_positions(self):
+        positions, fast, exposure = {}, set(), {}
+        for p in self.fetch_positions() or ():
+            pos = _position_dict(p)
+            market_id = pos.get("market_id")
+            if not market_id:
+                continue
+            positions[market_id] = pos
+            if _is_fast(pos.get("question")):
+                fast.add(market_id)
+            cost = pos.get("cost_basis")
+            exposure[market_id] = float(cost if cost is not None else pos.get("current_value") or 0.0)
+        return positions, fast, exposure
+
+    def _ensure_portfolio(self):
+        if self._portfolio is None:
+            portfolio = self._load_portfolio()
+            with self._lock:
+                if self._portfolio is None and portfolio is not None:
+                    self._portfolio = portfolio
+        return self._portfolio
+
+    def _ensure_positions(self):
+        if self._positions is None:
+            try:
+                loaded = self._load_positions()
+            except Exception as e:
+                self.last_error = str(e)
+                return {}
+            with self._lock:
+                if self._positions is None:
+                    self._set_positions(*loaded)
+        return self._positions
+
+    def _set_positions(self, positions, fast, exposure):
+        self._positions, self._fast, self._exposure = positions, fast, exposure
+        self._total_exposure = sum(exposure.values())
+
+    def reconcile(self):
+        """Replace the local state with the SDK's. Returns False if skipped or failed."""
+        seq = self._trade_seq
+        try:
+            portfolio = self._load_portfolio()
+            positions = self._load_positions()
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+        if portfolio is None:
+            return False
+        with self._lock:
+            if seq != self._trade_seq:
+                # A trade landed mid-fetch; the SDK may or may not include it yet
+                self.stale_reconciles += 1
+                return False
+            if self._portfolio is not None:
+                self.balance_drift = portfolio.get("balance_usdc", 0) - self._portfolio.get(
+                    "balance_usdc", 0
+                )
+            self._portfolio = portfolio
+            self._set_positions(*positions)
+        self.reconciles += 1
+        self.last_reconcile = time.time()
+        return True
+
+    # -------------------------------------------------------------------------
+    # Background reconcile
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="portfolio-cache", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.wait(self.refresh):
+            self.reconcile()
+
+    # -------------------------------------------------------------------------
+    # Updates and queries
+    # -------------------------------------------------------------------------
+
+    def apply_trade(self, market_id, side, cost, shares, question=None):
+        """Apply one of our fills: balance down by cost, shares and exposure up."""
+        with self._lock:
+            self._trade_seq += 1
+            if self._portfolio is not None:
+                self._portfolio["balance_usdc"] = self._portfolio.get("balance_usdc", 0) - cost
+            if self._positions is not None:
+                pos = self._positions.get(market_id)
+                if pos is None:
+                    pos = self._positions[market_id] = {
+                        "market_id": market_id,
+                        "question": question,
+                        "shares_yes": 0.0,
+                        "shares_no": 0.0,
+                        "pnl": 0.0,
+                    }
+                    if _is_fast(question):
+                        self._fast.add(market_id)
+                key = f"shares_{side}"
+                pos[key] = (pos.get(key) or 0.0) + shares
+                self._exposure[market_id] = self._exposure.get(market_id, 0.0) + cost
+                self._total_exposure += cost
+
+    def snapshot(self):
+        """Portfolio summary in get_portfolio()'s shape (seeds on first use)."""
+        portfolio = self._ensure_portfolio()
+        if portfolio is None:
+            return {"error": self.last_error or "Portfolio unavailable"}
+        with self._lock:
+            return dict(portfolio)
+
+    def balance(self):
+        portfolio = self._ensure_portfolio()
+        return portfolio.get("balance_usdc", 0.0) if portfolio else None
+
+    def exposure(self, market_id=None):
+        """$ held in market_id, or across all positions when None."""
+        self._ensure_positions()
+        if market_id is None:
+            return self._total_exposure
+        return self._exposure.get(market_id, 0.0)
+
+    def positions(self, fast_only=False):
+        """Position dicts (copies); fast_only keeps "Up or Down" markets."""
+        positions = self._ensure_positions()
+        with self._lock:
+            return [dict(p) for m, p in positions.items() if not fast_only or m in self._fast]
+
+    def status(self):
+        return {
+            "seeded": self._portfolio is not None,
+            "positions": len(self._positions or ()),
+            "exposure": round(self._total_exposure, 2),
+            "reconciles": self.reconciles,
+            "stale_reconciles": self.stale_reconciles,
+            "balance_drift": round(self.balance_drift, 4),
+            "last_error": self.last_error,
+        }
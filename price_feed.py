@@ -0,0 +1,364 @@
+"""
+Streaming Binance price feed.
+
+Keeps a long-lived WebSocket subscription to 1m klines and aggTrades for a
+set of symbols, maintains a rolling in-memory candle window per symbol and
+serves momentum from memory. Reconnects with exponential backoff and
+re-seeds the window from REST after every (re)connect so gaps are filled.
+
+Usage:
+    feed = BinancePriceFeed(["BTCUSDT", "ETHUSDT"], seed=fetch_klines).start()
+    feed.momentum("BTCUSDT", lookback_minutes=5)
+
+    # Against a local stand-in (see ws_client.ReplayServer)
+    feed = BinancePriceFeed(["BTCUSDT"], url="ws://127.0.0.1:8765").start()
+"""
+
+import json
+import time
+import random
+import threading
+from collections import deque
+
+from ws_client import connect, WebSocketClosed
+from indicators import RollingIndicators
+
+BINANCE_WS_URL = "wss://data-stream.binance.vision"
+
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+STABLE_CONNECTION_SECS = 60  # Reset backoff after staying up this long
+RECV_TIMEOUT = 30  # Binance pushes klines every ~2s; silence means a dead socket
+
+# Candle layout matches the REST kline rows: [open_time, open, high, low, close, volume]
+OPEN_TIME, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+HORIZONS = (1, 5, 15)  # Momentum horizons (minutes) reported with every signal
+
+
+def compute_momentum(candles, price_now=None, horizons=HORIZONS):
+    """Momentum dict over a list of candles (same shape as get_binance_momentum).
+
+    One-shot version for REST rows; the last row is the forming candle.
+    """
+    if len(candles) < 2:
+        return None
+    indicators = RollingIndicators.from_candles(candles)
+    momentum = indicators.momentum(len(candles), price_now)
+    if momentum:
+        momentum["indicators"] = indicators.snapshot(horizons)
+    return momentum
+
+
+class BinancePriceFeed:
+    """Background kline/aggTrade stream with a rolling candle window per symbol.
+
+    seed: optional callable(symbol, limit) -> list of REST kline rows, used to
+          fill the window on (re)connect.
+    record_path: optional JSONL file that receives every raw frame with its
+          arrival offset, in the format ReplayServer replays.
+    on_update: optional callable(symbol, price, event_ms) fired on each update.
+    recorder: optional tick_store.TickRecorder that receives closed candles
+          and trade ticks.
+    horizons: momentum horizons (minutes) included in every momentum() result.
+
+    Each symbol also has a RollingIndicators instance updated on every frame,
+    so momentum and the indicators are served in O(1).
+    """
+
+    def __init__(
+        self,
+        symbols,
+        window_minutes=30,
+        url=BINANCE_WS_URL,
+        trades=True,
+        seed=None,
+        record_path=None,
+        on_update=None,
+        recorder=None,
+        horizons=HORIZONS,
+    ):
+        self.symbols = [s.upper() for s in symbols]
+        self.window_minutes = window_minutes
+        self.url = url
+        self.trades = trades
+        self.seed = seed
+        self.record_path = record_path
+        self.on_update = on_update
+        self.recorder = recorder
+        self.horizons = tuple(horizons)
+
+        self._lock = threading.Lock()
+        self._candles = {s: deque(maxlen=window_minutes) for s in self.symbols}
+        self._indicators = {s: RollingIndicators(window_minutes) for s in self.symbols}
+        self._last_price = {}
+        self._last_update = {}  # symbol -> time.monotonic() of last stream frame
+        self._seeded_at = {}  # symbol -> time.monotonic() of last REST seed (not freshness)
+        self._stop = threading.Event()
+        self._thread = None
+        self._ws = None
+        self._record_file = None
+        self._record_start = None
+
+        self.connected = False
+        self.reconnects = 0
+        self.frames = 0
+        self.callback_errors = 0
+        self.last_error = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def stream_url(self):
+        streams = []
+        for s in self.symbols:
+            streams.append(f"{s.lower()}@kline_1m")
+            if self.trades:
+                streams.append(f"{s.lower()}@aggTrade")
+        return f"{self.url.rstrip('/')}/stream?streams={'/'.join(streams)}"
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        if self.record_path:
+            self._record_file = open(self.record_path, "a")
+            self._record_start = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="binance-price-feed", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        ws = self._ws
+        if ws:
+            ws.close()
+        if self._thread:
+            self._thread.join(timeout)
+        if self._record_file:
+            self._record_file.close()
+            self._record_file = None
+
+    def wait_ready(self, timeout=10):
+        """Block until every symbol has at least two candles, or timeout."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if all(len(self._candles[s]) >= 2 for s in self.symbols):
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def _run(self):
+        delay = RECONNECT_MIN_DELAY
+        while not self._stop.is_set():
+            connected_at = None
+            try:
+                self._seed_all()
+                self._ws = connect(self.stream_url(), timeout=10)
+                self._ws.settimeout(RECV_TIMEOUT)
+                self.connected = True
+                connected_at = time.monotonic()
+                while not self._stop.is_set():
+                    self._handle_message(self._ws.recv())
+            except (WebSocketClosed, OSError) as e:
+                self.last_error = str(e)
+            except Exception as e:  # A bad frame must not end the stream for good
+                self.last_error = f"{type(e).__name__}: {e}"
+            finally:
+                self.connected = False
+                if self._ws:
+                    self._ws.close()
+                    self._ws = None
+            if self._stop.is_set():
+                break
+            if connected_at and time.monotonic() - connected_at > STABLE_CONNECTION_SECS:
+                delay = RECONNECT_MIN_DELAY
+            self.reconnects += 1
+            self._stop.wait(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    def _seed_all(self):
+        if not self.seed:
+            return
+        for symbol in self.symbols:
+            try:
+                rows = self.seed(symbol, self.window_minutes)
+            except Exception:
+                rows = None
+            if not rows or not isinstance(rows, list):
+                continue
+            try:
+                candles = [
+                    [int(r[0]), float(r[1]), float(r[2]), float(r[3]), float(r[4]), float(r[5])]
+                    for r in rows
+                ]
+            except (IndexError, ValueError, TypeError):
+                continue
+            with self._lock:
+                window = self._candles[symbol]
+                known = {c[OPEN_TIME]: c for c in window}
+                known.update({c[OPEN_TIME]: c for c in candles})
+                window.clear()
+                window.extend(known[t] for t in sorted(known)[-self.window_minutes :])
+                self._indicators[symbol] = RollingIndicators.from_candles(
+                    window, self.window_minutes
+                )
+                self._last_price.setdefault(symbol, window[-1][CLOSE])
+                self._seeded_at[symbol] = time.monotonic()
+            if self.recorder:
+                for candle in candles[:-1]:  # Last row is still open
+                    self._callback(self.recorder.candle, symbol, candle)
+
+    # -------------------------------------------------------------------------
+    # Frame handling
+    # -------------------------------------------------------------------------
+
+    def _handle_message(self, raw):
+        self.frames += 1
+        if self._record_file:
+            offset = round(time.monotonic() - self._record_start, 4)
+            self._record_file.write(json.dumps({"t": offset, "data": raw}) + "\n")
+        try:
+            msg = json.loads(raw)
+        except (TypeError, ValueError):
+            return
+        data = msg.get("data", msg) if isinstance(msg, dict) else None
+        if not isinstance(data, dict):
+            return
+        event = data.get("e")
+        if event == "kline":
+            self._apply_kline(data)
+        elif event == "aggTrade":
+            self._apply_trade(data)
+
+    def _apply_kline(self, data):
+        k = data.get("k") or {}
+        symbol = (k.get("s") or data.get("s") or "").upper()
+        if symbol not in self._candles:
+            return
+        try:
+            candle = [
+                int(k["t"]),
+                float(k["o"]),
+                float(k["h"]),
+                float(k["l"]),
+                float(k["c"]),
+                float(k["v"]),
+            ]
+        except (KeyError, ValueError, TypeError):
+            return
+        with self._lock:
+            window = self._candles[symbol]
+            if window and window[-1][OPEN_TIME] == candle[OPEN_TIME]:
+                window[-1] = candle
+            elif not window or window[-1][OPEN_TIME] < candle[OPEN_TIME]:
+                window.append(candle)
+            else:
+                return  # Stale frame for an older candle
+            self._indicators[symbol].update(*candle)
+            self._last_price[symbol] = candle[CLOSE]
+            self._last_update[symbol] = time.monotonic()
+        if self.recorder and k.get("x"):
+            self._callback(self.recorder.candle, symbol, candle)
+        if self.on_update:
+            self._callback(self.on_update, symbol, candle[CLOSE], data.get("E"))
+
+    def _apply_trade(self, data):
+        symbol = (data.get("s") or "").upper()
+        if symbol not in self._candles:
+            return
+        try:
+            price = float(data["p"])
+            trade_ms = int(data["T"])
+        except (KeyError, ValueError, TypeError):
+            return
+        with self._lock:
+            window = self._candles[symbol]
+            if window and trade_ms >= window[-1][OPEN_TIME]:
+                candle = window[-1]
+                if trade_ms < candle[OPEN_TIME] + 60_000:
+                    candle[CLOSE] = price
+                    candle[HIGH] = max(candle[HIGH], price)
+                    candle[LOW] = min(candle[LOW], price)
+                    self._indicators[symbol].tick(trade_ms, price)
+            self._last_price[symbol] = price
+            self._last_update[symbol] = time.monotonic()
+        if self.recorder:
+            self._callback(self.recorder.trade, symbol, trade_ms, price, data.get("q") or 0, data.get("m"))
+        if self.on_update:
+            self._callback(self.on_update, symbol, price, data.get("E"))
+
+    def _callback(self, fn, *args):
+        """Call on_update/recorder; their errors are counted, not raised into the stream."""
+        try:
+            fn(*args)
+        except Exception as e:
+            self.callback_errors += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+
+    # -------------------------------------------------------------------------
+    # Queries (no network)
+    # -------------------------------------------------------------------------
+
+    def age(self, symbol):
+        """Seconds since the last stream frame for symbol (inf if none yet).
+
+        A REST seed does not count: until the stream delivers, callers see the
+        feed as stale and fall back to REST.
+        """
+        updated = self._last_update.get(symbol.upper())
+        return time.monotonic() - updated if updated else float("inf")
+
+    def is_fresh(self, symbol, max_age=10):
+        return self.age(symbol) <= max_age
+
+    def last_price(self, symbol):
+        return self._last_price.get(symbol.upper())
+
+    def candles(self, symbol, limit=None):
+        with self._lock:
+            window = list(self._candles.get(symbol.upper(), ()))
+        return [list(c) for c in (window[-limit:] if limit else window)]
+
+    def momentum(self, symbol, lookback_minutes=5):
+        """Momentum over the last lookback_minutes candles plus indicators, from memory."""
+        symbol = symbol.upper()
+        with self._lock:
+            indicators = self._indicators.get(symbol)
+            if indicators is None:
+                return None
+            momentum = indicators.momentum(lookback_minutes, self._last_price.get(symbol))
+            if momentum:
+                momentum["indicators"] = indicators.snapshot(self.horizons)
+            return momentum
+
+    def open_at(self, symbol, open_time):
+        """Open price of symbol's 1m candle that opened at open_time (ms), from memory."""
+        symbol = symbol.upper()
+        with self._lock:
+            indicators = self._indicators.get(symbol)
+            return indicators.open_at(open_time) if indicators is not None else None
+
+    def indicators(self, symbol):
+        """Rolling indicators for symbol (see indicators.RollingIndicators.snapshot)."""
+        symbol = symbol.upper()
+        with self._lock:
+            indicators = self._indicators.get(symbol)
+            return indicators.snapshot(self.horizons) if indicators is not None else None
+
+    def status(self):
+        return {
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "frames": self.frames,
+            "callback_errors": self.callback_errors,
+            "last_error": self.last_error,
+            "age_secs": {s: round(self.age(s), 3) for s in self.symbols},
+            "seeded_secs_ago": {
+                s: round(time.monotonic() - t, 3) for s, t in list(self._seeded_at.items())
+            },
+        }
@@ -0,0 +1,257 @@
+"""
+Per-host rate limiting and circuit breaking for the external APIs.
+
+Every request to Gamma, Binance or CoinGecko passes through one HostLimiter
+per host, shared by all threads:
+
+- Pacing: a token bucket (rps, burst). A caller that would exceed it waits
+  for its turn, up to max_wait. Callers queue up behind each other instead
+  of bursting into a 429.
+- Weight: Binance reports the IP's request weight used in the current
+  minute (X-MBX-USED-WEIGHT-1M). Local estimates fill the gap between
+  responses. Near the limit, requests wait for the next minute. The header
+  counts every process on the IP, so workers started side by side see each
+  other's usage.
+- Retry-After: a 429/418/503 blocks the host for the time the server asks
+  for. A 429 without the header gets exponential backoff.
+- Circuit: `failures` consecutive errors (connection, 5xx, 429) open the
+  circuit for `cooldown` seconds. Requests are refused at once, and callers
+  fall back to the last good response for the same URL (fallback()). After
+  the cooldown, one probe is let through. Success closes the circuit and a
+  failure opens it again. A probe that never reports back is given up on
+  after PROBE_TIMEOUT.
+
+Usage:
+    limiter = RateLimiter(failures=5, cooldown=30)
+    refused = limiter.acquire(url)        # None = go ahead, else why not
+    status, headers, body = pool.request("GET", url)
+    limiter.record(url, status, headers)  # status None on a connection error
+    limiter.remember(url, body)           # and limiter.fallback(url, max_age) when refused
+    limiter.stats()                       # {host: {state, tokens, used_weight, ...}}
+"""
+
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# host -> pacing and weight limits. Binance's weight limit is per IP per minute.
+DEFAULT_LIMITS = {
+    "gamma-api.polymarket.com": {"rps": 20.0, "burst": 40},
+    "data-api.binance.vision": {"rps": 20.0, "burst": 40, "weight_limit": 6000},
+    "api.binance.com": {"rps": 20.0, "burst": 40, "weight_limit": 6000},
+    "api.coingecko.com": {"rps": 0.5, "burst": 5},  # Free tier: ~30 calls/min
+}
+HOST_DEFAULT = {"rps": 10.0, "burst": 20}
+# Binance request weights by path (anything else weighs 1)
+WEIGHTS = {"/api/v3/klines": 2, "/api/v3/ticker/price": 2, "/api/v3/depth": 5}
+WEIGHT_HEADER = "x-mbx-used-weight-1m"
+WEIGHT_HEADROOM = 0.9  # Stop at 90% of the weight limit; other clients share the IP
+MAX_WAIT = 1.0  # Longest a caller waits for pacing before it is refused
+MAX_BACKOFF = 60.0
+PROBE_TIMEOUT = 30.0  # A probe not recorded by then is given up on (longer than any request timeout)
+MAX_REMEMBERED = 256  # URLs whose last good response is kept for fallback
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+def _retry_after(value):
+    """Retry-After header (seconds or HTTP date) → seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostLimiter:
+    """Token bucket, weight budget, Retry-After block and circuit for one host."""
+
+    def __init__(self, host, rps, burst, weight_limit=0, failures=5, cooldown=30.0, pacing=True):
+        self.host = host
+        self.rps = rps
+        self.burst = burst
+        self.weight_limit = weight_limit
+        self.failures = failures  # 0 = the circuit never opens
+        self.cooldown = cooldown
+        self.pacing = pacing
+
+        self._lock = threading.Lock()
+        self.tokens = float(burst)
+        self._refilled = time.monotonic()
+        self.used_weight = 0
+        self._weight_minute = int(time.time() // 60)
+        self.blocked_until = 0.0  # monotonic; set from Retry-After / backoff
+        self._backoff = 0
+        self.state = CLOSED
+        self._consecutive = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._probe_expires = 0.0
+
+        self.requests = 0
+        self.waited = 0
+        self.wait_secs = 0.0
+        self.refused = {}  # reason -> count
+        self.opens = 0
+        self.retry_afters = 0
+
+    def _refuse(self, reason):
+        self.refused[reason] = self.refused.get(reason, 0) + 1
+        return reason
+
+    def acquire(self, weight=1, max_wait=MAX_WAIT):
+        """Wait for a slot. Returns None to go ahead, else the refusal reason."""
+        with self._lock:
+            now = time.monotonic()
+            probe = False
+            if self.state != CLOSED:
+                if self._probing and now >= self._probe_expires:
+                    self._probing = False  # The probe never reported back
+                if now < self._open_until or self._probing:
+                    return self._refuse("circuit_open")
+                self.state, probe = HALF_OPEN, True
+            wait = self.blocked_until - now
+            if wait > max_wait:
+                return self._refuse("retry_after")
+            if self.pacing:
+                minute = int(time.time() // 60)
+                if minute != self._weight_minute:
+                    self._weight_minute, self.used_weight = minute, 0
+                if self.weight_limit and self.used_weight + weight > self.weight_limit * WEIGHT_HEADROOM:
+                    wait = max(wait, (minute + 1) * 60 - time.time())
+                    if wait > max_wait:
+                        return self._refuse("weight")
+                self.tokens = min(self.burst, self.tokens + (now - self._refilled) * self.rps)
+                self._refilled = now
+                if self.tokens < 1:
+                    wait = max(wait, (1 - self.tokens) / self.rps)
+                    if wait > max_wait:
+                        return self._refuse("rate")
+                self.tokens -= 1  # May go negative: later callers queue behind this one
+                self.used_weight += weight
+            if probe:
+                self._probing, self._probe_expires = True, now + PROBE_TIMEOUT
+            self.requests += 1
+            if wait > 0:
+                self.waited += 1
+                self.wait_secs += wait
+        if wait > 0:
+            time.sleep(wait)
+        return None
+
+    def record(self, status, headers=None):
+        """Outcome of a request: HTTP status, or None for a connection error."""
+        headers = headers or {}
+        with self._lock:
+            now = time.monotonic()
+            self._probing = False
+            used = headers.get(WEIGHT_HEADER)
+            if used and str(used).isdigit():
+                self._weight_minute, self.used_weight = int(time.time() // 60), int(used)
+            if status is not None and status < 500 and status not in (418, 429):
+                self._consecutive = self._backoff = 0
+                self.state = CLOSED
+                return
+            if status in (418, 429, 503):
+                delay = _retry_after(headers.get("retry-after"))
+                if delay is None and status != 503:
+                    delay = min(MAX_BACKOFF, 2.0**self._backoff)
+                    self._backoff += 1
+                if delay is not None:
+                    self.retry_afters += 1
+                    self.blocked_until = max(self.blocked_until, now + delay)
+            self._consecutive += 1
+            if self.state == HALF_OPEN or (self.failures and self._consecutive >= self.failures):
+                if self.state != OPEN:
+                    self.opens += 1
+                self.state = OPEN
+                self._open_until = now + self.cooldown
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            "state": self.state,
+            "tokens": round(min(self.burst, self.tokens + (now - self._refilled) * self.rps), 2),
+            "used_weight": self.used_weight,
+            "weight_limit": self.weight_limit,
+            "blocked_for": round(max(0.0, self.blocked_until - now, self._open_until - now), 2),
+            "consecutive_failures": self._consecutive,
+            "requests": self.requests,
+            "waited": self.waited,
+            "wait_secs": round(self.wait_secs, 3),
+            "refused": dict(self.refused),
+            "opens": self.opens,
+            "retry_afters": self.retry_afters,
+        }
+
+
+class RateLimiter:
+    """HostLimiters keyed by host, plus the last good response per URL.
+
+    limits: per-host overrides merged over DEFAULT_LIMITS, e.g.
+        {"api.coingecko.com": {"rps": 0.2, "burst": 2}}
+    pacing=False keeps Retry-After and the circuit but drops the token
+    bucket and weight budget (replays run faster than real time).
+    """
+
+    def __init__(self, limits=None, failures=5, cooldown=30.0, pacing=True):
+        self.limits = {host: dict(v) for host, v in DEFAULT_LIMITS.items()}
+        for host, overrides in (limits or {}).items():
+            self.limits.setdefault(host, dict(HOST_DEFAULT)).update(overrides)
+        self.failures = failures
+        self.cooldown = cooldown
+        self.pacing = pacing
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._responses = {}  # url -> (monotonic, body bytes)
+
+    def host(self, host):
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            with self._lock:
+                limiter = self._hosts.get(host)
+                if limiter is None:
+                    spec = self.limits.get(host, HOST_DEFAULT)
+                    limiter = HostLimiter(
+                        host,
+                        float(spec.get("rps", HOST_DEFAULT["rps"])),
+                        int(spec.get("burst", HOST_DEFAULT["burst"])),
+                        int(spec.get("weight_limit", 0)),
+                        self.failures,
+                        self.cooldown,
+                        self.pacing,
+                    )
+                    self._hosts[host] = limiter
+        return limiter
+
+    def acquire(self, url, max_wait=MAX_WAIT):
+        parts = urlsplit(url)
+        return self.host(parts.hostname).acquire(WEIGHTS.get(parts.path, 1), max_wait)
+
+    def record(self, url, status, headers=None):
+        self.host(urlsplit(url).hostname).record(status, headers)
+
+    def remember(self, url, body):
+        """Keep a successful GET response body for fallback()."""
+        with self._lock:
+            self._responses.pop(url, None)
+            if len(self._responses) >= MAX_REMEMBERED:
+                del self._responses[next(iter(self._responses))]
+            self._responses[url] = (time.monotonic(), body)
+
+    def fallback(self, url, max_age):
+        """Last good response body for url if younger than max_age seconds, else None."""
+        entry = self._responses.get(url)
+        if entry is None or time.monotonic() - entry[0] > max_age:
+            return None
+        return entry[1]
+
+    def stats(self):
+        """{host: HostLimiter.stats()}"""
+        return {host: limiter.stats() for host, limiter in list(self._hosts.items())}
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Record-and-replay harness for the strategy cycle.
+
+Recording wraps the shared HTTP pool (Gamma, Binance, CoinGecko) and the
+Simmer client so every request/response pair is appended to a JSONL session
+file with its latency:
+
+    python fastloop_trades.py --record session.jsonl
+
+Replay injects stand-ins in their place: a transport that serves the
+recorded HTTP responses and a FakeSimmerClient that answers with the
+recorded SDK results. Calls can be delayed by their original latency,
+scaled by a speed factor (speed=0 serves instantly), which makes cycles
+deterministic and offline:
+
+    python replay.py session.jsonl --cycles 1000            # as fast as possible
+    python replay.py session.jsonl --cycles 20 --speed 1    # original latency
+    python replay.py session.jsonl --cycles 20 --speed 10   # 10x faster
+
+Recorded Gamma markets are shifted forward in whole 15-minute steps so the
+recorded windows are live again at replay time. Replays are always dry runs.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+import dataclasses
+from datetime import datetime, timedelta, timezone
+
+SIMMER_METHODS = ("import_market", "get_market_by_id", "get_portfolio", "get_positions", "trade")
+GAMMA_HOST = "gamma-api.polymarket.com"
+SHIFT_STEP = 900  # Shift in whole 15m windows so 5m/15m alignment is kept
+_QUESTION_TIME = re.compile(
+    r"(\w+ \d+), (\d{1,2}:\d{2}(?:AM|PM))-(\d{1,2}:\d{2}(?:AM|PM)) ET"
+)
+_GAMMA_TIME_FIELDS = ("endDate", "startDate", "createdAt", "updatedAt", "eventStartTime")
+
+
+# =============================================================================
+# Serialization
+# =============================================================================
+
+
+def _serialize(value):
+    """SDK results (dataclasses, objects) → JSON-safe structures."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {"__type__": type(value).__name__, "fields": _serialize(dataclasses.asdict(value))}
+    if isinstance(value, dict):
+        return {k: _serialize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_serialize(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "__dict__"):
+        fields = {k: v for k, v in vars(value).items() if not k.startswith("_")}
+        return {"__type__": type(value).__name__, "fields": _serialize(fields)}
+    return str(value)
+
+
+_record_types = {}
+
+
+def _deserialize(value):
+    """Inverse of _serialize: typed records come back as dataclass instances."""
+    if isinstance(value, dict):
+        if "__type__" in value and "fields" in value:
+            fields = {k: _deserialize(v) for k, v in value["fields"].items()}
+            key = (value["__type__"], tuple(fields))
+            cls = _record_types.get(key)
+            if cls is None:
+                cls = dataclasses.make_dataclass(value["__type__"], list(fields))
+                _record_types[key] = cls
+            return cls(**fields)
+        return {k: _deserialize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_deserialize(v) for v in value]
+    return value
+
+
+def _call_key(args, kwargs):
+    return json.dumps([_serialize(list(args)), _serialize(kwargs)], sort_keys=True)
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+
+class SessionWriter:
+    """Thread-safe JSONL writer; every entry gets its offset from session start."""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+        self._start = time.monotonic()
+        self.write({"kind": "session", "started_at": time.time()})
+
+    def write(self, entry):
+        entry["t"] = round(time.monotonic() - self._start, 6)
+        line = json.dumps(entry)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RecordingPool:
+    """Wraps an HTTPPool and records every request with its response."""
+
+    def __init__(self, pool, writer):
+        self._pool = pool
+        self._writer = writer
+
+    def request(self, method, url, body=None, headers=None, timeout=15):
+        start = time.perf_counter()
+        try:
+            status, resp_headers, raw = self._pool.request(
+                method, url, body=body, headers=headers, timeout=timeout
+            )
+        except Exception as e:
+            self._writer.write(
+                {
+                    "kind": "http",
+                    "method": method,
+                    "url": url,
+                    "error": str(e),
+                    "elapsed": time.perf_counter() - start,
+                }
+            )
+            raise
+        self._writer.write(
+            {
+                "kind": "http",
+                "method": method,
+                "url": url,
+                "status": status,
+                "body": raw.decode("utf-8", "replace"),
+                "elapsed": time.perf_counter() - start,
+            }
+        )
+        return status, resp_headers, raw
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+
+class RecordingClient:
+    """Wraps a SimmerClient and records the SDK calls the strategy makes."""
+
+    def __init__(self, client, writer):
+        self._client = client
+        self._writer = writer
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name not in SIMMER_METHODS:
+            return attr
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            entry = {"kind": "simmer", "call": name, "key": _call_key(args, kwargs)}
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                entry.update(error=str(e), elapsed=time.perf_counter() - start)
+                self._writer.write(entry)
+                raise
+            entry.update(result=_serialize(result), elapsed=time.perf_counter() - start)
+            self._writer.write(entry)
+            return result
+
+        return call
+
+
+def start_recording(path):
+    """Record every external call the strategy makes from now on to path."""
+    import fastloop_trades as ft
+
+    writer = SessionWriter(path)
+    ft._http_pool = RecordingPool(ft.get_http_pool(), writer)
+    ft._client = RecordingClient(ft.get_client(), writer)
+    return writer
+
+
+# =============================================================================
+# Replay
+# =============================================================================
+
+
+def _shift_iso(value, delta):
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    shifted = dt + timedelta(seconds=delta)
+    if str(value).endswith("Z"):
+        return shifted.strftime("%Y-%m-%dT%H:%M:%S") + "Z"
+    return shifted.isoformat()
+
+
+def _shift_question(question, delta):
+    """Move 'February 15, 5:30AM-5:35AM ET' forward by delta seconds."""
+    match = _QUESTION_TIME.search(question)
+    if not match:
+        return question
+    year = datetime.now(timezone.utc).year
+    day, start, end = match.groups()
+    try:
+        start_dt = datetime.strptime(f"{day} {year} {start}", "%B %d %Y %I:%M%p")
+        end_dt = datetime.strptime(f"{day} {year} {end}", "%B %d %Y %I:%M%p")
+    except ValueError:
+        return question
+    start_dt += timedelta(seconds=delta)
+    end_dt += timedelta(seconds=delta)
+    fmt = lambda dt: dt.strftime("%I:%M%p").lstrip("0")
+    text = f"{start_dt.strftime('%B')} {start_dt.day}, {fmt(start_dt)}-{fmt(end_dt)} ET"
+    return question[: match.start()] + text + question[match.end() :]
+
+
+def _shift_gamma(body, delta):
+    """Shift market times in a Gamma response body by delta seconds."""
+    try:
+        records = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(records, list):
+        return body
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for field in _GAMMA_TIME_FIELDS:
+            if record.get(field):
+                record[field] = _shift_iso(record[field], delta)
+        if record.get("question"):
+            record["question"] = _shift_question(record["question"], delta)
+    return json.dumps(records)
+
+
+class Session:
+    """A recorded session, indexed for replay."""
+
+    def __init__(self, path):
+        self.started_at = None
+        self.http = {}  # (method, url) -> [entry]
+        self.simmer = {}  # (call, key) -> [entry]
+        self.entries = 0
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                kind = entry.get("kind")
+                if kind == "session":
+                    self.started_at = self.started_at or entry["started_at"]
+                elif kind == "http":
+                    self.http.setdefault((entry["method"], entry["url"]), []).append(entry)
+                elif kind == "simmer":
+                    self.simmer.setdefault((entry["call"], entry["key"]), []).append(entry)
+                self.entries += 1
+
+    def time_shift(self, now=None):
+        """Seconds to add to recorded market times so they are live at `now`."""
+        if not self.started_at:
+            return 0
+        now = time.time() if now is None else now
+        steps = max(0, -(-(now - self.started_at) // SHIFT_STEP))
+        return int(steps * SHIFT_STEP)
+
+
+class _Cursor:
+    """Round-robin over the recorded responses for one request key."""
+
+    __slots__ = ("entries", "i")
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.i = 0
+
+    def next(self):
+        entry = self.entries[self.i % len(self.entries)]
+        self.i += 1
+        return entry
+
+
+class ReplayPool:
+    """Stand-in for HTTPPool that serves recorded responses.
+
+    speed: latency scale; 1 reproduces the recorded latency, 10 is 10x
+           faster, 0 serves immediately.
+    """
+
+    def __init__(self, session, speed=0.0, shift=True):
+        self.speed = speed
+        delta = session.time_shift() if shift else 0
+        self._cursors = {}
+        for key, entries in session.http.items():
+            prepared = []
+            for e in entries:
+                body = e.get("body", "")
+                if delta and GAMMA_HOST in e["url"]:
+                    body = _shift_gamma(body, delta)
+                prepared.append(
+                    {
+                        "status": e.get("status"),
+                        "error": e.get("error"),
+                        "body": body.encode("utf-8"),
+                        "elapsed": e.get("elapsed", 0.0),
+                    }
+                )
+            self._cursors[key] = _Cursor(prepared)
+        self.served = 0
+        self.unmatched = 0
+
+    def request(self, method, url, body=None, headers=None, timeout=15):
+        cursor = self._cursors.get((method, url))
+        if cursor is None:
+            self.unmatched += 1
+            return 404, {}, b'{"detail": "Not in recording"}'
+        entry = cursor.next()
+        if self.speed > 0 and entry["elapsed"]:
+            time.sleep(entry["elapsed"] / self.speed)
+        self.served += 1
+        if entry["error"]:
+            raise OSError(entry["error"])
+        return entry["status"], {}, entry["body"]
+
+    def stats(self):
+        return {"_replay": {"served": self.served, "unmatched": self.unmatched}}
+
+    def evict_idle(self):
+        return 0
+
+    def close(self):
+        pass
+
+
+@dataclasses.dataclass
+class FakeTradeResult:
+    success: bool = True
+    trade_id: str = ""
+    shares_bought: float = 0.0
+    error: str = None
+
+
+class FakeSimmerClient:
+    """Stand-in SimmerClient answering from a recorded session.
+
+    Calls that were not recorded get deterministic defaults: imports succeed
+    with a synthetic market ID, trades fill at $0.50, and the portfolio holds
+    $1000.
+    """
+
+    def __init__(self, session, speed=0.0):
+        self.speed = speed
+        self._cursors = {key: _Cursor(entries) for key, entries in session.simmer.items()}
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.trades = 0
+
+    def _recorded(self, name, args, kwargs):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            cursor = self._cursors.get((name, _call_key(args, kwargs)))
+            entry = cursor.next() if cursor else None
+        if entry is None:
+            return False, None
+        if self.speed > 0 and entry.get("elapsed"):
+            time.sleep(entry["elapsed"] / self.speed)
+        if entry.get("error"):
+            raise Exception(entry["error"])
+        return True, _deserialize(entry.get("result"))
+
+    def import_market(self, url, *args, **kwargs):
+        found, result = self._recorded("import_market", (url, *args), kwargs)
+        if found:
+            return result
+        slug = url.rstrip("/").rsplit("/", 1)[-1]
+        return {"status": "already_exists", "market_id": f"replay-{slug}"}
+
+    def get_market_by_id(self, market_id, *args, **kwargs):
+        found, result = self._recorded("get_market_by_id", (market_id, *args), kwargs)
+        return result if found else None
+
+    def get_portfolio(self, *args, **kwargs):
+        found, result = self._recorded("get_portfolio", args, kwargs)
+        return result if found else {"balance_usdc": 1000.0}
+
+    def get_positions(self, *args, **kwargs):
+        found, result = self._recorded("get_positions", args, kwargs)
+        return result if found else []
+
+    def trade(self, *args, **kwargs):
+        # Amounts differ between runs, so trades always get the synthetic fill
+        with self._lock:
+            self.calls["trade"] = self.calls.get("trade", 0) + 1
+            self.trades += 1
+            trade_id = f"replay-{self.trades}"
+        amount = kwargs.get("amount", args[2] if len(args) > 2 else 0)
+        return FakeTradeResult(True, trade_id, amount / 0.5, None)
+
+
+def install(session, speed=0.0, shift=True, events_path=None):
+    """Point fastloop_trades at the replay stand-ins. Returns (pool, client).
+
+    Decision events go to events_path, or nowhere when it is None.
+    """
+    import fastloop_trades as ft
+    import market_parser
+    from import_cache import ImportCache
+    from spend_log import SpendLog
+    from rate_limit import RateLimiter
+
+    ft.stop_price_feed()
+    ft.stop_signal_hub()
+    ft.stop_book_feed()
+    ft.stop_portfolio_cache()
+    pool = ReplayPool(session, speed, shift)
+    client = FakeSimmerClient(session, speed)
+    ft._http_pool = pool
+    ft._client = client
+    ft._import_cache = ImportCache(None)  # In memory: don't touch import_cache.json
+    ft._spend_log = SpendLog(None)  # In memory: don't touch daily_spend.json
+    ft._portfolio_cache = None  # Re-seeded from the recorded Simmer responses
+    # Recorded failures still trip the circuit; pacing would only slow the replay
+    ft._rate_limiter = RateLimiter(failures=ft.API_CIRCUIT_FAILURES, cooldown=ft.API_CIRCUIT_COOLDOWN, pacing=False)
+    market_parser.clear_cache()  # Parsed end times depend on this session's shift
+    ft._recorder = None
+    ft._recorder_checked = True
+    ft._event_log = None
+    ft.EVENT_LOG = os.path.abspath(events_path) if events_path else ""
+    return pool, client
+
+
+def benchmark(cycles, smart_sizing=False, quiet=True, progress_every=0):
+    """Run strategy cycles back to back. Returns a LatencyHistogram of cycle times."""
+    import io
+    import contextlib
+
+    import fastloop_trades as ft
+    from metrics import LatencyHistogram
+
+    hist = LatencyHistogram("replay_cycle")
+    sink = io.StringIO()
+    for i in range(cycles):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sink if quiet else sys.stdout):
+            ft.run_fast_market_strategy(dry_run=True, smart_sizing=smart_sizing, quiet=quiet)
+        hist.record(time.perf_counter() - start)
+        sink.seek(0)
+        sink.truncate()
+        if progress_every and (i + 1) % progress_every == 0:
+            print(f"  {i + 1:,} cycles")
+    return hist
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded FastLoop session")
+    parser.add_argument("session", help="Session file written with --record")
+    parser.add_argument("--cycles", type=int, default=100)
+    parser.add_argument("--speed", type=float, default=0.0, help="Latency scale (0 = instant)")
+    parser.add_argument("--no-shift", action="store_true", help="Keep recorded market times")
+    parser.add_argument("--smart-sizing", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="Print every cycle's output")
+    parser.add_argument("--events", metavar="FILE", help="Write decision events to FILE")
+    args = parser.parse_args()
+
+    session = Session(args.session)
+    pool, client = install(session, args.speed, not args.no_shift, args.events)
+    print("⚡ FastLoop Replay")
+    print("=" * 50)
+    print(f"  Session: {args.session} ({session.entries} entries)")
+    print(f"  Speed: {'instant' if args.speed <= 0 else f'{args.speed:g}x'}")
+
+    start = time.perf_counter()
+    hist = benchmark(args.cycles, args.smart_sizing, quiet=not args.verbose)
+    elapsed = time.perf_counter() - start
+    s = hist.summary(scale=1e3)
+    print(f"\n  {args.cycles:,} cycles in {elapsed:.2f}s ({args.cycles / elapsed:,.0f} cycles/s)")
+    print(f"  Cycle: p50 {s['p50']:.2f}ms | p99 {s['p99']:.2f}ms | max {s['max']:.2f}ms")
+    print(f"  HTTP served {pool.served:,}, unmatched {pool.unmatched:,}")
+    print(f"  Simmer calls: {json.dumps(client.calls)}")
@@ -0,0 +1,172 @@
+"""
+Window-aligned evaluation scheduler.
+
+Replaces the fixed 60-second sleep: wakes the strategy at configured offsets
+(seconds after each window opens) for every known fast market window, and
+immediately when the price signal moves enough since the last evaluation.
+Fast market windows are clock-aligned, so upcoming windows are scheduled even
+before discovery has seen them.
+
+Wake-up jitter (actual wake time minus scheduled time) is recorded so we can
+see how close to the intended instant each evaluation actually runs.
+"""
+
+import time
+import threading
+
+from metrics import LatencyHistogram
+
+WINDOW_SECONDS = {"5m": 300, "15m": 900, "1h": 3600}
+
+SPIN_MARGIN = 0.002  # Finish the last couple of ms with short sleeps for precision
+
+
+def parse_offsets(value):
+    """Parse '5,60,120' (or a list) into sorted float offsets."""
+    if isinstance(value, (list, tuple)):
+        items = value
+    else:
+        items = [v for v in str(value).split(",") if v.strip()]
+    return sorted(float(v) for v in items)
+
+
+class WindowScheduler:
+    """Compute and wait for the next evaluation instant.
+
+    window: "5m", "15m" or a list of them when several windows are traded.
+    offsets: seconds after window open at which to evaluate. Offsets that
+             leave less than min_time_remaining before the window ends are
+             dropped (the strategy would skip them anyway).
+    min_interval: minimum spacing between price-triggered evaluations.
+    max_sleep: upper bound on any single wait, so the loop never stalls.
+    """
+
+    def __init__(
+        self,
+        window="5m",
+        offsets=(5, 60, 120, 180, 235),
+        min_time_remaining=60,
+        trigger_move_pct=0.0,
+        min_interval=1.0,
+        max_sleep=60.0,
+    ):
+        windows = [window] if isinstance(window, str) else list(window)
+        self.windows = windows
+        self.window_secs = sorted({WINDOW_SECONDS.get(w, 300) for w in windows})
+        self.offsets = parse_offsets(offsets)
+        self.min_time_remaining = min_time_remaining
+        self.trigger_move_pct = trigger_move_pct
+        self.min_interval = min_interval
+        self.max_sleep = max_sleep
+
+        self._end_times = set()  # (end epoch seconds, window seconds) of known windows
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._trigger_reason = None
+        self._last_eval = 0.0
+        self._eval_price = {}  # symbol -> price at last evaluation
+        self._last_price = {}
+
+        self.jitter = LatencyHistogram("scheduler_wake_jitter")
+        self.wakes = {"schedule": 0, "trigger": 0}
+
+    # -------------------------------------------------------------------------
+    # Inputs
+    # -------------------------------------------------------------------------
+
+    def update_markets(self, markets):
+        """Learn window end times from discovered markets (end_time datetimes)."""
+        now = time.time()
+        default_secs = self.window_secs[0]
+        with self._lock:
+            self._end_times = {w for w in self._end_times if w[0] > now}
+            for m in markets:
+                end_time = m.get("end_time")
+                if end_time:
+                    secs = WINDOW_SECONDS.get(m.get("window"), default_secs)
+                    self._end_times.add((end_time.timestamp(), secs))
+
+    def on_price(self, symbol, price, event_ms=None):
+        """Price feed callback: trigger an evaluation on a large enough move."""
+        self._last_price[symbol] = price
+        if self.trigger_move_pct <= 0:
+            return
+        ref = self._eval_price.get(symbol)
+        if ref is None:
+            self._eval_price[symbol] = price
+            return
+        move_pct = abs(price - ref) / ref * 100 if ref else 0
+        if move_pct >= self.trigger_move_pct:
+            self.trigger(f"{symbol} moved {move_pct:.3f}%")
+
+    def trigger(self, reason="trigger"):
+        self._trigger_reason = reason
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def mark_evaluated(self):
+        """Call after each strategy run to reset the price-trigger reference."""
+        self._last_eval = time.monotonic()
+        self._eval_price.update(self._last_price)
+
+    # -------------------------------------------------------------------------
+    # Scheduling
+    # -------------------------------------------------------------------------
+
+    def _window_ends(self, now):
+        """Known (end, length) windows plus the clock-aligned current and next ones."""
+        with self._lock:
+            ends = {w for w in self._end_times if w[0] > now}
+        for secs in self.window_secs:
+            aligned = (int(now) // secs + 1) * secs
+            ends.add((float(aligned), secs))
+            ends.add((float(aligned + secs), secs))
+        return ends
+
+    def next_wake(self, now=None):
+        """Epoch seconds of the next scheduled evaluation."""
+        now = time.time() if now is None else now
+        best = now + self.max_sleep
+        for end, secs in self._window_ends(now):
+            start = end - secs
+            for offset in self.offsets:
+                at = start + offset
+                if end - at < self.min_time_remaining:
+                    break
+                if now < at < best:
+                    best = at
+        return best
+
+    def wait(self):
+        """Block until the next evaluation. Returns (reason, jitter_seconds)."""
+        while True:
+            if self._stop.is_set():
+                return "stop", 0.0
+            target = self.next_wake()
+            remaining = target - time.time()
+            if remaining > SPIN_MARGIN:
+                self._wake.wait(remaining - SPIN_MARGIN)
+            if self._wake.is_set():
+                self._wake.clear()
+                if self._stop.is_set():
+                    return "stop", 0.0
+                since_last = time.monotonic() - self._last_eval
+                if since_last < self.min_interval:
+                    # Debounce bursts of price triggers
+                    time.sleep(self.min_interval - since_last)
+                self.wakes["trigger"] += 1
+                return self._trigger_reason or "trigger", 0.0
+            while time.time() < target:
+                time.sleep(0)
+            jitter = time.time() - target
+            self.jitter.record(jitter)
+            self.wakes["schedule"] += 1
+            return "schedule", jitter
+
+    def jitter_summary(self):
+        """Wake-up jitter percentiles in milliseconds."""
+        return self.jitter.summary(scale=1e3)
@@ -0,0 +1,384 @@
+"""
+Pluggable price-signal sources and fusion.
+
+A SignalSource serves momentum for a set of assets from its own in-memory
+history and knows how to refresh that history from the network. Sources
+register with a SignalHub under a name; the hub answers momentum queries for
+a list of names:
+
+  - fresh sources (updated within their max_age) are read from memory;
+  - stale sources are fetched concurrently. If another source is fresh the
+    caller waits at most stale_wait for them (late answers still land in the
+    source's history); otherwise it waits until the first-listed source
+    answers, all have answered, or the deadline passes;
+  - the answers are combined by the fusion rule:
+      primary  first source in list order that has an answer (failover only)
+      volume   momentum weighted by each source's traded volume
+      latency  momentum weighted by 1 / (1 + age in seconds)
+
+Usage:
+    hub = SignalHub(fusion="volume", deadline=5.0)
+    hub.register(FeedSource("binance", get_feed, to_symbol, rest_momentum))
+    hub.register(PollingSource("coingecko", fetch_prices, ["BTC"], interval=20))
+    hub.start()
+    hub.momentum("BTC", 5, ["binance", "coingecko"])
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+FUSION_MODES = ("primary", "volume", "latency")
+
+
+class SignalSource:
+    """Base class for a named momentum source.
+
+    Subclasses implement momentum() (memory only, no I/O), age() and fetch()
+    (network refresh that also updates the in-memory history).
+    """
+
+    name = "source"
+    weight = 1.0  # Relative trust in fused signals
+    max_age = 10.0  # Seconds after the last update before the source is stale
+
+    def momentum(self, asset, lookback_minutes):
+        return None
+
+    def age(self, asset):
+        """Seconds since the source last updated asset (inf if never)."""
+        return float("inf")
+
+    def fetch(self, asset, lookback_minutes):
+        return None
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def is_fresh(self, asset):
+        return self.age(asset) <= self.max_age
+
+
+class FeedSource(SignalSource):
+    """A streaming feed (e.g. price_feed.BinancePriceFeed) with a REST fallback.
+
+    feed: callable() -> the running feed or None.
+    symbol: callable(asset) -> the feed's symbol for asset.
+    rest: callable(asset, lookback_minutes) -> momentum dict from the network.
+    """
+
+    def __init__(self, name, feed, symbol, rest, max_age=10.0, weight=1.0):
+        self.name = name
+        self.feed = feed
+        self.symbol = symbol
+        self.rest = rest
+        self.max_age = max_age
+        self.weight = weight
+
+    def age(self, asset):
+        feed = self.feed()
+        return feed.age(self.symbol(asset)) if feed is not None else float("inf")
+
+    def momentum(self, asset, lookback_minutes):
+        feed = self.feed()
+        return feed.momentum(self.symbol(asset), lookback_minutes) if feed is not None else None
+
+    def fetch(self, asset, lookback_minutes):
+        return self.rest(asset, lookback_minutes)
+
+
+class PollingSource(SignalSource):
+    """Price-only source that polls and keeps its own (time, price) history.
+
+    fetch_prices: callable(assets) -> {asset: price}; one call covers all assets.
+    seed: optional callable(asset) -> [(epoch_secs, price)] to pre-fill history
+          (by the poller thread, or by fetch() in one-shot runs).
+    Momentum compares the latest price with the newest sample at least
+    lookback_minutes older; sources without volume report volume_ratio 1.0.
+    """
+
+    def __init__(
+        self,
+        name,
+        fetch_prices,
+        assets,
+        interval=20.0,
+        history_secs=3600,
+        seed=None,
+        weight=1.0,
+    ):
+        self.name = name
+        self.fetch_prices = fetch_prices
+        self.assets = [a.upper() for a in assets]
+        self.interval = interval
+        self.history_secs = history_secs
+        self.seed = seed
+        self.weight = weight
+        self.max_age = interval * 2 + 5
+
+        self._lock = threading.Lock()
+        self._history = {}  # asset -> deque of (epoch_secs, price)
+        self._updated = {}  # asset -> time.monotonic() of last sample
+        self._seeded = set()
+        self._stop = threading.Event()
+        self._thread = None
+        self.polls = 0
+        self.errors = 0
+        self.last_error = None
+
+    def record(self, asset, price, ts=None):
+        ts = time.time() if ts is None else ts
+        cutoff = ts - self.history_secs
+        with self._lock:
+            history = self._history.setdefault(asset, deque())
+            if history and ts <= history[-1][0]:
+                return
+            history.append((ts, float(price)))
+            while history and history[0][0] < cutoff:
+                history.popleft()
+            self._updated[asset] = time.monotonic()
+
+    def poll(self, assets=None):
+        """Fetch current prices for assets (default: all) into the history."""
+        assets = [a.upper() for a in (assets or self.assets)]
+        try:
+            prices = self.fetch_prices(assets) or {}
+        except Exception as e:
+            prices = {}
+            self.last_error = str(e)
+        self.polls += 1
+        if not prices:
+            self.errors += 1
+        now = time.time()
+        for asset, price in prices.items():
+            if price:
+                self.record(asset.upper(), price, now)
+        return prices
+
+    def age(self, asset):
+        updated = self._updated.get(asset.upper())
+        return time.monotonic() - updated if updated else float("inf")
+
+    def momentum(self, asset, lookback_minutes):
+        with self._lock:
+            history = self._history.get(asset.upper())
+            if not history or len(history) < 2:
+                return None
+            now_ts, price_now = history[-1]
+            target = now_ts - lookback_minutes * 60
+            # History must reach back to the lookback (within one poll interval)
+            if history[0][0] > target + self.interval:
+                return None
+            then_ts, price_then = history[0]
+            samples = 0
+            for ts, price in reversed(history):
+                samples += 1
+                if ts <= target:
+                    then_ts, price_then = ts, price
+                    break
+        if not price_then:
+            return None
+        momentum_pct = (price_now - price_then) / price_then * 100
+        return {
+            "momentum_pct": momentum_pct,
+            "direction": "up" if momentum_pct > 0 else "down",
+            "price_now": price_now,
+            "price_then": price_then,
+            "avg_volume": 0,
+            "latest_volume": 0,
+            "volume_ratio": 1.0,
+            "candles": samples,
+        }
+
+    def seed_history(self, asset):
+        """Pre-fill asset's history from seed (once per asset)."""
+        asset = asset.upper()
+        with self._lock:
+            if not self.seed or asset in self._seeded:
+                return
+            self._seeded.add(asset)
+        try:
+            for ts, price in self.seed(asset) or ():
+                self.record(asset, price, ts)
+        except Exception as e:
+            self.last_error = str(e)
+
+    def fetch(self, asset, lookback_minutes):
+        # Without the poller (one-shot runs) the history starts empty: seed it
+        # first, or a single sample can never span the lookback
+        self.seed_history(asset)
+        self.poll([asset])
+        return self.momentum(asset, lookback_minutes)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-poller", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        for asset in self.assets:
+            self.seed_history(asset)
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+
+def fuse(answers, mode="volume"):
+    """Combine [(source, momentum, age)] (in priority order) into one momentum dict."""
+    if not answers:
+        return None
+    if mode == "primary" or len(answers) == 1:
+        source, momentum, _ = answers[0]
+        return dict(momentum, source=source.name)
+
+    if mode == "latency":
+        weights = [s.weight / (1.0 + min(age, 3600.0)) for s, _, age in answers]
+    else:
+        # Traded value per source; sources without volume get the average weight
+        values = [m["avg_volume"] * m["price_now"] for _, m, _ in answers]
+        known = [v for v in values if v > 0]
+        neutral = sum(known) / len(known) if known else 1.0
+        weights = [s.weight * (v if v > 0 else neutral) for (s, _, _), v in zip(answers, values)]
+
+    total = sum(weights)
+    if total <= 0:
+        return dict(answers[0][1], source=answers[0][0].name)
+    momentum_pct = sum(w * m["momentum_pct"] for w, (_, m, _) in zip(weights, answers)) / total
+    # Price and volume fields come from the highest-weight source that has volume
+    lead = max(
+        range(len(answers)),
+        key=lambda i: (answers[i][1]["avg_volume"] > 0, weights[i]),
+    )
+    fused = dict(answers[lead][1])
+    price_now = fused["price_now"]
+    fused.update(
+        momentum_pct=momentum_pct,
+        direction="up" if momentum_pct > 0 else "down",
+        price_then=price_now / (1 + momentum_pct / 100),
+        source="+".join(s.name for s, _, _ in answers),
+        sources={
+            s.name: {"momentum_pct": round(m["momentum_pct"], 4), "weight": round(w / total, 3)}
+            for (s, m, _), w in zip(answers, weights)
+        },
+    )
+    return fused
+
+
+class SignalHub:
+    """Registry of signal sources with staleness detection, failover and fusion."""
+
+    def __init__(self, fusion="volume", deadline=5.0, stale_wait=1.0, max_workers=4):
+        if fusion not in FUSION_MODES:
+            raise ValueError(f"Unknown fusion mode {fusion!r} (expected {', '.join(FUSION_MODES)})")
+        self.fusion = fusion
+        self.deadline = deadline
+        self.stale_wait = stale_wait
+        self.sources = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="signal")
+        self.failovers = 0
+
+    def register(self, source):
+        """Add (or replace) a source under source.name."""
+        self.sources[source.name] = source
+        return source
+
+    def start(self, names=None):
+        for name, source in self.sources.items():
+            if names is None or name in names:
+                source.start()
+        return self
+
+    def stop(self):
+        for source in self.sources.values():
+            source.stop()
+        self._executor.shutdown(wait=False)
+
+    def _fetch(self, sources, asset, lookback_minutes, timeout, until=None):
+        """Fetch from sources concurrently. Returns {source: momentum} for those
+        that answered within timeout (or as soon as `until` has answered)."""
+        futures = {self._executor.submit(s.fetch, asset, lookback_minutes): s for s in sources}
+        results = {}
+        deadline = time.monotonic() + timeout
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    momentum = future.result()
+                except Exception:
+                    momentum = None
+                if momentum:
+                    results[futures[future]] = momentum
+            if until is not None and until in results:
+                break
+        return results
+
+    def momentum(self, asset, lookback_minutes, names):
+        """Fused momentum for asset from the named sources (in priority order).
+
+        The result carries "source" (who answered) and, when some sources
+        had no usable answer, "stale" (their names).
+        """
+        sources = [self.sources[n] for n in names if n in self.sources]
+        if not sources:
+            return None
+        answers = {}
+        ages = {}
+        stale = []
+        for source in sources:
+            age = source.age(asset)
+            momentum = source.momentum(asset, lookback_minutes) if age <= source.max_age else None
+            if momentum:
+                answers[source] = momentum
+                ages[source] = age
+            else:
+                stale.append(source)
+
+        if stale:
+            if answers:
+                fetched = self._fetch(stale, asset, lookback_minutes, min(self.stale_wait, self.deadline))
+            else:
+                fetched = self._fetch(stale, asset, lookback_minutes, self.deadline, until=sources[0])
+            answers.update(fetched)
+            stale = [s for s in stale if s not in fetched]
+        ordered = [(s, answers[s], ages.get(s, 0.0)) for s in sources if s in answers]
+        if not ordered:
+            return None
+        if self.fusion == "primary":
+            ordered = ordered[:1]
+        result = fuse(ordered, self.fusion)
+        if ordered[0][0] is not sources[0]:
+            self.failovers += 1
+            result["failover"] = True
+        if stale:
+            result["stale"] = [s.name for s in stale]
+        return result
+
+    def status(self):
+        return {
+            name: {
+                "age_secs": {
+                    a: round(source.age(a), 3) for a in getattr(source, "assets", ())
+                },
+                "max_age": source.max_age,
+            }
+            for name, source in self.sources.items()
+        }
@@ -0,0 +1,411 @@
+"""
+Daily budget ledger: in-memory totals over a shared append-only write-ahead log.
+
+Today's spend lives in memory, so reading it costs nothing. Every change is
+one JSON line appended to the log (spend and commits are fsynced before they
+count); compact() folds the log into the JSON snapshot (temp file + rename)
+and swaps in an empty log. Loading reads the snapshot and replays the log on
+top, so a restart — or a crash between compactions — resumes with the exact
+totals.
+
+Trades go through reservations so parallel workers cannot overspend:
+
+    rid, amount = ledger.reserve("BTC:5m", 5.0, pair_limit=10, total_limit=25)
+    ...execute the trade...
+    ledger.commit(rid, "BTC:5m", amount)   # or ledger.release(rid)
+
+reserve() checks the pair, asset and global limits against committed spend
+plus open reservations and logs the reservation in one step. Every call
+holds an exclusive flock on path + ".lock" (where fcntl exists) and first
+applies whatever other processes appended since, so several workers sharing
+the files see one ledger. Reservations a crashed worker never settled stop
+counting after RESERVATION_TTL seconds.
+
+Snapshot layout (daily_spend.json; "seq" is the last log entry folded in):
+    {"date": "2026-01-31", "spent": 7.5, "trades": 2, "seq": 9,
+     "pairs": {"BTC:5m": {"spent": 5.0, "trades": 1}, ...},
+     "reserved": {"<id>": {"pair": "ETH:5m", "amount": 2.5, "expires": 1769900000.0}}}
+
+Usage:
+    ledger = SpendLog("daily_spend.json")  # None = memory only, one process
+    ledger.state()                         # copy of today's committed totals
+    ledger.headroom("BTC:5m", pair_limit=10)
+    ledger.close()                         # compact on shutdown
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process per ledger
+    fcntl = None
+
+COMPACT_EVERY = 50  # Log entries between compactions
+RESERVATION_TTL = 300.0  # Seconds before an unsettled reservation stops counting
+
+
+def _today():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+def _empty(date):
+    return {"date": date, "spent": 0.0, "trades": 0, "seq": 0, "pairs": {}, "reserved": {}}
+
+
+def _asset(pair):
+    return pair.partition(":")[0]
+
+
+class SpendLog:
+    """Today's spend and open reservations per pair, shared through the log.
+
+    path: snapshot file (daily_spend.json); the log is path + ".wal".
+    default_pair: pair that owns the totals of an older file without "pairs".
+    fsync: force spend and commits to disk before they count.
+    """
+
+    def __init__(
+        self,
+        path,
+        default_pair=None,
+        compact_every=COMPACT_EVERY,
+        fsync=True,
+        reservation_ttl=RESERVATION_TTL,
+    ):
+        self.path = str(path) if path else None
+        self.wal_path = self.path + ".wal" if self.path else None
+        self.default_pair = default_pair
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.reservation_ttl = reservation_ttl
+        self._lock = threading.Lock()
+        self._lock_file = open(self.path + ".lock", "a") if self.path and fcntl else None
+        self._wal = None
+        self._wal_ino = None
+        self._offset = 0  # Bytes of the log already applied
+        self._pending = 0  # Log entries since the last compaction
+        self._state = None
+        self.compactions = 0
+        self.reloads = 0
+        with self._locked():
+            self._state = self._load()
+
+    # -------------------------------------------------------------------------
+    # Persistence (callers hold the lock)
+    # -------------------------------------------------------------------------
+
+    def _locked(self):
+        return _Locked(self)
+
+    def _load(self):
+        """Snapshot plus the whole log."""
+        state = _empty(_today())
+        self._pending = 0
+        self._offset = 0
+        self._wal_ino = None
+        if not self.path:
+            return state
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("date") == state["date"]:
+                if "pairs" not in data and self.default_pair:
+                    # Older single-pair file: attribute today's spend to the default pair
+                    data["pairs"] = {
+                        self.default_pair: {
+                            "spent": data.get("spent", 0.0),
+                            "trades": data.get("trades", 0),
+                        }
+                    }
+                state.update(data)
+        except (OSError, ValueError):
+            pass
+        self._read_log(state)
+        return state
+
+    def _read_log(self, state):
+        """Apply log entries past self._offset to state.
+
+        Returns False when an incremental read does not continue state's
+        sequence (another process swapped the log), so the caller reloads.
+        """
+        try:
+            f = open(self.wal_path, "rb+")
+        except OSError:
+            return True
+        with f:
+            self._wal_ino = os.fstat(f.fileno()).st_ino
+            incremental = self._offset > 0
+            f.seek(self._offset)
+            good = self._offset
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("partial line")
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-write: cut it so appends stay parseable
+                    f.truncate(good)
+                    break
+                good += len(line)
+                seq = entry.get("seq", 0)
+                if seq <= state["seq"]:
+                    continue  # Folded into the snapshot before a crash could swap the log
+                if incremental and seq != state["seq"] + 1:
+                    return False
+                if entry.get("date") == state["date"]:
+                    self._apply(state, entry)
+                state["seq"] = seq
+                self._pending += 1
+            self._offset = good
+        return True
+
+    def _sync(self):
+        """Catch up with entries other processes appended."""
+        if not self.path:
+            return
+        try:
+            st = os.stat(self.wal_path)
+        except OSError:
+            st = None
+        if st is None:
+            if self._wal_ino is not None:
+                self._reload()
+        elif st.st_ino != self._wal_ino or st.st_size < self._offset:
+            self._reload()
+        elif st.st_size > self._offset and not self._read_log(self._state):
+            self._reload()
+
+    def _reload(self):
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        self._state = self._load()
+        self.reloads += 1
+
+    @staticmethod
+    def _apply(state, entry):
+        op = entry.get("op", "spend")
+        if op == "reserve":
+            state["reserved"][entry["id"]] = {
+                "pair": entry["pair"],
+                "amount": entry["amount"],
+                "expires": entry["expires"],
+            }
+            return
+        if op == "release":
+            state["reserved"].pop(entry["id"], None)
+            return
+        # "spend" (logged directly) or "commit" (a settled reservation)
+        if op == "commit":
+            state["reserved"].pop(entry["id"], None)
+        amount = entry["amount"]
+        pair_spend = state["pairs"].setdefault(entry["pair"], {"spent": 0.0, "trades": 0})
+        pair_spend["spent"] += amount
+        pair_spend["trades"] += 1
+        state["spent"] = state.get("spent", 0.0) + amount
+        state["trades"] = state.get("trades", 0) + 1
+
+    def _append(self, entry, durable):
+        """Log entry, then apply it to the in-memory state."""
+        entry["seq"] = self._state["seq"] + 1
+        entry["date"] = self._state["date"]
+        if self.wal_path:
+            if self._wal is None:
+                self._wal = open(self.wal_path, "ab")
+                self._wal_ino = os.fstat(self._wal.fileno()).st_ino
+            line = (json.dumps(entry) + "\n").encode("utf-8")
+            self._wal.write(line)
+            self._wal.flush()
+            if durable and self.fsync:
+                os.fsync(self._wal.fileno())
+            self._offset += len(line)
+        self._apply(self._state, entry)
+        self._state["seq"] = entry["seq"]
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self._compact()
+
+    def _compact(self):
+        """Write the snapshot and swap in an empty log."""
+        now = time.time()
+        reserved = self._state["reserved"]
+        for rid in [r for r, res in reserved.items() if res["expires"] <= now]:
+            del reserved[rid]
+        self._pending = 0
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._state, f, indent=2)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # A new file (new inode) tells other processes to reload from the snapshot
+        tmp_wal = self.wal_path + ".tmp"
+        open(tmp_wal, "wb").close()
+        os.replace(tmp_wal, self.wal_path)
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+        self._wal_ino = os.stat(self.wal_path).st_ino
+        self._offset = 0
+        self.compactions += 1
+
+    def _roll(self):
+        """Start a fresh day once the UTC date changes."""
+        today = _today()
+        if self._state["date"] != today:
+            self._state = _empty(today)
+            self._compact()
+
+    def _usage(self, pair):
+        now = time.time()
+        state = self._state
+        asset = _asset(pair)
+        used_pair = state["pairs"].get(pair, {}).get("spent", 0.0)
+        used_asset = sum(v["spent"] for p, v in state["pairs"].items() if _asset(p) == asset)
+        used_total = state.get("spent", 0.0)
+        for res in state["reserved"].values():
+            if res["expires"] <= now:
+                continue
+            used_total += res["amount"]
+            if _asset(res["pair"]) == asset:
+                used_asset += res["amount"]
+                if res["pair"] == pair:
+                    used_pair += res["amount"]
+        return used_pair, used_asset, used_total
+
+    def _headroom(self, pair, pair_limit, asset_limit, total_limit):
+        used_pair, used_asset, used_total = self._usage(pair)
+        room, bound = float("inf"), None
+        for name, limit, used in (
+            ("pair", pair_limit, used_pair),
+            ("asset", asset_limit, used_asset),
+            ("total", total_limit, used_total),
+        ):
+            if limit and limit - used < room:
+                room, bound = limit - used, name
+        return max(room, 0.0), bound
+
+    # -------------------------------------------------------------------------
+    # API
+    # -------------------------------------------------------------------------
+
+    def state(self):
+        """Copy of today's committed totals."""
+        with self._locked():
+            s = self._state
+            return {
+                "date": s["date"],
+                "spent": s.get("spent", 0.0),
+                "trades": s.get("trades", 0),
+                "pairs": {p: dict(v) for p, v in s["pairs"].items()},
+            }
+
+    def usage(self, pair):
+        """(pair, asset, total) dollars spent today plus open reservations."""
+        with self._locked():
+            return self._usage(pair)
+
+    def headroom(self, pair, pair_limit=0, asset_limit=0, total_limit=0):
+        """(dollars left, binding limit) for pair, counting open reservations.
+
+        Limits of 0/None are off; binding is "pair", "asset", "total" or None.
+        """
+        with self._locked():
+            return self._headroom(pair, pair_limit, asset_limit, total_limit)
+
+    def reserve(self, pair, amount, pair_limit=0, asset_limit=0, total_limit=0, min_amount=0.0):
+        """Hold up to `amount` dollars for pair within the limits.
+
+        Returns (reservation_id, amount_held), the amount capped at the
+        headroom, or (None, headroom) when less than min_amount is left.
+        """
+        with self._locked():
+            room, _ = self._headroom(pair, pair_limit, asset_limit, total_limit)
+            amount = min(amount, room)
+            if amount <= 0 or amount < min_amount:
+                return None, room
+            rid = uuid.uuid4().hex[:16]
+            self._append(
+                {
+                    "op": "reserve",
+                    "id": rid,
+                    "pair": pair,
+                    "amount": amount,
+                    "expires": time.time() + self.reservation_ttl,
+                },
+                durable=False,
+            )
+            return rid, amount
+
+    def commit(self, rid, pair, amount):
+        """Settle a reservation as `amount` spent (counts even if it expired meanwhile)."""
+        with self._locked():
+            self._append({"op": "commit", "id": rid, "pair": pair, "amount": amount}, durable=True)
+            return dict(self._state["pairs"][pair])
+
+    def release(self, rid):
+        """Drop a reservation without spending it."""
+        with self._locked():
+            if rid in self._state["reserved"]:
+                self._append({"op": "release", "id": rid}, durable=False)
+
+    def record(self, pair, amount):
+        """Log spend that did not go through a reservation. Returns the pair's totals."""
+        with self._locked():
+            self._append({"op": "spend", "pair": pair, "amount": amount}, durable=True)
+            return dict(self._state["pairs"][pair])
+
+    def compact(self):
+        with self._locked():
+            self._compact()
+
+    def close(self):
+        """Compact (if anything was logged) and release the files."""
+        with self._locked():
+            if self._pending:
+                self._compact()
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class _Locked:
+    """Thread lock + exclusive flock; on entry the ledger is synced and rolled to today."""
+
+    __slots__ = ("ledger",)
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+
+    def __enter__(self):
+        ledger = self.ledger
+        ledger._lock.acquire()
+        try:
+            if ledger._lock_file is not None:
+                fcntl.flock(ledger._lock_file.fileno(), fcntl.LOCK_EX)
+            if ledger._state is not None:
+                ledger._sync()
+                ledger._roll()
+        except BaseException:
+            self.__exit__()
+            raise
+        return ledger
+
+    def __exit__(self, *exc):
+        ledger = self.ledger
+        if ledger._lock_file is not None:
+            fcntl.flock(ledger._lock_file.fileno(), fcntl.LOCK_UN)
+        ledger._lock.release()
+        return False
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Parameter sweep over the backtest rule parameters.
+
+Runs every combination of the given ranges through backtest.evaluate on a
+process pool. Price data is loaded and aligned once, copied into a single
+shared memory block, and every worker maps NumPy views onto it, so workers
+hold no copies of the history and start instantly.
+
+Usage:
+    python sweep.py --klines BTC=btc.csv \\
+        --range entry_threshold=0.02:0.10:0.01 \\
+        --range min_momentum_pct=0.1:1.0:0.1 \\
+        --range lookback_minutes=3,5,10,15
+    python sweep.py --klines BTC=btc.csv --range min_time_remaining=30:240:30 --out sweep.csv
+
+Ranges are start:stop:step (inclusive) or a comma-separated list. Results are
+ranked by --sort (pnl, roi, hit_rate or trades) and written to --out as CSV.
+"""
+
+import os
+import csv
+import time
+import argparse
+import itertools
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+import backtest
+import fastloop_trades as ft
+
+SORT_KEYS = ("pnl", "roi", "hit_rate", "trades")
+RESULT_KEYS = ("trades", "wins", "hit_rate", "volume_usd", "pnl", "fee_drag", "roi")
+
+
+# =============================================================================
+# Grid
+# =============================================================================
+
+
+def parse_range(spec):
+    """'key=start:stop:step' or 'key=a,b,c' (also for text settings) -> (key, [values])."""
+    key, _, values = spec.partition("=")
+    if key not in backtest.PARAM_KEYS:
+        raise SystemExit(f"Unknown sweep parameter: {key}. Valid: {', '.join(backtest.PARAM_KEYS)}")
+    type_fn = ft.CONFIG_SCHEMA[key]["type"]
+    if type_fn == str and ":" not in values:
+        return key, [v.strip() for v in values.split(",") if v.strip()]
+    if type_fn not in (int, float):
+        raise SystemExit(f"{key} is not numeric")
+    if ":" in values:
+        start, stop, step = (float(v) for v in values.split(":"))
+        if step <= 0:
+            raise SystemExit(f"Step must be positive: {spec}")
+        count = int(round((stop - start) / step)) + 1
+        items = [start + i * step for i in range(count)]
+    else:
+        items = [float(v) for v in values.split(",") if v.strip()]
+    if type_fn == int:
+        items = sorted({int(round(v)) for v in items})
+    else:
+        items = [round(v, 10) for v in items]
+    return key, items
+
+
+def build_grid(ranges, base_params):
+    """Every combination of the ranges applied over base_params."""
+    keys = [k for k, _ in ranges]
+    grid = []
+    for combo in itertools.product(*(values for _, values in ranges)):
+        params = dict(base_params)
+        params.update(zip(keys, combo))
+        grid.append(params)
+    return grid
+
+
+# =============================================================================
+# Shared memory
+# =============================================================================
+
+
+def share_datasets(datasets):
+    """Copy every array into one shared memory block. Returns (shm, manifest)."""
+    layout = []
+    size = 0
+    for asset, prep in datasets.items():
+        for key, arr in prep.items():
+            arr = np.ascontiguousarray(arr)
+            size = (size + 63) // 64 * 64  # Cache-line align each column
+            layout.append((asset, key, size, arr.dtype.str, arr.shape, arr))
+            size += arr.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    manifest = {"name": shm.name, "columns": []}
+    for asset, key, offset, dtype, shape, arr in layout:
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        view[...] = arr
+        manifest["columns"].append((asset, key, offset, dtype, shape))
+    return shm, manifest
+
+
+def attach_datasets(manifest):
+    """Map read-only NumPy views onto a shared block. Returns (shm, datasets)."""
+    # Pool workers share the parent's resource tracker, so attaching here does
+    # not hand ownership over; the parent unlinks the block when the sweep ends.
+    shm = shared_memory.SharedMemory(name=manifest["name"])
+    datasets = {}
+    for asset, key, offset, dtype, shape in manifest["columns"]:
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        view.flags.writeable = False
+        datasets.setdefault(asset, {})[key] = view
+    return shm, datasets
+
+
+_worker_shm = None
+_worker_datasets = None
+
+
+def _init_worker(manifest):
+    global _worker_shm, _worker_datasets
+    _worker_shm, _worker_datasets = attach_datasets(manifest)
+
+
+def _run_one(item):
+    i, params = item
+    total, _ = backtest.run(_worker_datasets, params)
+    return i, {k: total[k] for k in RESULT_KEYS}
+
+
+# =============================================================================
+# Sweep
+# =============================================================================
+
+
+def sweep(datasets, grid, workers=None, progress=None):
+    """Evaluate every params dict in grid. Returns results in grid order."""
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(grid)
+    if workers <= 1 or len(grid) <= 1:
+        for i, params in enumerate(grid):
+            total, _ = backtest.run(datasets, params)
+            results[i] = {k: total[k] for k in RESULT_KEYS}
+            if progress:
+                progress(i + 1, len(grid))
+        return results
+
+    shm, manifest = share_datasets(datasets)
+    try:
+        # Several chunks per worker keeps cores busy when run times differ
+        chunksize = max(1, len(grid) // (workers * 8))
+        with Pool(workers, initializer=_init_worker, initargs=(manifest,)) as pool:
+            done = 0
+            for i, result in pool.imap_unordered(_run_one, enumerate(grid), chunksize):
+                results[i] = result
+                done += 1
+                if progress:
+                    progress(done, len(grid))
+    finally:
+        shm.close()
+        shm.unlink()
+    return results
+
+
+def rank(grid, results, sort="pnl", min_trades=1):
+    rows = [
+        dict(params, **result)
+        for params, result in zip(grid, results)
+        if result["trades"] >= min_trades
+    ]
+    rows.sort(key=lambda r: r[sort], reverse=True)
+    return rows
+
+
+def write_csv(path, rows, keys):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["rank"] + list(keys) + list(RESULT_KEYS))
+        writer.writeheader()
+        for n, row in enumerate(rows, 1):
+            writer.writerow(dict({k: row[k] for k in list(keys) + list(RESULT_KEYS)}, rank=n))
+
+
+def _print_table(rows, keys, top):
+    header = "".join(f"{k[:16]:>18}" for k in keys)
+    print(f"\n  {'#':>4}{header}{'Trades':>8}{'Hit':>8}{'PnL':>10}{'ROI':>8}")
+    for n, row in enumerate(rows[:top], 1):
+        values = "".join(
+            f"{row[k]:>18}" if isinstance(row[k], str) else f"{row[k]:>18g}" for k in keys
+        )
+        print(
+            f"  {n:>4}{values}{row['trades']:>8,}{row['hit_rate']:>8.1%}"
+            f"{row['pnl']:>+10,.2f}{row['roi']:>+8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FastLoop parameter sweep")
+    parser.add_argument("--klines", action="append", required=True, metavar="ASSET=PATH[,PATH]")
+    parser.add_argument("--snapshots", help="Market price snapshots (JSONL or CSV)")
+    parser.add_argument("--window", default=ft.WINDOW, help="Window when synthesizing snapshots")
+    parser.add_argument("--flat-price", type=float, default=0.5, help="YES price when synthesizing")
+    parser.add_argument("--fee-bps", type=float, default=1000, help="Fee when synthesizing")
+    parser.add_argument("--range", action="append", required=True, metavar="KEY=START:STOP:STEP|A,B,C")
+    parser.add_argument("--set", action="append", metavar="KEY=VALUE", help="Fix a parameter for every run")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="pnl")
+    parser.add_argument("--min-trades", type=int, default=1, help="Drop runs with fewer trades")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print")
+    parser.add_argument("--out", help="Write the full ranked table as CSV")
+    args = parser.parse_args()
+
+    ranges = [parse_range(spec) for spec in args.range]
+    keys = [k for k, _ in ranges]
+    grid = build_grid(ranges, backtest.default_params(backtest.parse_set(args.set)))
+
+    print("⚡ FastLoop Sweep")
+    print("=" * 50)
+    load_start = time.perf_counter()
+    datasets = backtest.build_datasets(
+        args.klines, args.snapshots, args.window, args.flat_price, args.fee_bps
+    )
+    workers = args.workers or os.cpu_count() or 1
+    print(f"  Loaded {len(datasets)} asset(s) in {time.perf_counter() - load_start:.2f}s")
+    print(f"  {len(grid):,} combinations on {workers} worker(s)")
+
+    start = time.perf_counter()
+    results = sweep(datasets, grid, workers)
+    elapsed = time.perf_counter() - start
+    rows = rank(grid, results, args.sort, args.min_trades)
+
+    _print_table(rows, keys, args.top)
+    print(f"\n  {len(grid):,} runs in {elapsed:.2f}s ({len(grid) / elapsed:,.0f} runs/s)")
+    if args.out:
+        write_csv(args.out, rows, keys)
+        print(f"  Wrote {len(rows):,} rows to {args.out}")
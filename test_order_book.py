@@ -0,0 +1,94 @@
+"""BookFeed against a local stand-in WebSocket server (ws_client.ReplayServer)."""
+
+import time
+
+import pytest
+
+from order_book import BookFeed
+from ws_client import ReplayServer
+
+TOKEN = "yes-token"
+
+
+def book_frames():
+    return [
+        {
+            "t": 0.0,
+            "data": [
+                {
+                    "event_type": "book",
+                    "asset_id": TOKEN,
+                    "bids": [{"price": "0.48", "size": "100"}],
+                    "asks": [{"price": "0.50", "size": "4"}, {"price": "0.52", "size": "100"}],
+                }
+            ],
+        },
+        {
+            "t": 0.0,
+            "data": {
+                "event_type": "price_change",
+                "price_changes": [
+                    {"asset_id": TOKEN, "side": "SELL", "price": "0.50", "size": "10"},
+                    {"asset_id": TOKEN, "side": "SELL", "price": "0.51", "size": "10"},
+                ],
+            },
+        },
+    ]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def run_feed(**kwargs):
+    server = ReplayServer(book_frames(), speed=0).start()
+    fetched = []
+    books = BookFeed(url=server.url, fetch_book=lambda token: fetched.append(token), **kwargs)
+    books.watch([TOKEN])
+    return server, books.start(), fetched
+
+
+def test_streamed_book_and_deltas_price_a_buy():
+    server, books, fetched = run_feed()
+    try:
+        assert wait_for(lambda: books.frames == 2)
+        assert books.is_synced(TOKEN)
+        quote = books.get(TOKEN).buy_quote(10.0)
+        assert fetched == []  # Served from the stream, not REST
+        assert quote["best_ask"] == 0.50
+        assert quote["worst_price"] == 0.51
+        assert quote["levels"] == 2
+        assert quote["shares"] == pytest.approx(10 + 5 / 0.51)
+        assert quote["filled"]
+    finally:
+        server.stop()
+        books.stop()
+
+
+def test_failing_callback_does_not_kill_the_stream():
+    calls = []
+
+    def on_update(token):
+        calls.append(token)
+        if len(calls) == 1:
+            raise RuntimeError("callback failed")
+
+    server, books, fetched = run_feed(on_update=on_update)
+    try:
+        assert wait_for(lambda: books.frames == 2)
+        assert books.running
+        assert books.is_synced(TOKEN)
+        assert books.reconnects == 0
+        assert len(calls) == 3  # Snapshot plus two level changes
+        assert books.callback_errors == 1
+        assert "callback failed" in books.last_error
+        assert books.get(TOKEN).best_ask() == 0.50
+        assert fetched == []
+    finally:
+        server.stop()
+        books.stop()
@@ -0,0 +1,107 @@
+"""BinancePriceFeed against a local stand-in WebSocket server (ws_client.ReplayServer)."""
+
+import time
+
+from price_feed import BinancePriceFeed
+from ws_client import ReplayServer
+
+BASE_MS = 1_760_000_040_000  # A minute boundary
+
+
+def kline(symbol, minute, open_, close, closed=True):
+    start = BASE_MS + minute * 60_000
+    return {
+        "stream": f"{symbol.lower()}@kline_1m",
+        "data": {
+            "e": "kline",
+            "E": start + 59_000,
+            "s": symbol,
+            "k": {
+                "t": start,
+                "s": symbol,
+                "o": str(open_),
+                "h": str(max(open_, close)),
+                "l": str(min(open_, close)),
+                "c": str(close),
+                "v": "10",
+                "x": closed,
+            },
+        },
+    }
+
+
+def frames(symbol="BTCUSDT", count=6):
+    return [
+        {"t": 0.0, "data": kline(symbol, i, 100 + i, 101 + i, closed=i < count - 1)}
+        for i in range(count)
+    ]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def run_feed(server_frames, **kwargs):
+    server = ReplayServer(server_frames, speed=0).start()
+    feed = BinancePriceFeed(["BTCUSDT"], url=server.url, trades=False, **kwargs).start()
+    return server, feed
+
+
+def test_replayed_klines_drive_momentum_and_freshness():
+    server, feed = run_feed(frames())
+    try:
+        assert feed.wait_ready(timeout=5)
+        assert wait_for(lambda: feed.frames == 6)
+        assert server.paths == ["/stream?streams=btcusdt@kline_1m"]
+        assert feed.is_fresh("BTCUSDT", max_age=5)
+        assert feed.last_price("BTCUSDT") == 106.0
+        momentum = feed.momentum("BTCUSDT", lookback_minutes=5)
+        assert momentum["price_then"] == 101.0
+        assert momentum["price_now"] == 106.0
+        assert momentum["direction"] == "up"
+    finally:
+        server.stop()
+        feed.stop()
+
+
+def test_failing_callback_does_not_kill_the_stream():
+    calls = []
+
+    def on_update(symbol, price, event_ms):
+        calls.append(price)
+        if len(calls) == 1:
+            raise RuntimeError("callback failed")
+
+    server, feed = run_feed(frames(), on_update=on_update)
+    try:
+        assert wait_for(lambda: feed.frames == 6)
+        assert feed._thread.is_alive()
+        assert feed.connected
+        assert feed.reconnects == 0
+        assert len(calls) == 6
+        assert feed.callback_errors == 1
+        assert "callback failed" in feed.last_error
+        assert feed.last_price("BTCUSDT") == 106.0
+    finally:
+        server.stop()
+        feed.stop()
+
+
+def test_unexpected_error_reconnects_instead_of_ending_the_thread():
+    feed = BinancePriceFeed(["BTCUSDT"], trades=False)
+    feed._handle_message = lambda raw: 1 / 0  # Anything the frame path did not expect
+    server = ReplayServer(frames(), speed=0).start()
+    feed.url = server.url
+    feed.start()
+    try:
+        assert wait_for(lambda: feed.reconnects >= 1)
+        assert feed._thread.is_alive()
+        assert "ZeroDivisionError" in feed.last_error
+    finally:
+        server.stop()
+        feed.stop()
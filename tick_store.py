@@ -0,0 +1,243 @@
+"""
+Columnar on-disk store for candles, trade ticks and market price snapshots.
+
+Each record kind has a fixed schema of int64/float64 columns. Data is kept
+per key (Binance symbol for candles/trades, asset for snapshots) and per UTC
+day, one raw little-endian file per column:
+
+    <root>/candles/BTCUSDT/2025-01-01/open_time.i8
+    <root>/candles/BTCUSDT/2025-01-01/close.f8
+    <root>/trades/BTCUSDT/2025-01-01/price.f8
+    <root>/snapshots/BTC/2025-01-01/yes_price.f8
+
+Files are append-only and readable while being written. Reads memory-map the
+column files, so slicing a day by time range returns NumPy views without
+copying or building Python objects. The first column of every schema is the
+record time in epoch milliseconds; rows are appended in time order.
+
+Usage:
+    store = TickStore("ticks")
+    recorder = TickRecorder(store)
+    recorder.candle("BTCUSDT", [open_time, o, h, l, c, v])
+    recorder.flush()
+    cols = store.read("candles", "BTCUSDT", start_ms, end_ms)
+    cols["close"]  # float64 array
+"""
+
+import os
+import time
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+DAY_MS = 86_400_000
+
+SCHEMAS = {
+    # Same order as the feed's candle rows: [open_time, open, high, low, close, volume]
+    "candles": (
+        ("open_time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ),
+    "trades": (
+        ("ts_ms", "<i8"),
+        ("price", "<f8"),
+        ("qty", "<f8"),
+        ("buyer_maker", "<i8"),
+    ),
+    "snapshots": (
+        ("ts_ms", "<i8"),
+        ("end_ms", "<i8"),
+        ("window_secs", "<i8"),
+        ("yes_price", "<f8"),
+        ("fee_rate_bps", "<f8"),
+    ),
+}
+
+
+def _day_name(day_index):
+    return datetime.fromtimestamp(day_index * 86400, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _day_index(name):
+    dt = datetime.strptime(name, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) // 86400
+
+
+class TickStore:
+    """Append-only columnar day files, read through memory maps."""
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _dir(self, kind, key, day_index):
+        return os.path.join(self.root, kind, key, _day_name(day_index))
+
+    @staticmethod
+    def _file(day_dir, name, dtype):
+        return os.path.join(day_dir, f"{name}.{dtype[1:]}")
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def append(self, kind, key, columns):
+        """Append rows given as {column: sequence}. Rows are split by UTC day."""
+        schema = SCHEMAS[kind]
+        arrays = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in schema}
+        times = arrays[schema[0][0]]
+        if not len(times):
+            return 0
+        days = times // DAY_MS
+        bounds = np.nonzero(np.diff(days))[0] + 1
+        with self._lock:
+            for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(times)]):
+                day_dir = self._dir(kind, key, int(days[lo]))
+                os.makedirs(day_dir, exist_ok=True)
+                # Time column last: a reader never sees a timestamp before its values
+                for name, dtype in schema[1:] + schema[:1]:
+                    with open(self._file(day_dir, name, dtype), "ab") as f:
+                        f.write(arrays[name][lo:hi].tobytes())
+        return len(times)
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def keys(self, kind):
+        path = os.path.join(self.root, kind)
+        return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+    def days(self, kind, key):
+        """Day indices (epoch days) with data for key, oldest first."""
+        path = os.path.join(self.root, kind, key)
+        if not os.path.isdir(path):
+            return []
+        return sorted(_day_index(name) for name in os.listdir(path))
+
+    def day_columns(self, kind, key, day_index):
+        """Memory-mapped columns for one day (read-only, zero-copy)."""
+        schema = SCHEMAS[kind]
+        day_dir = self._dir(kind, key, day_index)
+        sizes = {}
+        for name, dtype in schema:
+            try:
+                sizes[name] = os.path.getsize(self._file(day_dir, name, dtype)) // 8
+            except OSError:
+                sizes[name] = 0
+        rows = min(sizes.values())  # Ignore a partially written tail
+        columns = {}
+        for name, dtype in schema:
+            if rows:
+                columns[name] = np.memmap(
+                    self._file(day_dir, name, dtype), dtype=dtype, mode="r", shape=(rows,)
+                )
+            else:
+                columns[name] = np.empty(0, dtype=dtype)
+        return columns
+
+    def iter_days(self, kind, key, start_ms=None, end_ms=None):
+        """Yield per-day column views restricted to [start_ms, end_ms)."""
+        time_col = SCHEMAS[kind][0][0]
+        for day in self.days(kind, key):
+            if start_ms is not None and (day + 1) * DAY_MS <= start_ms:
+                continue
+            if end_ms is not None and day * DAY_MS >= end_ms:
+                break
+            columns = self.day_columns(kind, key, day)
+            times = columns[time_col]
+            lo = 0 if start_ms is None else int(np.searchsorted(times, start_ms, "left"))
+            hi = len(times) if end_ms is None else int(np.searchsorted(times, end_ms, "left"))
+            if hi > lo:
+                yield {name: col[lo:hi] for name, col in columns.items()}
+
+    def read(self, kind, key, start_ms=None, end_ms=None):
+        """Columns for [start_ms, end_ms). Views when the range is within one day."""
+        parts = list(self.iter_days(kind, key, start_ms, end_ms))
+        if len(parts) == 1:
+            return parts[0]
+        return {
+            name: np.concatenate([p[name] for p in parts]) if parts else np.empty(0, dtype=dtype)
+            for name, dtype in SCHEMAS[kind]
+        }
+
+    def last_time(self, kind, key):
+        """Newest recorded time (ms) for key, or None."""
+        time_col = SCHEMAS[kind][0][0]
+        for day in reversed(self.days(kind, key)):
+            times = self.day_columns(kind, key, day)[time_col]
+            if len(times):
+                return int(times[-1])
+        return None
+
+
+class TickRecorder:
+    """Buffers live records and appends them to a TickStore in batches.
+
+    Candles are recorded once closed, deduplicated by open_time, so REST
+    seeds and the stream can both feed the recorder.
+    """
+
+    def __init__(self, store, flush_interval=5.0, max_rows=5000):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Keeps batches in order on disk
+        self._buffers = {}  # (kind, key) -> list of row tuples
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._last_candle = {}  # symbol -> newest recorded open_time
+        self.rows_written = 0
+
+    def _add(self, kind, key, row):
+        with self._lock:
+            self._buffers.setdefault((kind, key), []).append(row)
+            self._pending += 1
+            due = (
+                self._pending >= self.max_rows
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def candle(self, symbol, row):
+        """Record a closed candle [open_time, open, high, low, close, volume]."""
+        open_time = int(row[0])
+        with self._lock:
+            last = self._last_candle.get(symbol)
+            if last is None:
+                last = self.store.last_time("candles", symbol) or 0
+            if open_time <= last:
+                return
+            self._last_candle[symbol] = open_time
+        self._add("candles", symbol, (open_time, *(float(v) for v in row[1:6])))
+
+    def trade(self, symbol, ts_ms, price, qty=0.0, buyer_maker=False):
+        self._add("trades", symbol, (int(ts_ms), float(price), float(qty), int(bool(buyer_maker))))
+
+    def snapshot(self, asset, ts_ms, end_ms, window_secs, yes_price, fee_rate_bps=0):
+        self._add(
+            "snapshots",
+            asset,
+            (int(ts_ms), int(end_ms), int(window_secs), float(yes_price), float(fee_rate_bps)),
+        )
+
+    def flush(self):
+        """Write all buffered rows. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                buffers, self._buffers = self._buffers, {}
+                self._pending = 0
+                self._last_flush = time.monotonic()
+            written = 0
+            for (kind, key), rows in buffers.items():
+                names = [name for name, _ in SCHEMAS[kind]]
+                written += self.store.append(kind, key, dict(zip(names, zip(*rows))))
+            self.rows_written += written
+        return written
@@ -0,0 +1,343 @@
+"""
+Minimal WebSocket client (RFC 6455) on the standard library.
+
+Used by the streaming price feed and order book. Also ships a local
+stand-in server that replays recorded frames so the feeds can be exercised
+without touching Binance or Polymarket.
+
+Usage:
+    ws = connect("wss://data-stream.binance.vision/ws/btcusdt@kline_1m")
+    while True:
+        msg = ws.recv()
+
+    python ws_client.py replay frames.jsonl --port 8765   # stand-in server
+"""
+
+import os
+import ssl
+import json
+import time
+import base64
+import socket
+import struct
+import hashlib
+import argparse
+import threading
+import socketserver
+from urllib.parse import urlsplit
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONT = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+class WebSocketClosed(Exception):
+    """Raised when the peer closes the connection or the socket drops."""
+
+
+def _accept_key(key):
+    digest = hashlib.sha1((key + _GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _read_exact(rfile, n):
+    data = rfile.read(n)
+    if data is None or len(data) < n:
+        raise WebSocketClosed("Connection closed mid-frame")
+    return data
+
+
+def _read_frame(rfile):
+    """Read one frame. Returns (fin, opcode, payload)."""
+    b1, b2 = _read_exact(rfile, 2)
+    fin = bool(b1 & 0x80)
+    opcode = b1 & 0x0F
+    masked = bool(b2 & 0x80)
+    length = b2 & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", _read_exact(rfile, 2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", _read_exact(rfile, 8))
+    mask = _read_exact(rfile, 4) if masked else None
+    payload = _read_exact(rfile, length) if length else b""
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return fin, opcode, payload
+
+
+def _encode_frame(opcode, payload, mask):
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 65536:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if not mask:
+        return bytes(header) + payload
+    key = os.urandom(4)
+    masked = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return bytes(header) + key + masked
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+
+class WebSocket:
+    """Blocking client connection. Answers pings transparently in recv()."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.rfile = sock.makefile("rb")
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    def send(self, message):
+        if isinstance(message, str):
+            self._send_frame(OP_TEXT, message.encode("utf-8"))
+        else:
+            self._send_frame(OP_BINARY, bytes(message))
+
+    def _send_frame(self, opcode, payload):
+        frame = _encode_frame(opcode, payload, mask=True)
+        with self._send_lock:
+            try:
+                self.sock.sendall(frame)
+            except OSError as e:
+                raise WebSocketClosed(str(e))
+
+    def recv(self):
+        """Return the next text (str) or binary (bytes) message."""
+        chunks = []
+        msg_opcode = None
+        while True:
+            try:
+                fin, opcode, payload = _read_frame(self.rfile)
+            except socket.timeout:
+                # A buffered reader can't resume after a timeout, so treat it as a drop
+                raise WebSocketClosed("Receive timeout")
+            except (OSError, ValueError) as e:
+                raise WebSocketClosed(str(e))
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                self.close()
+                raise WebSocketClosed("Closed by peer")
+            if opcode != OP_CONT:
+                msg_opcode = opcode
+            chunks.append(payload)
+            if fin:
+                data = b"".join(chunks)
+                return data.decode("utf-8") if msg_opcode == OP_TEXT else data
+
+    def settimeout(self, timeout):
+        self.sock.settimeout(timeout)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._send_frame(OP_CLOSE, struct.pack("!H", 1000))
+        except WebSocketClosed:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def connect(url, timeout=10, headers=None):
+    """Open a WebSocket connection to a ws:// or wss:// URL."""
+    parts = urlsplit(url)
+    secure = parts.scheme == "wss"
+    host = parts.hostname
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    sock = socket.create_connection((host, port), timeout=timeout)
+    if secure:
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    lines = [
+        f"GET {path} HTTP/1.1",
+        f"Host: {host}" if parts.port is None else f"Host: {host}:{port}",
+        "Upgrade: websocket",
+        "Connection: Upgrade",
+        f"Sec-WebSocket-Key: {key}",
+        "Sec-WebSocket-Version: 13",
+        "User-Agent: simmer-fastloop_market/1.0",
+    ]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("ascii"))
+
+    ws = WebSocket(sock)
+    status = ws.rfile.readline().decode("latin-1").strip()
+    response_headers = {}
+    while True:
+        line = ws.rfile.readline().decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+    if " 101 " not in f"{status} ":
+        sock.close()
+        raise WebSocketClosed(f"Handshake failed: {status}")
+    if response_headers.get("sec-websocket-accept") != _accept_key(key):
+        sock.close()
+        raise WebSocketClosed("Handshake failed: bad Sec-WebSocket-Accept")
+    return ws
+
+
+# =============================================================================
+# Local stand-in server (replays recorded frames)
+# =============================================================================
+
+
+def load_frames(path):
+    """Load recorded frames: one JSON object per line with 't' (seconds) and 'data'."""
+    frames = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                frames.append(json.loads(line))
+    return frames
+
+
+class _ReplayHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        request_line = self.rfile.readline()
+        if not request_line:
+            return
+        path = request_line.decode("latin-1").split(" ")[1]
+        key = None
+        while True:
+            line = self.rfile.readline().decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "sec-websocket-key":
+                key = value.strip()
+        if not key:
+            self.wfile.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return
+        self.wfile.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {_accept_key(key)}\r\n\r\n"
+            ).encode("ascii")
+        )
+        server.connections += 1
+        server.paths.append(path)
+
+        # Collect client messages (subscriptions) in the background
+        def reader():
+            try:
+                while True:
+                    fin, opcode, payload = _read_frame(self.rfile)
+                    if opcode == OP_CLOSE:
+                        return
+                    if opcode == OP_TEXT:
+                        server.received.append(payload.decode("utf-8"))
+            except (WebSocketClosed, OSError):
+                return
+
+        threading.Thread(target=reader, daemon=True).start()
+
+        start = time.monotonic()
+        try:
+            for frame in server.frames:
+                delay = frame.get("t", 0) / server.speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+                data = frame["data"]
+                if not isinstance(data, str):
+                    data = json.dumps(data)
+                self.wfile.write(_encode_frame(OP_TEXT, data.encode("utf-8"), False))
+            if server.close_after:
+                self.wfile.write(_encode_frame(OP_CLOSE, struct.pack("!H", 1000), False))
+                return
+            while not server.stopping.wait(0.5):
+                pass
+        except OSError:
+            return
+
+
+class ReplayServer(socketserver.ThreadingTCPServer):
+    """Stand-in WebSocket server that replays recorded frames to each client.
+
+    speed scales the recorded inter-frame timing (2.0 = twice as fast).
+    close_after=True drops the connection once the frames are exhausted,
+    which is handy for exercising reconnect logic.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, frames, host="127.0.0.1", port=0, speed=1.0, close_after=False):
+        super().__init__((host, port), _ReplayHandler)
+        self.frames = frames
+        self.speed = speed if speed > 0 else 1e9
+        self.close_after = close_after
+        self.stopping = threading.Event()
+        self.connections = 0
+        self.paths = []
+        self.received = []
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"ws://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSocket replay stand-in server")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    replay = sub.add_parser("replay", help="Serve recorded frames to every client")
+    replay.add_argument("frames", help="JSONL file of recorded frames")
+    replay.add_argument("--port", type=int, default=8765)
+    replay.add_argument("--speed", type=float, default=1.0)
+    replay.add_argument("--close-after", action="store_true")
+    args = parser.parse_args()
+
+    server = ReplayServer(
+        load_frames(args.frames),
+        port=args.port,
+        speed=args.speed,
+        close_after=args.close_after,
+    )
+    print(f"🔁 Replaying {len(server.frames)} frames on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()